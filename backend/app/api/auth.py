@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
@@ -9,6 +10,7 @@ from typing import Optional
 from app.database.database import get_db
 from app.models.models import Student
 from app.core.config import settings
+from app.services.activity_writer import ActivityWriter, get_activity_writer
 
 router = APIRouter()
 
@@ -31,7 +33,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -45,7 +47,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError:
         raise credentials_exception
     
-    user = db.query(Student).filter(Student.username == username).first()
+    user = await db.scalar(select(Student).where(Student.username == username))
     if user is None:
         raise credentials_exception
     return user
@@ -56,11 +58,11 @@ async def register(
     email: str, 
     password: str,
     grade_level: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    db_user = db.query(Student).filter(
+    db_user = await db.scalar(select(Student).where(
         (Student.username == username) | (Student.email == email)
-    ).first()
+    ))
     
     if db_user:
         raise HTTPException(
@@ -77,14 +79,18 @@ async def register(
     )
     
     db.add(db_student)
-    db.commit()
-    db.refresh(db_student)
+    await db.commit()
+    await db.refresh(db_student)
     
     return {"message": "User registered successfully", "user_id": db_student.id}
 
 @router.post("/login")
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(Student).filter(Student.username == form_data.username).first()
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_db),
+    activity: ActivityWriter = Depends(get_activity_writer)
+):
+    user = await db.scalar(select(Student).where(Student.username == form_data.username))
     
     if not user or not verify_password(form_data.password, user.preferences.get("password_hash", "")):
         raise HTTPException(
@@ -98,8 +104,8 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
         data={"sub": user.username}, expires_delta=access_token_expires
     )
     
-    user.last_active = datetime.utcnow()
-    db.commit()
+    # Not worth a commit of its own: written with other logins in the next batch
+    activity.touch(user.id)
     
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -0,0 +1,21 @@
+import httpx
+from fastapi import Depends
+
+from app.services.llm_client import LLMClientRegistry, get_llm_registry
+from app.services.http_client import get_http_client
+from app.services.explanation_service import ExplanationService
+from app.services.quiz_service import QuizService
+from app.services.svg_generator import SVGGenerator
+
+
+def get_explanation_service(
+    llm: LLMClientRegistry = Depends(get_llm_registry),
+    http_client: httpx.AsyncClient = Depends(get_http_client)
+) -> ExplanationService:
+    return ExplanationService(llm, http_client)
+
+def get_svg_generator(llm: LLMClientRegistry = Depends(get_llm_registry)) -> SVGGenerator:
+    return SVGGenerator(llm)
+
+def get_quiz_service(llm: LLMClientRegistry = Depends(get_llm_registry)) -> QuizService:
+    return QuizService(llm)
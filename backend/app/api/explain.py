@@ -1,16 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import undefer
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional
+from datetime import datetime
+import asyncio
+import json
 
-from app.database.database import get_db
-from app.models.models import Student, LearningSession, Concept
+from app.database.database import get_db, AsyncSessionLocal
+from app.models.models import Student, LearningSession, Concept, generate_uuid
 from app.services.explanation_service import ExplanationService
+from app.services.query_text import normalize_query
 from app.services.svg_generator import SVGGenerator
+from app.services.single_flight import SingleFlight
+from app.services.jobs import Job, JobManager, get_job_manager
+from app.services.vector_index import remember_explanation
+from app.services.student_stats import load_student_stats, record_session
+from app.services.concept_catalog import find_or_create_concept
+from app.api.dependencies import get_explanation_service, get_svg_generator
 from app.api.auth import get_current_user
+from app.api.flashcards import store_flashcard, flashcard_url
 
 router = APIRouter()
 
+# Identical questions asked at the same moment (a whole class looking up the
+# same topic) share one pipeline run; each student still gets their own session.
+explain_flight = SingleFlight("explain")
+flashcard_flight = SingleFlight("flashcard")
+
 class ExplanationRequest(BaseModel):
     query: str
 
@@ -18,61 +37,223 @@ class FeynmanRequest(BaseModel):
     session_id: str
     explanation: str
 
-@router.post("/explain")
-async def explain_concept(
-    request: ExplanationRequest,
-    current_user: Student = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    explanation_service = ExplanationService()
-    svg_generator = SVGGenerator()
+async def save_learning_session(
+    db: AsyncSession,
+    student_id: str,
+    query: str,
+    explanation_result: dict,
+    svg_flashcard: Optional[str] = None
+) -> LearningSession:
+    # Blob store write first, so the database transaction below stays short
+    flashcard_hash = await store_flashcard(svg_flashcard) if svg_flashcard else None
+    
+    # One transaction per request: ids and timestamps are generated here rather
+    # than at flush, so nothing has to be committed or refreshed midway
+    concept_id = await find_or_create_concept(db, query, explanation_result["explanation"][:500])
+    
+    stats = await load_student_stats(db, student_id)
+    session = LearningSession(
+        id=generate_uuid(),
+        started_at=datetime.utcnow(),
+        student_id=student_id,
+        concept_id=concept_id,
+        query=query,
+        explanation=explanation_result["explanation"],
+        sources=explanation_result["sources"],
+        # Only the blob store hash is kept on the row
+        svg_diagrams=[flashcard_hash] if flashcard_hash else []
+    )
+    
+    db.add(session)
+    await record_session(db, stats, session)
+    await db.commit()
+    # Later, similar questions can be grounded on this explanation without a web
+    # search. Chunking, embedding and a possible flush run off the event loop, and
+    # the session is already committed, so an indexing error is only logged.
+    try:
+        await asyncio.to_thread(remember_explanation, session.id, query, explanation_result["explanation"])
+    except Exception as e:
+        print(f"⚠️ Could not index explanation {session.id}: {e}")
+    return session
+
+async def build_flashcard(
+    session_id: str,
+    query: str,
+    explanation: str,
+    svg_generator: SVGGenerator
+) -> dict:
+    """Background job body: generate the SVG flashcard and store it on the session."""
+    svg_flashcard = await flashcard_flight.do(
+        normalize_query(query),
+        lambda: svg_generator.generate_svg_flashcard(query, explanation)
+    )
+    
+    flashcard_hash = await store_flashcard(svg_flashcard)
+    
+    async with AsyncSessionLocal() as db:
+        session = await db.get(LearningSession, session_id)
+        if session:
+            session.svg_diagrams = [flashcard_hash]
+            await db.commit()
     
+    return {
+        "session_id": session_id,
+        "svg_flashcard": svg_flashcard,
+        "flashcard_hash": flashcard_hash,
+        "flashcard_url": flashcard_url(flashcard_hash)
+    }
+
+def submit_flashcard_job(
+    jobs: JobManager,
+    session: LearningSession,
+    svg_generator: SVGGenerator,
+    owner_id: Optional[str] = None
+) -> Job:
+    session_id, query, explanation = session.id, session.query, session.explanation
+    return jobs.submit(
+        "flashcard",
+        lambda: build_flashcard(session_id, query, explanation, svg_generator),
+        owner_id=owner_id
+    )
+
+def find_flashcard_job(jobs: JobManager, job_id: str, owner_id: Optional[str] = None) -> Job:
+    job = jobs.get(job_id)
+    if not job or job.kind != "flashcard" or (owner_id and job.owner_id != owner_id):
+        raise HTTPException(status_code=404, detail="Flashcard job not found")
+    return job
+
+async def flashcard_job_status(job: Job, wait: float) -> dict:
+    # Optional long-poll so clients do not have to hammer the endpoint
+    if wait > 0 and not job.finished:
+        await job.wait(min(wait, 30))
+    return job.as_dict()
+
+async def stream_flashcard_job_events(job: Job):
+    await job.wait()
+    if job.status == "completed":
+        yield format_sse("flashcard", job.result)
+    else:
+        yield format_sse("error", {"detail": f"Error generating flashcard: {job.error}"})
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def stream_explanation_events(
+    query: str,
+    student_id: str,
+    db: AsyncSession,
+    explanation_service: ExplanationService,
+    svg_generator: SVGGenerator
+):
+    """Server-sent events for each pipeline stage, then the flashcard and the saved session id."""
     try:
-        explanation_result = await explanation_service.explain_concept(request.query)
+        explanation_result = None
+        async for event, data in explanation_service.explain_concept_stream(query):
+            if event == "explanation":
+                explanation_result = data
+            yield format_sse(event, data)
+        
         svg_flashcard = await svg_generator.generate_svg_flashcard(
-            request.query, 
+            query, 
             explanation_result["explanation"]
         )
+        yield format_sse("flashcard", {"svg_flashcard": svg_flashcard})
         
-        concept = db.query(Concept).filter(Concept.name == request.query).first()
-        if not concept:
-            concept = Concept(
-                name=request.query,
-                description=explanation_result["explanation"][:500]
-            )
-            db.add(concept)
-            db.commit()
-            db.refresh(concept)
+        session = await save_learning_session(db, student_id, query, explanation_result, svg_flashcard)
+        yield format_sse("done", {"session_id": session.id})
         
-        session = LearningSession(
-            student_id=current_user.id,
-            concept_id=concept.id,
-            query=request.query,
-            explanation=explanation_result["explanation"],
-            sources=explanation_result["sources"],
-            svg_diagrams=[svg_flashcard]
+    except Exception as e:
+        yield format_sse("error", {"detail": f"Error generating explanation: {str(e)}"})
+
+def event_stream_response(events) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/explain")
+async def explain_concept(
+    request: ExplanationRequest,
+    current_user: Student = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    explanation_service: ExplanationService = Depends(get_explanation_service),
+    svg_generator: SVGGenerator = Depends(get_svg_generator),
+    jobs: JobManager = Depends(get_job_manager)
+):
+    try:
+        explanation_result = await explain_flight.do(
+            normalize_query(request.query),
+            lambda: explanation_service.explain_concept(request.query)
         )
         
-        db.add(session)
-        db.commit()
-        db.refresh(session)
+        session = await save_learning_session(
+            db, current_user.id, request.query, explanation_result
+        )
+        # The flashcard is not on the critical path: it is generated after we respond
+        flashcard_job = submit_flashcard_job(jobs, session, svg_generator, owner_id=current_user.id)
         
         return {
             "explanation": explanation_result["explanation"],
             "sources": explanation_result["sources"],
-            "svg_flashcard": svg_flashcard,
+            "svg_flashcard": None,
+            "flashcard_job_id": flashcard_job.id,
             "session_id": session.id,
-            "keywords": explanation_result.get("keywords", [])
+            "keywords": explanation_result.get("keywords", []),
+            "retrieval": explanation_result.get("retrieval")
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating explanation: {str(e)}")
 
+@router.post("/explain/stream")
+async def explain_concept_stream(
+    request: ExplanationRequest,
+    current_user: Student = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    explanation_service: ExplanationService = Depends(get_explanation_service),
+    svg_generator: SVGGenerator = Depends(get_svg_generator)
+):
+    return event_stream_response(stream_explanation_events(
+        request.query, current_user.id, db, explanation_service, svg_generator
+    ))
+
+@router.get("/explain/stream")
+async def explain_concept_stream_get(
+    query: str,
+    current_user: Student = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    explanation_service: ExplanationService = Depends(get_explanation_service),
+    svg_generator: SVGGenerator = Depends(get_svg_generator)
+):
+    return event_stream_response(stream_explanation_events(
+        query, current_user.id, db, explanation_service, svg_generator
+    ))
+
+@router.get("/explain/flashcard/{job_id}")
+async def get_flashcard_job(
+    job_id: str,
+    wait: float = 0,
+    current_user: Student = Depends(get_current_user),
+    jobs: JobManager = Depends(get_job_manager)
+):
+    job = find_flashcard_job(jobs, job_id, owner_id=current_user.id)
+    return await flashcard_job_status(job, wait)
+
+@router.get("/explain/flashcard/{job_id}/events")
+async def stream_flashcard_job(
+    job_id: str,
+    current_user: Student = Depends(get_current_user),
+    jobs: JobManager = Depends(get_job_manager)
+):
+    job = find_flashcard_job(jobs, job_id, owner_id=current_user.id)
+    return event_stream_response(stream_flashcard_job_events(job))
+
 @router.post("/feynman/student-explanation")
 async def process_student_explanation(
     request: FeynmanRequest,
     current_user: Student = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # TODO: EXERCISE 3A - Implement Student Evaluation Agent (AI Agents Session)
     # INSTRUCTION: Create an AI agent that evaluates student explanations using ReAct framework
@@ -119,10 +300,10 @@ async def process_student_explanation(
     
     # TODO: Implement your solution here
     
-    session = db.query(LearningSession).filter(
+    session = await db.scalar(select(LearningSession).options(undefer(LearningSession.explanation)).where(
         LearningSession.id == request.session_id,
         LearningSession.student_id == current_user.id
-    ).first()
+    ))
     
     if not session:
         raise HTTPException(status_code=404, detail="Learning session not found")
@@ -160,16 +341,16 @@ async def process_student_explanation(
 async def get_recommendations(
     concept_id: str,
     current_user: Student = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    concept = db.query(Concept).filter(Concept.id == concept_id).first()
+    concept = await db.get(Concept, concept_id)
     if not concept:
         raise HTTPException(status_code=404, detail="Concept not found")
     
-    related_concepts = db.query(Concept).filter(
+    related_concepts = (await db.scalars(select(Concept).where(
         Concept.subject == concept.subject,
         Concept.id != concept.id
-    ).limit(5).all()
+    ).limit(5))).all()
     
     return {
         "prerequisites": concept.prerequisites or [],
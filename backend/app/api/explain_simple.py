@@ -1,82 +1,119 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional
 
 from app.database.database import get_db
 from app.models.models import LearningSession, Concept
 from app.services.explanation_service import ExplanationService
+from app.services.query_text import normalize_query
 from app.services.svg_generator import SVGGenerator
+from app.api.dependencies import get_explanation_service, get_svg_generator
+from app.services.jobs import JobManager, get_job_manager
+from app.api.explain import (
+    explain_flight,
+    save_learning_session,
+    submit_flashcard_job,
+    find_flashcard_job,
+    flashcard_job_status,
+    stream_flashcard_job_events,
+    stream_explanation_events,
+    event_stream_response
+)
 
 router = APIRouter()
 
+DEMO_STUDENT_ID = "demo-user"  # Static demo user
+
 class ExplanationRequest(BaseModel):
     query: str
 
 @router.post("/explain")
 async def explain_concept(
     request: ExplanationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    explanation_service: ExplanationService = Depends(get_explanation_service),
+    svg_generator: SVGGenerator = Depends(get_svg_generator),
+    jobs: JobManager = Depends(get_job_manager)
 ):
-    explanation_service = ExplanationService()
-    svg_generator = SVGGenerator()
-    
     try:
-        explanation_result = await explanation_service.explain_concept(request.query)
-        svg_flashcard = await svg_generator.generate_svg_flashcard(
-            request.query, 
-            explanation_result["explanation"]
+        explanation_result = await explain_flight.do(
+            normalize_query(request.query),
+            lambda: explanation_service.explain_concept(request.query)
         )
         
-        # Create or find concept (without user association)
-        concept = db.query(Concept).filter(Concept.name == request.query).first()
-        if not concept:
-            concept = Concept(
-                name=request.query,
-                description=explanation_result["explanation"][:500]
-            )
-            db.add(concept)
-            db.commit()
-            db.refresh(concept)
-        
-        # Create learning session (without user association)
-        session = LearningSession(
-            student_id="demo-user",  # Static demo user
-            concept_id=concept.id,
-            query=request.query,
-            explanation=explanation_result["explanation"],
-            sources=explanation_result["sources"],
-            svg_diagrams=[svg_flashcard]
+        # Create or find concept and a learning session (without user association)
+        session = await save_learning_session(
+            db, DEMO_STUDENT_ID, request.query, explanation_result
         )
-        
-        db.add(session)
-        db.commit()
-        db.refresh(session)
+        flashcard_job = submit_flashcard_job(jobs, session, svg_generator)
         
         return {
             "explanation": explanation_result["explanation"],
             "sources": explanation_result["sources"],
-            "svg_flashcard": svg_flashcard,
+            "svg_flashcard": None,
+            "flashcard_job_id": flashcard_job.id,
             "session_id": session.id,
-            "keywords": explanation_result.get("keywords", [])
+            "keywords": explanation_result.get("keywords", []),
+            "retrieval": explanation_result.get("retrieval")
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating explanation: {str(e)}")
 
+@router.post("/explain/stream")
+async def explain_concept_stream(
+    request: ExplanationRequest,
+    db: AsyncSession = Depends(get_db),
+    explanation_service: ExplanationService = Depends(get_explanation_service),
+    svg_generator: SVGGenerator = Depends(get_svg_generator)
+):
+    return event_stream_response(stream_explanation_events(
+        request.query, DEMO_STUDENT_ID, db, explanation_service, svg_generator
+    ))
+
+@router.get("/explain/stream")
+async def explain_concept_stream_get(
+    query: str,
+    db: AsyncSession = Depends(get_db),
+    explanation_service: ExplanationService = Depends(get_explanation_service),
+    svg_generator: SVGGenerator = Depends(get_svg_generator)
+):
+    return event_stream_response(stream_explanation_events(
+        query, DEMO_STUDENT_ID, db, explanation_service, svg_generator
+    ))
+
+@router.get("/explain/flashcard/{job_id}")
+async def get_flashcard_job(
+    job_id: str,
+    wait: float = 0,
+    jobs: JobManager = Depends(get_job_manager)
+):
+    job = find_flashcard_job(jobs, job_id)
+    return await flashcard_job_status(job, wait)
+
+@router.get("/explain/flashcard/{job_id}/events")
+async def stream_flashcard_job(
+    job_id: str,
+    jobs: JobManager = Depends(get_job_manager)
+):
+    job = find_flashcard_job(jobs, job_id)
+    return event_stream_response(stream_flashcard_job_events(job))
+
 @router.get("/recommendations/{concept_id}")
 async def get_recommendations(
     concept_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    concept = db.query(Concept).filter(Concept.id == concept_id).first()
+    concept = await db.get(Concept, concept_id)
     if not concept:
         raise HTTPException(status_code=404, detail="Concept not found")
     
-    related_concepts = db.query(Concept).filter(
+    related_concepts = (await db.scalars(select(Concept).where(
         Concept.subject == concept.subject,
         Concept.id != concept.id
-    ).limit(5).all()
+    ).limit(5))).all()
     
     return {
         "prerequisites": concept.prerequisites or [],
@@ -0,0 +1,38 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from app.services.blob_store import BlobStore, get_blob_store
+
+router = APIRouter()
+
+# A hash names exactly one content, so browsers and proxies may keep it forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+def flashcard_url(flashcard_hash: str) -> str:
+    return f"/api/flashcards/{flashcard_hash}"
+
+async def store_flashcard(svg_flashcard: str) -> str:
+    """Save an SVG in the blob store and return the hash sessions refer to it by."""
+    return await asyncio.to_thread(get_blob_store().put_text, svg_flashcard, "image/svg+xml")
+
+@router.get("/{flashcard_hash}")
+async def get_flashcard(
+    flashcard_hash: str,
+    request: Request,
+    store: BlobStore = Depends(get_blob_store)
+):
+    etag = f'"{flashcard_hash}"'
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": etag}
+    if etag in [value.strip() for value in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    blob = await asyncio.to_thread(store.get, flashcard_hash)
+    if blob is None:
+        raise HTTPException(status_code=404, detail="Flashcard not found")
+
+    data, content_type = blob
+    # Generated SVG opened directly must not be able to run scripts on the API origin
+    headers["Content-Security-Policy"] = "default-src 'none'; style-src 'unsafe-inline'; img-src data:"
+    headers["X-Content-Type-Options"] = "nosniff"
+    return Response(content=data, media_type=content_type, headers=headers)
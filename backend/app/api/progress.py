@@ -1,92 +1,113 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Tuple
+import base64
+import json
 
 from app.database.database import get_db
 from app.models.models import Student, Progress, Concept, LearningSession
 from app.api.auth import get_current_user
+from app.services.student_stats import load_student_stats
 
 router = APIRouter()
 
+def encode_cursor(mastery: float, progress_id: str) -> str:
+    raw = json.dumps([mastery, progress_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        mastery, progress_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(mastery), str(progress_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @router.get("/")
 async def get_progress(
+    limit: int = Query(100, ge=1, le=500),
+    after: Optional[str] = None,
+    subject: Optional[str] = None,
     current_user: Student = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    progress_records = db.query(Progress).filter(
+    """One page of the student's concepts, highest mastery first.
+
+    Pass the returned ``next_cursor`` as ``after`` to get the next page; the
+    (mastery, progress id) keyset keeps pages stable while new rows arrive.
+    """
+    mastery = func.coalesce(Progress.mastery_level, 0.0)
+    statement = select(
+        Progress.id, mastery, Progress.attempts, Progress.last_reviewed,
+        Concept.id, Concept.name, Concept.subject
+    ).join(Concept, Concept.id == Progress.concept_id).where(
         Progress.student_id == current_user.id
-    ).all()
+    )
+    if subject:
+        statement = statement.where(Concept.subject == subject)
+    if after:
+        after_mastery, after_id = decode_cursor(after)
+        statement = statement.where(or_(
+            mastery < after_mastery,
+            and_(mastery == after_mastery, Progress.id < after_id)
+        ))
+    # One extra row tells us whether there is another page
+    rows = (await db.execute(
+        statement.order_by(mastery.desc(), Progress.id.desc()).limit(limit + 1)
+    )).all()
     
-    concepts_progress = []
-    for progress in progress_records:
-        concept = db.query(Concept).filter(Concept.id == progress.concept_id).first()
-        if concept:
-            concepts_progress.append({
-                "concept_id": concept.id,
-                "name": concept.name,
-                "subject": concept.subject,
-                "mastery": progress.mastery_level or 0,
-                "attempts": progress.attempts or 0,
-                "last_reviewed": progress.last_reviewed
-            })
+    concepts_progress = [
+        {
+            "concept_id": concept_id,
+            "name": name,
+            "subject": concept_subject,
+            "mastery": mastery_level,
+            "attempts": attempts or 0,
+            "last_reviewed": last_reviewed
+        }
+        for _, mastery_level, attempts, last_reviewed, concept_id, name, concept_subject in rows[:limit]
+    ]
+    next_cursor = encode_cursor(rows[limit - 1][1], rows[limit - 1][0]) if len(rows) > limit else None
     
-    concepts_progress.sort(key=lambda x: x["mastery"], reverse=True)
-    
-    return {"concepts": concepts_progress}
+    return {"concepts": concepts_progress, "next_cursor": next_cursor}
 
 @router.get("/stats")
 async def get_progress_stats(
     current_user: Student = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    total_concepts = db.query(Progress).filter(
-        Progress.student_id == current_user.id
-    ).count()
-    
-    mastered_concepts = db.query(Progress).filter(
-        Progress.student_id == current_user.id,
-        Progress.mastery_level >= 85
-    ).count()
-    
-    recent_sessions = db.query(LearningSession).filter(
-        LearningSession.student_id == current_user.id
-    ).order_by(desc(LearningSession.started_at)).limit(5).all()
+    stats = await load_student_stats(db, current_user.id)
+    # Keeps the row if this was the student's first read
+    await db.commit()
     
-    total_sessions = db.query(LearningSession).filter(
-        LearningSession.student_id == current_user.id
-    ).count()
+    total_concepts = stats.total_concepts
+    mastered_concepts = stats.mastered_concepts
     
     return {
         "total_concepts_studied": total_concepts,
         "concepts_mastered": mastered_concepts,
         "mastery_percentage": (mastered_concepts / total_concepts * 100) if total_concepts > 0 else 0,
-        "total_sessions": total_sessions,
-        "recent_topics": [
-            {
-                "query": session.query,
-                "started_at": session.started_at,
-                "session_id": session.id
-            } for session in recent_sessions
-        ]
+        "total_sessions": stats.total_sessions,
+        "recent_topics": stats.recent_topics or []
     }
 
 @router.get("/concept/{concept_id}")
 async def get_concept_progress(
     concept_id: str,
     current_user: Student = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    progress = db.query(Progress).filter(
+    progress = await db.scalar(select(Progress).where(
         Progress.student_id == current_user.id,
         Progress.concept_id == concept_id
-    ).first()
+    ))
     
-    concept = db.query(Concept).filter(Concept.id == concept_id).first()
+    concept = await db.get(Concept, concept_id)
     
-    sessions = db.query(LearningSession).filter(
+    sessions = (await db.scalars(select(LearningSession).where(
         LearningSession.student_id == current_user.id,
         LearningSession.concept_id == concept_id
-    ).order_by(desc(LearningSession.started_at)).all()
+    ).order_by(desc(LearningSession.started_at)))).all()
     
     if not concept:
         return {"error": "Concept not found"}
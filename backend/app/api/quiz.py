@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import undefer
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import List, Dict
+from datetime import datetime
 
-from app.database.database import get_db
-from app.models.models import Student, LearningSession, Quiz, Progress
+from app.database.database import get_db, upsert_insert
+from app.models.models import Student, LearningSession, Quiz, Progress, generate_uuid
 from app.services.quiz_service import QuizService
+from app.api.dependencies import get_quiz_service
 from app.api.auth import get_current_user
+from app.services.student_stats import load_student_stats, progress_totals_query, record_progress
 
 router = APIRouter()
 
@@ -22,22 +27,66 @@ class SubmitQuizRequest(BaseModel):
     quiz_id: str
     answers: List[QuizAnswer]
 
+async def record_quiz_result(db: AsyncSession, student_id: str, concept_id: str, score: float):
+    """Count an attempt at the concept and keep the best score, in one atomic upsert.
+
+    Concurrent submissions for the same concept can neither lose an attempt
+    nor create a second row (progress is unique on student and concept).
+    """
+    stats = await load_student_stats(db, student_id)
+    current = select(Progress.mastery_level, Progress.attempts).where(
+        Progress.student_id == student_id,
+        Progress.concept_id == concept_id
+    )
+    before = (await db.execute(current)).first()
+    
+    progress = Progress.__table__
+    now = datetime.utcnow()
+    insert = upsert_insert(db.bind.dialect.name, progress).values(
+        id=generate_uuid(),
+        student_id=student_id,
+        concept_id=concept_id,
+        mastery_level=score,
+        attempts=1,
+        updated_at=now
+    )
+    await db.execute(insert.on_conflict_do_update(
+        index_elements=[progress.c.student_id, progress.c.concept_id],
+        set_={
+            "mastery_level": case(
+                (progress.c.mastery_level >= insert.excluded.mastery_level, progress.c.mastery_level),
+                else_=insert.excluded.mastery_level
+            ),
+            "attempts": func.coalesce(progress.c.attempts, 0) + 1,
+            "updated_at": now
+        }
+    ))
+    
+    # The row stays locked until commit, so this read is our own write
+    mastery, attempts = (await db.execute(current)).one()
+    expected_attempts = (before.attempts or 0) + 1 if before else 1
+    if attempts == expected_attempts:
+        record_progress(stats, before.mastery_level if before else None, mastery, created=before is None)
+    else:
+        # Another submission landed between the two reads: recount instead of guessing
+        totals = (await db.execute(progress_totals_query(student_id))).first()
+        stats.total_concepts, stats.mastered_concepts = totals[1], totals[2]
+
 @router.post("/generate")
 async def generate_quiz(
     request: GenerateQuizRequest,
     current_user: Student = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    quiz_service: QuizService = Depends(get_quiz_service)
 ):
-    session = db.query(LearningSession).filter(
+    session = await db.scalar(select(LearningSession).options(undefer(LearningSession.explanation)).where(
         LearningSession.id == request.session_id,
         LearningSession.student_id == current_user.id
-    ).first()
+    ))
     
     if not session:
         raise HTTPException(status_code=404, detail="Learning session not found")
     
-    quiz_service = QuizService()
-    
     try:
         quiz_data = await quiz_service.generate_quiz(
             session.explanation, 
@@ -53,8 +102,8 @@ async def generate_quiz(
         )
         
         db.add(quiz)
-        db.commit()
-        db.refresh(quiz)
+        await db.commit()
+        await db.refresh(quiz)
         
         return {
             "quiz_id": quiz.id,
@@ -68,18 +117,17 @@ async def generate_quiz(
 async def submit_quiz(
     request: SubmitQuizRequest,
     current_user: Student = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    quiz_service: QuizService = Depends(get_quiz_service)
 ):
-    quiz = db.query(Quiz).join(LearningSession).filter(
+    quiz = await db.scalar(select(Quiz).join(LearningSession).where(
         Quiz.id == request.quiz_id,
         LearningSession.student_id == current_user.id
-    ).first()
+    ))
     
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
     
-    quiz_service = QuizService()
-    
     try:
         answers_dict = [{"question_id": ans.question_id, "answer": ans.answer} for ans in request.answers]
         
@@ -89,28 +137,12 @@ async def submit_quiz(
         quiz.score = evaluation["score"]
         quiz.mastery_achieved = evaluation["mastery_achieved"]
         
-        db.commit()
-        
-        session = db.query(LearningSession).filter(LearningSession.id == quiz.session_id).first()
+        # The quiz result, the concept's progress and the student's stats commit together
+        session = await db.get(LearningSession, quiz.session_id)
         if session and session.concept_id:
-            progress = db.query(Progress).filter(
-                Progress.student_id == current_user.id,
-                Progress.concept_id == session.concept_id
-            ).first()
-            
-            if progress:
-                progress.mastery_level = max(progress.mastery_level or 0, evaluation["score"])
-                progress.attempts = (progress.attempts or 0) + 1
-            else:
-                progress = Progress(
-                    student_id=current_user.id,
-                    concept_id=session.concept_id,
-                    mastery_level=evaluation["score"],
-                    attempts=1
-                )
-                db.add(progress)
-            
-            db.commit()
+            await record_quiz_result(db, current_user.id, session.concept_id, evaluation["score"])
+        
+        await db.commit()
         
         return {
             "score": evaluation["score"],
@@ -127,12 +159,12 @@ async def submit_quiz(
 async def get_quiz(
     quiz_id: str,
     current_user: Student = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    quiz = db.query(Quiz).join(LearningSession).filter(
+    quiz = await db.scalar(select(Quiz).join(LearningSession).where(
         Quiz.id == quiz_id,
         LearningSession.student_id == current_user.id
-    ).first()
+    ))
     
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
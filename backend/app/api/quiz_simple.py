@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import undefer
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import List, Dict
 
 from app.database.database import get_db
 from app.models.models import LearningSession, Quiz
 from app.services.quiz_service import QuizService
+from app.api.dependencies import get_quiz_service
 
 router = APIRouter()
 
@@ -24,17 +26,14 @@ class SubmitQuizRequest(BaseModel):
 @router.post("/generate")
 async def generate_quiz(
     request: GenerateQuizRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    quiz_service: QuizService = Depends(get_quiz_service)
 ):
-    session = db.query(LearningSession).filter(
-        LearningSession.id == request.session_id
-    ).first()
+    session = await db.get(LearningSession, request.session_id, options=[undefer(LearningSession.explanation)])
     
     if not session:
         raise HTTPException(status_code=404, detail="Learning session not found")
     
-    quiz_service = QuizService()
-    
     try:
         quiz_data = await quiz_service.generate_quiz(
             session.explanation, 
@@ -50,8 +49,8 @@ async def generate_quiz(
         )
         
         db.add(quiz)
-        db.commit()
-        db.refresh(quiz)
+        await db.commit()
+        await db.refresh(quiz)
         
         return {
             "quiz_id": quiz.id,
@@ -64,17 +63,14 @@ async def generate_quiz(
 @router.post("/submit")
 async def submit_quiz(
     request: SubmitQuizRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    quiz_service: QuizService = Depends(get_quiz_service)
 ):
-    quiz = db.query(Quiz).filter(
-        Quiz.id == request.quiz_id
-    ).first()
+    quiz = await db.get(Quiz, request.quiz_id)
     
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
     
-    quiz_service = QuizService()
-    
     try:
         answers_dict = [{"question_id": ans.question_id, "answer": ans.answer} for ans in request.answers]
         
@@ -84,7 +80,7 @@ async def submit_quiz(
         quiz.score = evaluation["score"]
         quiz.mastery_achieved = evaluation["mastery_achieved"]
         
-        db.commit()
+        await db.commit()
         
         return {
             "score": evaluation["score"],
@@ -100,9 +96,9 @@ async def submit_quiz(
 @router.get("/{quiz_id}")
 async def get_quiz(
     quiz_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    quiz = db.query(Quiz).filter(Quiz.id == quiz_id).first()
+    quiz = await db.get(Quiz, quiz_id)
     
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
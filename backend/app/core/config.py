@@ -1,5 +1,6 @@
 import os
-from typing import Optional
+import json
+from typing import Optional, Dict
 
 # Try to load .env file if python-dotenv is available
 try:
@@ -15,10 +16,94 @@ class Settings:
     API_V1_STR: str = "/api"
     
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+    # Apply Alembic migrations when the app starts (turn off when a deploy step runs them)
+    DATABASE_MIGRATE_ON_STARTUP: bool = os.getenv("DATABASE_MIGRATE_ON_STARTUP", "true").lower() == "true"
     
     GEMINI_API_KEY: Optional[str] = os.getenv("GEMINI_API_KEY")
     SEARCH_API_KEY: Optional[str] = os.getenv("SEARCH_API_KEY")
     
+    # Shared Gemini client registry (see app/services/llm_client.py)
+    LLM_DEFAULT_MODEL: str = os.getenv("LLM_DEFAULT_MODEL", "gemini-2.5-pro")
+    LLM_TRANSPORT: Optional[str] = os.getenv("LLM_TRANSPORT")  # "grpc" or "rest"
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    # Per-model overrides, e.g. {"gemini-2.5-flash": {"max_concurrency": 16, "timeout_seconds": 20}}
+    LLM_MODEL_SETTINGS: Dict[str, Dict] = json.loads(os.getenv("LLM_MODEL_SETTINGS", "{}"))
+    
+    # LLM response cache (see app/services/llm_cache.py)
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_MAX_BYTES: int = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "./cache/llm_cache.db")
+    LLM_CACHE_TTL_SECONDS: int = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    
+    # Shared outbound HTTP client (see app/services/http_client.py)
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "60"))
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "3"))
+    HTTP_READ_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", "8"))
+    HTTP_POOL_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_POOL_TIMEOUT_SECONDS", "2"))
+    HTTP_USER_AGENT: str = os.getenv(
+        "HTTP_USER_AGENT",
+        "AIConceptExplainer/1.0 (educational RAG app; https://github.com/icodestuffmaybe/tom_jacob_final_project_ai_concept_explainer)"
+    )
+    
+    # Per-provider deadlines for the concurrent source search
+    WIKIPEDIA_DEADLINE_SECONDS: float = float(os.getenv("WIKIPEDIA_DEADLINE_SECONDS", "6"))
+    DUCKDUCKGO_DEADLINE_SECONDS: float = float(os.getenv("DUCKDUCKGO_DEADLINE_SECONDS", "8"))
+    
+    # DuckDuckGo runs on its own thread pool; the timeout applies to each HTTP request it makes
+    DUCKDUCKGO_MAX_WORKERS: int = int(os.getenv("DUCKDUCKGO_MAX_WORKERS", "4"))
+    DUCKDUCKGO_TIMEOUT_SECONDS: int = int(os.getenv("DUCKDUCKGO_TIMEOUT_SECONDS", "6"))
+    
+    # Wikipedia response cache (served stale while revalidating with ETag/Last-Modified)
+    WIKIPEDIA_CACHE_ENABLED: bool = os.getenv("WIKIPEDIA_CACHE_ENABLED", "true").lower() == "true"
+    WIKIPEDIA_CACHE_PATH: str = os.getenv("WIKIPEDIA_CACHE_PATH", "./cache/wikipedia_cache.db")
+    WIKIPEDIA_CACHE_FRESH_SECONDS: int = int(os.getenv("WIKIPEDIA_CACHE_FRESH_SECONDS", str(24 * 3600)))
+    WIKIPEDIA_CACHE_STALE_SECONDS: int = int(os.getenv("WIKIPEDIA_CACHE_STALE_SECONDS", str(30 * 24 * 3600)))
+    
+    # Local keyword extraction is trusted at or above this confidence; below it Gemini is asked
+    KEYWORD_LLM_CONFIDENCE_THRESHOLD: float = float(os.getenv("KEYWORD_LLM_CONFIDENCE_THRESHOLD", "0.6"))
+    
+    # Remembered (provider, keyword) misses, skipped until they expire
+    NEGATIVE_CACHE_ENABLED: bool = os.getenv("NEGATIVE_CACHE_ENABLED", "true").lower() == "true"
+    NEGATIVE_CACHE_PATH: str = os.getenv("NEGATIVE_CACHE_PATH", "./cache/negative_cache.db")
+    NEGATIVE_CACHE_TTL_SECONDS: int = int(os.getenv("NEGATIVE_CACHE_TTL_SECONDS", str(24 * 3600)))
+    NEGATIVE_CACHE_TIMEOUT_TTL_SECONDS: int = int(os.getenv("NEGATIVE_CACHE_TIMEOUT_TTL_SECONDS", "600"))
+    
+    # Source passages packed into the prompts (sentence windows ranked by BM25)
+    SOURCE_TOKEN_BUDGET: int = int(os.getenv("SOURCE_TOKEN_BUDGET", "300"))
+    SOURCE_PASSAGE_CHARS: int = int(os.getenv("SOURCE_PASSAGE_CHARS", "400"))
+    
+    # Offline Wikipedia abstracts index (build with: python -m app.services.local_wikipedia ingest <file>)
+    LOCAL_WIKIPEDIA_ENABLED: bool = os.getenv("LOCAL_WIKIPEDIA_ENABLED", "true").lower() == "true"
+    LOCAL_WIKIPEDIA_INDEX_PATH: str = os.getenv("LOCAL_WIKIPEDIA_INDEX_PATH", "./data/wikipedia_abstracts.db")
+    
+    # Local vector index over fetched sources and past explanations
+    VECTOR_INDEX_ENABLED: bool = os.getenv("VECTOR_INDEX_ENABLED", "true").lower() == "true"
+    VECTOR_INDEX_DIR: str = os.getenv("VECTOR_INDEX_DIR", "./data/vector_index")
+    VECTOR_INDEX_DIM: int = int(os.getenv("VECTOR_INDEX_DIM", "1024"))
+    VECTOR_INDEX_FLUSH_EVERY: int = int(os.getenv("VECTOR_INDEX_FLUSH_EVERY", "64"))
+    VECTOR_INDEX_MIN_SCORE: float = float(os.getenv("VECTOR_INDEX_MIN_SCORE", "0.5"))
+    # "hashing" or "package.module:ClassName" for a custom local embedder
+    VECTOR_EMBEDDER: str = os.getenv("VECTOR_EMBEDDER", "hashing")
+    
+    # Content-addressed store for SVG flashcards (sessions keep only the SHA-256)
+    BLOB_STORE_DIR: str = os.getenv("BLOB_STORE_DIR", "./data/blobs")
+    
+    # Compressed explanation/sources/quiz columns: "auto" (zstd if installed, else zlib), "zlib" or "zstd"
+    COMPRESSION_CODEC: str = os.getenv("COMPRESSION_CODEC", "auto")
+    # Trained preset dictionaries (zdict_<id>.bin); stored values need theirs to be read back
+    COMPRESSION_DICTIONARY_DIR: str = os.getenv("COMPRESSION_DICTIONARY_DIR", "./data/compression")
+    
+    # Low-value writes (students' last_active) are batched into one commit per interval
+    ACTIVITY_FLUSH_INTERVAL_MS: int = int(os.getenv("ACTIVITY_FLUSH_INTERVAL_MS", "500"))
+    
+    # Background jobs (deferred SVG flashcards)
+    JOB_MAX_WORKERS: int = int(os.getenv("JOB_MAX_WORKERS", "4"))
+    JOB_RETENTION_SECONDS: int = int(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+    
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -0,0 +1,163 @@
+"""Query plan benchmark for the API's hot-path lookups on SQLite.
+
+Seeds a throwaway database (one million learning sessions by default)
+through the real migrations, then runs the queries the endpoints issue
+with the hot-path indexes dropped ("before") and recreated ("after"),
+printing SQLite's EXPLAIN QUERY PLAN and the mean latency of each.
+
+    python -m app.database.benchmark --sessions 1000000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex
+
+from app.database.migrations import upgrade_database
+from app.models.models import Base
+
+SUBJECTS = ["biology", "physics", "chemistry", "earth science", "mathematics", "computer science", "history"]
+
+# (label, SQL, parameter factory) mirroring the ORM queries in app/api
+QUERIES = [
+    ("progress for student+concept (quiz submit)",
+     "SELECT id, mastery_level, attempts FROM progress WHERE student_id = ? AND concept_id = ?",
+     lambda ctx: (ctx.student(), ctx.concept())),
+    ("recent sessions (progress stats)",
+     "SELECT id, query, started_at FROM learning_sessions WHERE student_id = ? ORDER BY started_at DESC LIMIT 5",
+     lambda ctx: (ctx.student(),)),
+    ("session count (progress stats)",
+     "SELECT count(*) FROM learning_sessions WHERE student_id = ?",
+     lambda ctx: (ctx.student(),)),
+    ("sessions for student+concept (concept progress)",
+     "SELECT id, query, started_at FROM learning_sessions WHERE student_id = ? AND concept_id = ? "
+     "ORDER BY started_at DESC",
+     lambda ctx: (ctx.student(), ctx.concept())),
+    ("quizzes for session",
+     "SELECT id, score FROM quizzes WHERE session_id = ?",
+     lambda ctx: (ctx.session(),)),
+    ("concept by name (save session)",
+     "SELECT id FROM concepts WHERE name = ?",
+     lambda ctx: (f"concept {ctx.rng.randrange(ctx.concepts)}",)),
+    ("related concepts by subject (recommendations)",
+     "SELECT id, name FROM concepts WHERE subject = ? AND id != ? LIMIT 5",
+     lambda ctx: (ctx.rng.choice(SUBJECTS), ctx.concept())),
+]
+
+
+class SeedContext:
+    def __init__(self, students: int, concepts: int, sessions: int, seed: int = 7):
+        self.students = students
+        self.concepts = concepts
+        self.sessions = sessions
+        self.rng = random.Random(seed)
+
+    def student(self) -> str:
+        return f"s{self.rng.randrange(self.students):07d}"
+
+    def concept(self) -> str:
+        return f"c{self.rng.randrange(self.concepts):07d}"
+
+    def session(self) -> str:
+        return f"ls{self.rng.randrange(self.sessions):09d}"
+
+
+def seed(db: sqlite3.Connection, ctx: SeedContext, batch: int = 50_000):
+    db.execute("PRAGMA journal_mode=OFF")
+    db.execute("PRAGMA synchronous=OFF")
+    start = datetime(2024, 1, 1)
+    db.executemany(
+        "INSERT INTO students (id, username, email, grade_level, created_at) VALUES (?, ?, ?, ?, ?)",
+        ((f"s{i:07d}", f"student{i}", f"student{i}@example.com", 7 + i % 6, start) for i in range(ctx.students))
+    )
+    db.executemany(
+        "INSERT INTO concepts (id, name, subject, description, created_at) VALUES (?, ?, ?, ?, ?)",
+        ((f"c{i:07d}", f"concept {i}", SUBJECTS[i % len(SUBJECTS)], "", start) for i in range(ctx.concepts))
+    )
+    for offset in range(0, ctx.sessions, batch):
+        rows, quizzes = [], []
+        for i in range(offset, min(offset + batch, ctx.sessions)):
+            session_id = f"ls{i:09d}"
+            started = start + timedelta(seconds=ctx.rng.randrange(365 * 24 * 3600))
+            rows.append((session_id, ctx.student(), ctx.concept(), f"question {i}", "explanation", started.isoformat(" ")))
+            if i % 4 == 0:
+                quizzes.append((f"q{i:09d}", session_id, ctx.rng.random() * 100))
+        db.executemany(
+            "INSERT INTO learning_sessions (id, student_id, concept_id, query, explanation, started_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
+        db.executemany("INSERT INTO quizzes (id, session_id, score) VALUES (?, ?, ?)", quizzes)
+        print(f"   seeded {min(offset + batch, ctx.sessions):,} sessions", end="\r", flush=True)
+    # Progress is unique per student and concept; repeated random pairs are skipped
+    db.executemany(
+        "INSERT OR IGNORE INTO progress (id, student_id, concept_id, mastery_level, attempts) VALUES (?, ?, ?, ?, ?)",
+        ((f"p{i:09d}", ctx.student(), ctx.concept(), ctx.rng.random() * 100, 1) for i in range(ctx.sessions // 5))
+    )
+    db.commit()
+    print()
+
+
+def hot_path_indexes():
+    return [index for table in Base.metadata.sorted_tables for index in table.indexes]
+
+
+def create_index_sql(index) -> str:
+    # The DDL SQLAlchemy would emit, so unique indexes are recreated as unique
+    return str(CreateIndex(index, if_not_exists=True).compile(dialect=sqlite.dialect()))
+
+
+def run_queries(db: sqlite3.Connection, ctx: SeedContext, label: str, repeat: int):
+    print(f"\n=== {label} ===")
+    for name, sql, params in QUERIES:
+        plan = " | ".join(row[3] for row in db.execute(f"EXPLAIN QUERY PLAN {sql}", params(ctx)))
+        started = time.perf_counter()
+        for _ in range(repeat):
+            db.execute(sql, params(ctx)).fetchall()
+        mean_ms = (time.perf_counter() - started) * 1000 / repeat
+        print(f"{mean_ms:9.3f} ms  {name}\n             plan: {plan}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compare hot-path query plans with and without indexes")
+    parser.add_argument("--path", default="./data/benchmark.db")
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--concepts", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded database for another run")
+    args = parser.parse_args(argv)
+
+    ctx = SeedContext(args.students, args.concepts, args.sessions)
+    os.makedirs(os.path.dirname(os.path.abspath(args.path)), exist_ok=True)
+    upgrade_database(f"sqlite:///{os.path.abspath(args.path)}")
+
+    db = sqlite3.connect(args.path)
+    try:
+        if db.execute("SELECT count(*) FROM learning_sessions").fetchone()[0] < args.sessions:
+            print(f"🌱 Seeding {args.sessions:,} sessions into {args.path}")
+            seed(db, ctx)
+
+        for index in hot_path_indexes():
+            db.execute(f"DROP INDEX IF EXISTS {index.name}")
+        db.execute("ANALYZE")
+        run_queries(db, ctx, "before: primary keys and unique columns only", args.repeat)
+
+        for index in hot_path_indexes():
+            db.execute(create_index_sql(index))
+        db.execute("ANALYZE")
+        db.commit()
+        run_queries(db, ctx, "after: migration 0001 indexes", args.repeat)
+    finally:
+        db.close()
+        if not args.keep:
+            os.remove(args.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Compressed column types for large text and JSON values.
+
+CompressedText and CompressedJSON store values as
+``MAGIC | codec | dictionary id (2 bytes) | payload`` in a binary column.
+The payload is zstd when the optional ``zstandard`` package is installed
+and zlib otherwise, primed with a preset dictionary built from our own
+explanations (``python -m app.database.compression train``). Dictionaries
+live in COMPRESSION_DICTIONARY_DIR as ``zdict_<id>.bin`` and are never
+rewritten, so every stored value can name the one it was written with; new
+values use the highest id. Values written before compression (plain text,
+or UTF-8 bytes after a column type change) are read back unchanged.
+
+    python -m app.database.compression train
+    python -m app.database.compression recompress
+    python -m app.database.compression stats
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from app.core.config import settings
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# NUL never starts a text or JSON value, so it separates compressed values from legacy ones
+MAGIC = b"\x00C"
+HEADER_SIZE = len(MAGIC) + 3
+CODEC_RAW, CODEC_ZLIB, CODEC_ZSTD = b"r", b"z", b"s"
+# Compressing shorter values costs more than it saves
+MIN_COMPRESS_BYTES = 64
+DICTIONARY_FILE = re.compile(r"^zdict_(\d+)\.bin$")
+
+
+class Dictionaries:
+    """Preset dictionaries by id, read from disk on first use."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._loaded: Dict[int, bytes] = {}
+        self._zstd: Dict[int, "zstandard.ZstdCompressionDict"] = {}
+        self._latest: Optional[int] = None
+
+    def path(self, dictionary_id: int) -> str:
+        return os.path.join(self.directory, f"zdict_{dictionary_id}.bin")
+
+    def ids(self) -> List[int]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(int(m.group(1)) for m in map(DICTIONARY_FILE.match, os.listdir(self.directory)) if m)
+
+    def latest(self) -> int:
+        """Id used for new values (0 when no dictionary has been trained)."""
+        if self._latest is None:
+            ids = self.ids()
+            self._latest = ids[-1] if ids else 0
+        return self._latest
+
+    def get(self, dictionary_id: int) -> bytes:
+        with self._lock:
+            if dictionary_id not in self._loaded:
+                try:
+                    with open(self.path(dictionary_id), "rb") as f:
+                        self._loaded[dictionary_id] = f.read()
+                except FileNotFoundError:
+                    raise ValueError(f"Compression dictionary {dictionary_id} is missing from {self.directory}")
+            return self._loaded[dictionary_id]
+
+    def zstd(self, dictionary_id: int) -> "zstandard.ZstdCompressionDict":
+        if dictionary_id not in self._zstd:
+            self._zstd[dictionary_id] = zstandard.ZstdCompressionDict(
+                self.get(dictionary_id), dict_type=zstandard.DICT_TYPE_RAWCONTENT
+            )
+        return self._zstd[dictionary_id]
+
+    def add(self, data: bytes) -> int:
+        os.makedirs(self.directory, exist_ok=True)
+        dictionary_id = self.latest() + 1
+        with open(self.path(dictionary_id), "xb") as f:
+            f.write(data)
+        self._latest = dictionary_id
+        return dictionary_id
+
+
+dictionaries = Dictionaries(settings.COMPRESSION_DICTIONARY_DIR)
+
+
+def default_codec() -> bytes:
+    if settings.COMPRESSION_CODEC == "zlib" or not ZSTD_AVAILABLE:
+        return CODEC_ZLIB
+    return CODEC_ZSTD
+
+
+def compress(data: bytes, codec: Optional[bytes] = None, dictionary_id: Optional[int] = None) -> bytes:
+    codec = codec or default_codec()
+    dictionary_id = dictionaries.latest() if dictionary_id is None else dictionary_id
+    if len(data) >= MIN_COMPRESS_BYTES:
+        if codec == CODEC_ZSTD:
+            dict_data = dictionaries.zstd(dictionary_id) if dictionary_id else None
+            payload = zstandard.ZstdCompressor(level=6, dict_data=dict_data).compress(data)
+        else:
+            compressor = zlib.compressobj(6, zdict=dictionaries.get(dictionary_id)) if dictionary_id \
+                else zlib.compressobj(6)
+            payload = compressor.compress(data) + compressor.flush()
+        if len(payload) < len(data):
+            return MAGIC + codec + dictionary_id.to_bytes(2, "big") + payload
+    return MAGIC + CODEC_RAW + (0).to_bytes(2, "big") + data
+
+
+def decompress(value: bytes) -> bytes:
+    if not value.startswith(MAGIC):
+        return value  # written before compression
+    codec = value[2:3]
+    dictionary_id = int.from_bytes(value[3:5], "big")
+    payload = value[HEADER_SIZE:]
+    if codec == CODEC_RAW:
+        return payload
+    if codec == CODEC_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise ValueError("Value is zstd-compressed but the 'zstandard' package is not installed")
+        dict_data = dictionaries.zstd(dictionary_id) if dictionary_id else None
+        return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(payload)
+    decompressor = zlib.decompressobj(zdict=dictionaries.get(dictionary_id)) if dictionary_id \
+        else zlib.decompressobj()
+    return decompressor.decompress(payload) + decompressor.flush()
+
+
+class CompressedText(TypeDecorator):
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress(value.encode("utf-8"))
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        return decompress(bytes(value)).decode("utf-8")
+
+
+class CompressedJSON(TypeDecorator):
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return json.loads(value)
+        return json.loads(decompress(bytes(value)))
+
+
+def train_dictionary(samples: Iterable[str], size: int = 32 * 1024) -> bytes:
+    """Raw-content dictionary of the phrases that recur across samples.
+
+    Word 2- to 6-grams that appear in several samples are ranked by the bytes
+    they would save. Matches at shorter distances encode in fewer bits, so
+    the most valuable phrases go at the end of the dictionary.
+    """
+    document_counts: Counter = Counter()
+    for sample in samples:
+        words = sample.split()
+        phrases = {" ".join(words[i:i + n]) for n in range(2, 7) for i in range(len(words) - n + 1)}
+        document_counts.update(phrases)
+
+    ranked = sorted(
+        ((count * len(phrase), phrase) for phrase, count in document_counts.items() if count > 1),
+        reverse=True
+    )
+    chosen, used = [], 0
+    for _, phrase in ranked:
+        encoded = (phrase + " ").encode("utf-8")
+        if any(phrase in longer for longer in chosen[-50:]):
+            continue
+        if used + len(encoded) > size:
+            break
+        chosen.append(phrase)
+        used += len(encoded)
+    return "".join(phrase + " " for phrase in reversed(chosen)).encode("utf-8")
+
+
+# Compressed columns: (table, primary key, columns); the recompress command rewrites these
+COMPRESSED_COLUMNS = [
+    ("learning_sessions", "id", ["explanation", "sources"]),
+    ("quizzes", "id", ["questions"]),
+]
+
+
+def rewrite_rows(bind, table: str, key: str, columns: List[str], compressed: bool = True,
+                 batch_size: int = 500) -> int:
+    """Re-encode stored values in place, in primary-key batches.
+
+    With ``compressed`` values are (re)compressed with the current codec and
+    dictionary; without it they are written back as plain UTF-8 (for downgrades).
+    Columns are read untyped, so legacy text and compressed bytes look as stored.
+    """
+    from sqlalchemy import column, select, table as table_clause
+
+    rows_table = table_clause(table, column(key), *[column(name) for name in columns])
+    current = MAGIC + default_codec() + dictionaries.latest().to_bytes(2, "big")
+    last_key, rewritten = "", 0
+    while True:
+        rows = bind.execute(
+            select(rows_table).where(rows_table.c[key] > last_key).order_by(rows_table.c[key]).limit(batch_size)
+        ).all()
+        if not rows:
+            return rewritten
+        for row in rows:
+            values = {}
+            for name in columns:
+                value = row._mapping[name]
+                if value is None or (compressed and isinstance(value, bytes) and value.startswith(current)):
+                    continue
+                data = value.encode("utf-8") if isinstance(value, str) else decompress(bytes(value))
+                if compressed:
+                    values[name] = compress(data)
+                else:
+                    # SQLite keeps whatever storage class is written, so plain values go back as TEXT
+                    values[name] = data.decode("utf-8") if bind.dialect.name == "sqlite" else data
+            if values:
+                bind.execute(rows_table.update().where(rows_table.c[key] == row._mapping[key]).values(**values))
+                rewritten += 1
+        last_key = rows[-1]._mapping[key]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Manage compressed columns")
+    commands = parser.add_subparsers(dest="command", required=True)
+    train = commands.add_parser("train", help="Build a new dictionary from stored explanations")
+    train.add_argument("--samples", type=int, default=2000)
+    train.add_argument("--size", type=int, default=32 * 1024, help="zlib uses at most 32 KiB")
+    commands.add_parser("recompress", help="Rewrite stored values with the newest dictionary")
+    commands.add_parser("stats", help="Compare stored and uncompressed sizes")
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import column, func, select, table as table_clause
+    from app.database.database import engine
+    from app.models.models import LearningSession
+
+    with engine.begin() as connection:
+        if args.command == "train":
+            explanations = connection.execute(
+                select(LearningSession.explanation).where(LearningSession.explanation.isnot(None))
+                .order_by(LearningSession.started_at.desc()).limit(args.samples)
+            ).scalars().all()
+            if not explanations:
+                print("⚠️ No explanations stored yet; nothing to train on")
+                return
+            dictionary_id = dictionaries.add(train_dictionary(explanations, args.size))
+            print(f"✅ Trained dictionary {dictionary_id} from {len(explanations)} explanations "
+                  f"({dictionaries.path(dictionary_id)}); restart the app and run 'recompress' to use it")
+        elif args.command == "recompress":
+            for table, key, columns in COMPRESSED_COLUMNS:
+                print(f"✅ {table}: rewrote {rewrite_rows(connection, table, key, columns)} rows")
+        else:
+            for table, key, columns in COMPRESSED_COLUMNS:
+                for name in columns:
+                    values = connection.execute(
+                        select(column(name)).select_from(table_clause(table)).where(column(name).isnot(None))
+                        .limit(1000)
+                    ).scalars().all()
+                    stored = sum(len(value) for value in values)
+                    plain = sum(len(value.encode("utf-8")) if isinstance(value, str) else len(decompress(value))
+                                for value in values)
+                    ratio = plain / stored if stored else 0.0
+                    print(f"{table}.{name}: {len(values)} sampled, {plain} -> {stored} bytes ({ratio:.2f}x)")
+            print(f"New values: codec {default_codec().decode()}, dictionary {dictionaries.latest()}")
+
+
+if __name__ == "__main__":
+    main()
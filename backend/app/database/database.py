@@ -1,20 +1,80 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import sessionmaker
 import os
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
 
+# Async drivers for each sync URL scheme; URLs that already name a driver are used as-is
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    scheme, separator, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+# INSERT constructs with ON CONFLICT support (.on_conflict_do_update / .excluded)
+UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+def upsert_insert(dialect_name: str, table):
+    """Dialect INSERT for ``table`` with ``.on_conflict_do_nothing`` / ``.on_conflict_do_update``.
+
+    Raises ValueError for databases other than SQLite and PostgreSQL, which
+    are the only ones DATABASE_URL supports.
+    """
+    if dialect_name not in UPSERT_INSERTS:
+        raise ValueError(
+            f"Unsupported database dialect '{dialect_name}': INSERT ... ON CONFLICT is only "
+            f"available for {', '.join(sorted(UPSERT_INSERTS))}"
+        )
+    return UPSERT_INSERTS[dialect_name](table)
+
+def sqlite_connect_args(url: str) -> dict:
+    return {"check_same_thread": False} if url.startswith("sqlite") else {}
+
+def use_sqlite_wal(engine):
+    """WAL lets readers run during a write, and synchronous=NORMAL fsyncs at
+    checkpoints instead of on every commit (a crash can lose the last few
+    commits, never corrupt the file)."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+# The sync engine is kept for table creation and command-line scripts
 engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+    DATABASE_URL, connect_args=sqlite_connect_args(DATABASE_URL)
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+use_sqlite_wal(engine)
+
+# Request handlers use the async engine so queries and commits (including
+# SQLite's fsync) do not block the event loop
+async_engine = create_async_engine(async_database_url(DATABASE_URL))
+use_sqlite_wal(async_engine.sync_engine)
+# expire_on_commit=False: attributes stay readable after commit without a lazy reload
+AsyncSessionLocal = sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+async def close_database():
+    await async_engine.dispose()
@@ -0,0 +1,25 @@
+import os
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+
+from app.database.database import DATABASE_URL
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def alembic_config(database_url: Optional[str] = None) -> Config:
+    """Alembic config for backend/migrations that works from any working directory."""
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    # configparser treats "%" as interpolation, e.g. in URL-encoded passwords
+    config.set_main_option("sqlalchemy.url", (database_url or DATABASE_URL).replace("%", "%%"))
+    # Keep the app's own logging setup instead of alembic.ini's
+    config.attributes["configure_logging"] = False
+    return config
+
+
+def upgrade_database(database_url: Optional[str] = None, revision: str = "head"):
+    command.upgrade(alembic_config(database_url), revision)
+    print(f"✅ Database schema at {revision}")
@@ -1,15 +1,47 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import auth, explain, quiz, progress
-from app.database.database import engine
-from app.models import models
+from app.api import auth, explain, quiz, progress, flashcards
+from app.api.explain import explain_flight
+from app.core.config import settings
+from app.database.database import close_database
+from app.database.migrations import upgrade_database
+from app.services.llm_client import init_llm_registry, get_llm_registry, shutdown_llm_registry
+from app.services.jobs import get_job_manager, shutdown_job_manager
+from app.services.http_client import init_http_client, close_http_client, http_client_stats
+from app.services.wikipedia_cache import get_wikipedia_cache, close_wikipedia_cache
+from app.services.local_wikipedia import get_local_wikipedia, close_local_wikipedia
+from app.services.vector_index import get_vector_index, close_vector_index
+from app.services.negative_cache import get_negative_cache, close_negative_cache
+from app.services.duckduckgo_provider import get_duckduckgo_provider, shutdown_duckduckgo_provider
+from app.services.blob_store import get_blob_store, close_blob_store
+from app.services.activity_writer import get_activity_writer, close_activity_writer
 
-models.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.DATABASE_MIGRATE_ON_STARTUP:
+        upgrade_database()
+    app.state.llm_registry = init_llm_registry()
+    app.state.job_manager = get_job_manager()
+    app.state.http_client = init_http_client()
+    yield
+    await shutdown_job_manager()
+    await close_http_client()
+    close_wikipedia_cache()
+    close_local_wikipedia()
+    close_vector_index()
+    close_negative_cache()
+    shutdown_duckduckgo_provider()
+    close_blob_store()
+    shutdown_llm_registry()
+    await close_activity_writer()
+    await close_database()
 
 app = FastAPI(
     title="AI Concept Explainer API",
     description="Educational AI system for explaining concepts with source verification",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -22,6 +54,7 @@ app.add_middleware(
 
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(explain.router, prefix="/api", tags=["explanation"])
+app.include_router(flashcards.router, prefix="/api/flashcards", tags=["flashcards"])
 app.include_router(quiz.router, prefix="/api/quiz", tags=["quiz"])
 app.include_router(progress.router, prefix="/api/progress", tags=["progress"])
 
@@ -31,4 +64,24 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics")
+async def metrics():
+    wikipedia_cache = get_wikipedia_cache()
+    local_wikipedia = get_local_wikipedia()
+    vector_index = get_vector_index()
+    negative_cache = get_negative_cache()
+    return {
+        "llm": get_llm_registry().stats(),
+        "explain_single_flight": explain_flight.stats(),
+        "jobs": get_job_manager().stats(),
+        "http": http_client_stats(),
+        "duckduckgo": get_duckduckgo_provider().stats(),
+        "wikipedia_cache": wikipedia_cache.stats() if wikipedia_cache else None,
+        "local_wikipedia": local_wikipedia.stats() if local_wikipedia else None,
+        "vector_index": vector_index.stats() if vector_index else None,
+        "negative_cache": negative_cache.stats() if negative_cache else None,
+        "flashcard_store": get_blob_store().stats(),
+        "activity_writer": get_activity_writer().stats()
+    }
\ No newline at end of file
@@ -1,9 +1,11 @@
-from sqlalchemy import Column, String, Integer, Text, DateTime, Float, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, String, Integer, Text, DateTime, Float, Boolean, JSON, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 import uuid
 
+from app.database.compression import CompressedText, CompressedJSON
+
 Base = declarative_base()
 
 def generate_uuid():
@@ -25,9 +27,16 @@ class Student(Base):
 
 class Concept(Base):
     __tablename__ = 'concepts'
+    __table_args__ = (
+        Index('ix_concepts_name', 'name'),
+        Index('ix_concepts_subject', 'subject'),
+        Index('ix_concepts_canonical_key', 'canonical_key', unique=True),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
-    name = Column(String, nullable=False)
+    name = Column(String, nullable=False)  # the first question asked about it
+    # See app/services/concept_catalog.py; NULL until the merge job has keyed an old row
+    canonical_key = Column(String)
     subject = Column(String)
     description = Column(Text)
     prerequisites = Column(JSON)
@@ -39,13 +48,18 @@ class Concept(Base):
 
 class LearningSession(Base):
     __tablename__ = 'learning_sessions'
+    __table_args__ = (
+        Index('ix_learning_sessions_student_started', 'student_id', 'started_at'),
+        Index('ix_learning_sessions_student_concept', 'student_id', 'concept_id'),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     student_id = Column(String, ForeignKey('students.id'))
     concept_id = Column(String, ForeignKey('concepts.id'))
     query = Column(Text)
-    explanation = Column(Text)
-    sources = Column(JSON)
+    # Large and compressed: loaded only when accessed (or with undefer() in async queries)
+    explanation = deferred(Column(CompressedText))
+    sources = deferred(Column(CompressedJSON))
     svg_diagrams = Column(JSON)
     started_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime)
@@ -56,10 +70,13 @@ class LearningSession(Base):
 
 class Quiz(Base):
     __tablename__ = 'quizzes'
+    __table_args__ = (
+        Index('ix_quizzes_session_id', 'session_id'),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     session_id = Column(String, ForeignKey('learning_sessions.id'))
-    questions = Column(JSON)
+    questions = Column(CompressedJSON)
     student_responses = Column(JSON)
     score = Column(Float)
     mastery_achieved = Column(Boolean, default=False)
@@ -69,6 +86,10 @@ class Quiz(Base):
 
 class Progress(Base):
     __tablename__ = 'progress'
+    __table_args__ = (
+        # One row per student and concept; quiz submissions upsert against it
+        Index('ix_progress_student_concept', 'student_id', 'concept_id', unique=True),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     student_id = Column(String, ForeignKey('students.id'))
@@ -79,4 +100,14 @@ class Progress(Base):
     updated_at = Column(DateTime, default=datetime.utcnow)
     
     student = relationship("Student", back_populates="progress_records")
-    concept = relationship("Concept", back_populates="progress_records")
\ No newline at end of file
+    concept = relationship("Concept", back_populates="progress_records")
+
+class StudentStats(Base):
+    __tablename__ = 'student_stats'
+    
+    student_id = Column(String, ForeignKey('students.id'), primary_key=True)
+    total_concepts = Column(Integer, nullable=False, default=0)
+    mastered_concepts = Column(Integer, nullable=False, default=0)
+    total_sessions = Column(Integer, nullable=False, default=0)
+    recent_topics = Column(JSON)  # newest first: [{"query", "started_at", "session_id"}]
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
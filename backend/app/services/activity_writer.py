@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import bindparam, update
+
+from app.core.config import settings
+from app.database.database import AsyncSessionLocal
+from app.models.models import Student
+
+
+class ActivityWriter:
+    """Batches low-value writes (students' ``last_active``) off the request path.
+
+    ``touch`` only records the time in memory; every ``interval_ms`` all
+    pending students are written in one executemany UPDATE and one commit.
+    Repeated touches of a student between flushes collapse into one row, and
+    a failed batch is kept for the next flush. Up to one interval of updates
+    is lost if the process dies.
+    """
+
+    def __init__(self, session_factory: Callable, interval_ms: int = 500):
+        self.session_factory = session_factory
+        self.interval = interval_ms / 1000
+        self._pending: Dict[str, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._counters = {"touches": 0, "flushes": 0, "rows_written": 0, "failed_flushes": 0}
+
+    def touch(self, student_id: str, when: Optional[datetime] = None):
+        when = when or datetime.utcnow()
+        previous = self._pending.get(student_id)
+        self._pending[student_id] = max(previous, when) if previous else when
+        self._counters["touches"] += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        while self._pending:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    async def flush(self) -> int:
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+        try:
+            async with self.session_factory() as db:
+                await db.execute(
+                    update(Student.__table__)
+                    .where(Student.__table__.c.id == bindparam("student_id"))
+                    .values(last_active=bindparam("seen_at")),
+                    [{"student_id": student_id, "seen_at": seen_at} for student_id, seen_at in batch.items()]
+                )
+                await db.commit()
+        except BaseException as e:
+            # Also on cancellation, so close() can still write the batch
+            for student_id, seen_at in batch.items():
+                newer = self._pending.get(student_id)
+                self._pending[student_id] = max(newer, seen_at) if newer else seen_at
+            if not isinstance(e, Exception):
+                raise
+            print(f"❌ Activity flush of {len(batch)} students failed: {e}")
+            self._counters["failed_flushes"] += 1
+            return 0
+        self._counters["flushes"] += 1
+        self._counters["rows_written"] += len(batch)
+        return len(batch)
+
+    def stats(self) -> Dict:
+        return {**self._counters, "pending": len(self._pending), "interval_ms": int(self.interval * 1000)}
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+
+_activity_writer: Optional[ActivityWriter] = None
+
+
+def get_activity_writer() -> ActivityWriter:
+    """FastAPI dependency returning the process-wide activity writer."""
+    global _activity_writer
+    if _activity_writer is None:
+        _activity_writer = ActivityWriter(AsyncSessionLocal, settings.ACTIVITY_FLUSH_INTERVAL_MS)
+    return _activity_writer
+
+
+async def close_activity_writer():
+    global _activity_writer
+    if _activity_writer is not None:
+        await _activity_writer.close()
+        _activity_writer = None
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+from app.core.config import settings
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return zlib.compress(data, 9)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class BlobStore:
+    """Content-addressed blobs (SVG flashcards) on disk, keyed by SHA-256.
+
+    Each distinct blob is compressed once into ``<dir>/<aa>/<hash>`` and
+    described by a row in a small SQLite table (codec, sizes, content type,
+    reference count), so the same flashcard saved for a whole class is
+    stored once. Rows record their codec, so blobs written with zlib stay
+    readable after zstandard is installed.
+    """
+
+    def __init__(self, directory: str, codec: Optional[str] = None):
+        self.directory = directory
+        self.codec = codec or ("zstd" if ZSTD_AVAILABLE else "zlib")
+        self._lock = threading.Lock()
+        self._counters = {"puts": 0, "dedup_hits": 0, "reads": 0, "misses": 0, "bytes_in": 0, "bytes_stored": 0}
+
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, "blobs.db"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            "hash TEXT PRIMARY KEY, content_type TEXT NOT NULL, codec TEXT NOT NULL, "
+            "size INTEGER NOT NULL, stored_size INTEGER NOT NULL, refs INTEGER NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def put(self, data: bytes, content_type: str = "application/octet-stream") -> str:
+        """Store ``data`` (once per content) and return its SHA-256 hex digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._counters["puts"] += 1
+            self._counters["bytes_in"] += len(data)
+            updated = self._db.execute("UPDATE blobs SET refs = refs + 1 WHERE hash = ?", (digest,)).rowcount
+            if updated and os.path.exists(self.path(digest)):
+                self._db.commit()
+                self._counters["dedup_hits"] += 1
+                return digest
+
+            stored = compress(data, self.codec)
+            os.makedirs(os.path.dirname(self.path(digest)), exist_ok=True)
+            # Write then rename, so readers never see a partial blob
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path(digest)))
+            with os.fdopen(fd, "wb") as f:
+                f.write(stored)
+            os.replace(tmp_path, self.path(digest))
+            self._db.execute(
+                "INSERT OR REPLACE INTO blobs (hash, content_type, codec, size, stored_size, refs, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (digest, content_type, self.codec, len(data), len(stored), 1, time.time())
+            )
+            self._db.commit()
+            self._counters["bytes_stored"] += len(stored)
+        return digest
+
+    def put_text(self, text: str, content_type: str = "text/plain; charset=utf-8") -> str:
+        return self.put(text.encode("utf-8"), content_type)
+
+    def get(self, digest: str) -> Optional[tuple]:
+        """(data, content_type) for a digest, or None if it is unknown."""
+        if not HASH_PATTERN.match(digest):
+            return None
+        with self._lock:
+            row = self._db.execute("SELECT content_type, codec FROM blobs WHERE hash = ?", (digest,)).fetchone()
+            if row is None or not os.path.exists(self.path(digest)):
+                self._counters["misses"] += 1
+                return None
+            self._counters["reads"] += 1
+        content_type, codec = row
+        with open(self.path(digest), "rb") as f:
+            return decompress(f.read(), codec), content_type
+
+    def stats(self) -> Dict:
+        with self._lock:
+            blobs, size, stored_size = self._db.execute(
+                "SELECT count(*), coalesce(sum(size), 0), coalesce(sum(stored_size), 0) FROM blobs"
+            ).fetchone()
+            return {
+                **self._counters,
+                "codec": self.codec,
+                "blobs": blobs,
+                "size_bytes": size,
+                "stored_bytes": stored_size
+            }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Process-wide store under BLOB_STORE_DIR."""
+    global _store
+    if _store is None:
+        _store = BlobStore(settings.BLOB_STORE_DIR)
+    return _store
+
+
+def close_blob_store():
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
@@ -0,0 +1,154 @@
+"""Concept catalog keyed by canonicalized questions.
+
+"Photosynthesis", "photosynthesis " and "What is photosynthesis?" are one
+concept: each question is reduced to a canonical key (question words
+dropped, plurals singularized, synonyms and lexicon topics resolved, see
+keyword_extractor) and concepts are found by a probe of the unique
+``ix_concepts_canonical_key`` index. Concepts created before the key
+existed are folded into their canonical row offline:
+
+    python -m app.services.concept_catalog merge
+    python -m app.services.concept_catalog merge --rekey   # after changing the canonicalization
+"""
+
+import argparse
+import re
+from datetime import datetime
+from typing import List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.database import upsert_insert
+from app.models.models import Concept, LearningSession, Progress, StudentStats, generate_uuid
+from app.services.keyword_extractor import (
+    EDUCATIONAL_STOPWORDS, LEADING_VERBS, TRAILING_VERBS, phrase_topic, singularize
+)
+from app.services.query_text import normalize_query
+
+
+def canonical_concept_key(query: str) -> str:
+    normalized = normalize_query(query)
+    tokens = (token.strip("'") for token in re.findall(r"[a-z0-9']+", normalized))
+    words = [token for token in tokens if token and token not in EDUCATIONAL_STOPWORDS]
+    while words and words[0] in LEADING_VERBS:
+        words = words[1:]
+    while len(words) > 1 and words[-1] in TRAILING_VERBS:
+        words = words[:-1]
+    topic = phrase_topic(normalized.split()) or (phrase_topic(words) if words else None)
+    if topic:
+        return topic
+    # A question made only of stopwords ("what is it?") keys on itself
+    return " ".join(singularize(word) for word in words) if words else normalized
+
+
+async def find_or_create_concept(db: AsyncSession, query: str, description: str) -> str:
+    """Id of the query's concept, inserted if it is new.
+
+    ON CONFLICT DO NOTHING lets two requests create the same concept at once;
+    both then read the one row that won.
+    """
+    key = canonical_concept_key(query)
+    by_key = select(Concept.id).where(Concept.canonical_key == key)
+    concept_id = await db.scalar(by_key)
+    if concept_id is None:
+        concepts = Concept.__table__
+        await db.execute(
+            upsert_insert(db.bind.dialect.name, concepts).values(
+                id=generate_uuid(),
+                name=query,
+                canonical_key=key,
+                description=description,
+                created_at=datetime.utcnow()
+            ).on_conflict_do_nothing(index_elements=[concepts.c.canonical_key])
+        )
+        concept_id = await db.scalar(by_key)
+    return concept_id
+
+
+def fold_concept(db, source: Concept, target: Concept) -> Set[str]:
+    """Move the source concept's sessions and progress onto target, then delete it (sync Session).
+
+    Returns the students whose progress changed.
+    """
+    db.query(LearningSession).filter(LearningSession.concept_id == source.id).update(
+        {LearningSession.concept_id: target.id}, synchronize_session=False
+    )
+    students = set()
+    for progress in db.query(Progress).filter(Progress.concept_id == source.id).all():
+        students.add(progress.student_id)
+        existing = db.query(Progress).filter(
+            Progress.student_id == progress.student_id,
+            Progress.concept_id == target.id
+        ).first()
+        if existing is None:
+            progress.concept_id = target.id
+            continue
+        existing.mastery_level = max(existing.mastery_level or 0, progress.mastery_level or 0)
+        existing.attempts = (existing.attempts or 0) + (progress.attempts or 0)
+        existing.last_reviewed = max(filter(None, [existing.last_reviewed, progress.last_reviewed]), default=None)
+        existing.updated_at = max(filter(None, [existing.updated_at, progress.updated_at]), default=None)
+        db.delete(progress)
+    db.flush()
+    db.delete(source)
+    return students
+
+
+def merge_duplicates(db, rekey: bool = False, batch_size: int = 500) -> int:
+    """Key every unkeyed concept, folding it into the concept that already has its key.
+
+    With ``rekey``, keys that no longer match canonical_concept_key(name) are
+    cleared first. Students whose progress moved lose their student_stats
+    row, which is recomputed on next use. Returns the number of concepts folded.
+    """
+    if rekey:
+        stale = [
+            concept_id for concept_id, name, key in db.query(Concept.id, Concept.name, Concept.canonical_key)
+            if key != canonical_concept_key(name)
+        ]
+        for offset in range(0, len(stale), batch_size):
+            db.query(Concept).filter(Concept.id.in_(stale[offset:offset + batch_size])).update(
+                {Concept.canonical_key: None}, synchronize_session=False
+            )
+        db.commit()
+
+    folded = 0
+    while True:
+        batch = db.query(Concept).filter(Concept.canonical_key.is_(None)).order_by(
+            Concept.created_at, Concept.id
+        ).limit(batch_size).all()
+        if not batch:
+            return folded
+        students: Set[str] = set()
+        for concept in batch:
+            key = canonical_concept_key(concept.name)
+            target = db.query(Concept).filter(Concept.canonical_key == key).first()
+            if target is None:
+                concept.canonical_key = key
+                db.flush()
+            else:
+                students |= fold_concept(db, concept, target)
+                folded += 1
+        if students:
+            db.query(StudentStats).filter(StudentStats.student_id.in_(students)).delete(synchronize_session=False)
+        db.commit()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Manage the concept catalog")
+    commands = parser.add_subparsers(dest="command", required=True)
+    merge = commands.add_parser("merge", help="Fold concepts without a canonical key into the canonical one")
+    merge.add_argument("--rekey", action="store_true", help="Re-canonicalize every concept first")
+    args = parser.parse_args(argv)
+
+    from app.database.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        print(f"✅ Folded {merge_duplicates(db, rekey=args.rekey)} duplicate concepts")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
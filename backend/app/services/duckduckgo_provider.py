@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from app.core.config import settings
+
+try:
+    from duckduckgo_search import DDGS
+    DDGS_AVAILABLE = True
+    print("✅ DuckDuckGo search available")
+except ImportError:
+    DDGS_AVAILABLE = False
+    print("⚠️ DuckDuckGo search not available")
+
+# Hostname suffixes treated as educational, matched label by label
+# ("www.khanacademy.org" -> "org", "khanacademy.org", "www.khanacademy.org")
+EDUCATIONAL_HOST_SUFFIXES = frozenset({
+    "edu", "org",
+    "khanacademy.org", "coursera.org", "edx.org", "britannica.com",
+    "nationalgeographic.com", "nationalgeographic.org", "smithsonianmag.com", "si.edu",
+    "wikipedia.org", "sciencedirect.com", "nature.com", "ieee.org"
+})
+
+
+def is_educational_host(url: str) -> bool:
+    labels = (urlsplit(url).hostname or "").split(".")
+    return any(".".join(labels[i:]) in EDUCATIONAL_HOST_SUFFIXES for i in range(len(labels)))
+
+
+class DuckDuckGoProvider:
+    """DuckDuckGo text search on its own bounded thread pool.
+
+    DDGS is synchronous, so searches run on ``max_workers`` dedicated
+    threads instead of the loop's default executor; a slow or rate-limited
+    DuckDuckGo then only backs up its own queue. Each worker thread keeps
+    one DDGS session (with its HTTP connection pool) for reuse and drops it
+    after an error.
+    """
+
+    def __init__(self, max_workers: int = 4, timeout_seconds: int = 6, max_results: int = 3):
+        self.timeout_seconds = timeout_seconds
+        self.max_results = max_results
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="duckduckgo")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions: List["DDGS"] = []
+        self._metrics = {
+            "queued": 0,
+            "in_flight": 0,
+            "completed": 0,
+            "failed": 0,
+            "max_queue_depth": 0,
+            "total_ms": 0.0
+        }
+
+    def _session(self) -> "DDGS":
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = DDGS(timeout=self.timeout_seconds)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def _drop_session(self):
+        session = getattr(self._local, "session", None)
+        self._local.session = None
+        if session is not None:
+            with self._lock:
+                if session in self._sessions:
+                    self._sessions.remove(session)
+            session.__exit__(None, None, None)
+
+    def _run_search(self, query: str) -> List[Dict]:
+        with self._lock:
+            self._metrics["queued"] -= 1
+            self._metrics["in_flight"] += 1
+        started = time.perf_counter()
+        try:
+            results = list(self._session().text(
+                query,
+                max_results=self.max_results,
+                region='us-en',
+                safesearch='moderate'
+            ))
+            outcome = "completed"
+            return results
+        except Exception:
+            outcome = "failed"
+            self._drop_session()
+            raise
+        finally:
+            with self._lock:
+                self._metrics["in_flight"] -= 1
+                self._metrics[outcome] += 1
+                self._metrics["total_ms"] += (time.perf_counter() - started) * 1000
+
+    def _forget_cancelled(self, future: Future):
+        # A search cancelled before a worker took it never reaches _run_search
+        if future.cancelled():
+            with self._lock:
+                self._metrics["queued"] -= 1
+
+    async def search(self, keyword: str) -> List[Dict]:
+        """Best educational result for a keyword; search errors propagate to the caller."""
+        if not DDGS_AVAILABLE:
+            return []
+
+        print(f"   🦆 Searching DuckDuckGo for: {keyword}")
+        with self._lock:
+            self._metrics["queued"] += 1
+            self._metrics["max_queue_depth"] = max(self._metrics["max_queue_depth"], self._metrics["queued"])
+
+        future = self._executor.submit(self._run_search, f"{keyword} educational explanation learning")
+        future.add_done_callback(self._forget_cancelled)
+        # Cancelling the awaiting task also cancels the pool future if no worker has started it
+        search_results = await asyncio.wrap_future(future)
+        if not search_results:
+            print(f"   ❌ DuckDuckGo: No results for {keyword}")
+            return []
+
+        for result in search_results[:5]:
+            url = result.get('href', '')
+            body = result.get('body', '')
+            lowered = body.lower()
+            if is_educational_host(url) or 'education' in lowered or 'learn' in lowered:
+                title = result.get('title', '')
+                print(f"   ✅ DuckDuckGo found educational source: {title}")
+                return [{
+                    'title': title,
+                    'url': url,
+                    'snippet': body[:300],
+                    'content': body,
+                    'source_type': 'duckduckgo_educational'
+                }]
+        return []
+
+    def stats(self) -> Dict:
+        with self._lock:
+            finished = self._metrics["completed"] + self._metrics["failed"]
+            metrics = {k: v for k, v in self._metrics.items() if k != "total_ms"}
+            metrics["avg_latency_ms"] = round(self._metrics["total_ms"] / finished, 1) if finished else 0.0
+            metrics["sessions"] = len(self._sessions)
+        return metrics
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.__exit__(None, None, None)
+
+
+_provider: Optional[DuckDuckGoProvider] = None
+
+
+def get_duckduckgo_provider() -> DuckDuckGoProvider:
+    """Process-wide provider (its pool and sessions are shared by every request)."""
+    global _provider
+    if _provider is None:
+        _provider = DuckDuckGoProvider(
+            max_workers=settings.DUCKDUCKGO_MAX_WORKERS,
+            timeout_seconds=settings.DUCKDUCKGO_TIMEOUT_SECONDS
+        )
+    return _provider
+
+
+def shutdown_duckduckgo_provider():
+    global _provider
+    if _provider is not None:
+        _provider.close()
+        _provider = None
@@ -0,0 +1,105 @@
+import httpx
+from collections import defaultdict
+from typing import Dict, Optional
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HostStats:
+    """Per-host request counters collected through httpx event hooks."""
+
+    def __init__(self):
+        self._requests: Dict[str, int] = defaultdict(int)
+        self._errors: Dict[str, int] = defaultdict(int)
+
+    async def on_request(self, request: httpx.Request):
+        self._requests[request.url.host] += 1
+
+    async def on_response(self, response: httpx.Response):
+        if response.status_code >= 500:
+            self._errors[response.request.url.host] += 1
+
+    def as_dict(self) -> Dict:
+        # Only public httpx hooks are used: httpcore has no public API for the
+        # connection pool, so per-host open/idle connection counts are not reported
+        return {
+            host: {"requests": count, "server_errors": self._errors.get(host, 0)}
+            for host, count in self._requests.items()
+        }
+
+
+def http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS
+    )
+
+
+def http_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        settings.HTTP_READ_TIMEOUT_SECONDS,
+        connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+        pool=settings.HTTP_POOL_TIMEOUT_SECONDS
+    )
+
+
+_client: Optional[httpx.AsyncClient] = None
+_stats = HostStats()
+
+
+def init_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """Create the process-wide pooled client. Called once from the app lifespan.
+
+    ``transport`` replaces the pooled network transport (tests pass an
+    ``httpx.MockTransport``); pool limits only apply to the default one.
+    """
+    global _client
+    if _client is None:
+        http2 = settings.HTTP2_ENABLED and HTTP2_AVAILABLE
+        if settings.HTTP2_ENABLED and not HTTP2_AVAILABLE:
+            print("⚠️ HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+
+        _client = httpx.AsyncClient(
+            http2=http2,
+            limits=http_limits(),
+            timeout=http_timeout(),
+            transport=transport,
+            headers={"User-Agent": settings.HTTP_USER_AGENT},
+            follow_redirects=True,
+            event_hooks={"request": [_stats.on_request], "response": [_stats.on_response]}
+        )
+    return _client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """FastAPI dependency returning the shared client (created lazily for scripts)."""
+    return _client or init_http_client()
+
+
+def http_client_stats() -> Dict:
+    if _client is None:
+        return {"open": False, "hosts": {}}
+    limits = http_limits()
+    return {
+        "open": not _client.is_closed,
+        "http2": settings.HTTP2_ENABLED and HTTP2_AVAILABLE,
+        "limits": {
+            "max_connections": limits.max_connections,
+            "max_keepalive_connections": limits.max_keepalive_connections,
+            "keepalive_expiry": limits.keepalive_expiry
+        },
+        "hosts": _stats.as_dict()
+    }
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,132 @@
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.core.config import settings
+
+
+class Job:
+    def __init__(self, kind: str, owner_id: Optional[str] = None):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.owner_id = owner_id
+        self.status = "pending"
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._done = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.finished
+
+    def as_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+
+class JobManager:
+    """Runs deferred work (such as SVG flashcards) after the response has been sent.
+
+    Jobs run as tasks on the app's event loop, at most ``max_workers`` at a
+    time. Finished jobs are kept for ``retention_seconds`` so clients can
+    poll for the result.
+    """
+
+    def __init__(self, max_workers: int = 4, retention_seconds: float = 3600):
+        self.max_workers = max_workers
+        self.retention_seconds = retention_seconds
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0}
+
+    def submit(self, kind: str, work: Callable[[], Awaitable[Any]], owner_id: Optional[str] = None) -> Job:
+        self._prune()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+
+        job = Job(kind, owner_id)
+        self._jobs[job.id] = job
+        self._counters["submitted"] += 1
+        task = asyncio.ensure_future(self._run(job, work))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        return job
+
+    async def _run(self, job: Job, work: Callable[[], Awaitable[Any]]):
+        async with self._semaphore:
+            job.status = "running"
+            try:
+                job.result = await work()
+                job.status = "completed"
+                self._counters["completed"] += 1
+            except Exception as e:
+                print(f"❌ {job.kind} job {job.id} failed: {e}")
+                job.error = str(e)
+                job.status = "failed"
+                self._counters["failed"] += 1
+            finally:
+                job.finished_at = time.time()
+                job._done.set()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self) -> Dict:
+        return {
+            **self._counters,
+            "running": sum(1 for job in self._jobs.values() if job.status == "running"),
+            "pending": sum(1 for job in self._jobs.values() if job.status == "pending"),
+            "retained": len(self._jobs)
+        }
+
+    async def shutdown(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._semaphore = None
+
+
+_job_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """FastAPI dependency returning the process-wide job manager."""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager(
+            max_workers=settings.JOB_MAX_WORKERS,
+            retention_seconds=settings.JOB_RETENTION_SECONDS
+        )
+    return _job_manager
+
+
+async def shutdown_job_manager():
+    global _job_manager
+    if _job_manager is not None:
+        await _job_manager.shutdown()
+        _job_manager = None
@@ -0,0 +1,281 @@
+"""Local keyphrase extraction for student questions.
+
+A RAKE-style pass splits the question on stopwords and punctuation into
+candidate phrases, scores words by degree/frequency, trims leading verbs
+and trailing filler, and looks the best phrase up in a small curated
+lexicon of school topics (with synonyms) to add related terms. The
+confidence score tells ExplanationService whether the LLM keyword call
+can be skipped.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+# Words that frame a question rather than name its topic
+EDUCATIONAL_STOPWORDS = {
+    "a", "about", "after", "all", "also", "an", "and", "any", "are", "as", "at", "be", "because", "been",
+    "before", "being", "between", "by", "can", "could", "define", "definition", "describe", "did", "difference",
+    "do", "does", "during", "each", "easy", "example", "examples", "explain", "explanation", "for", "from",
+    "give", "happen", "happens", "has", "have", "help", "how", "i", "if", "in", "into", "is", "it", "its",
+    "kid", "kids", "know", "learn", "like", "mean", "meaning", "means", "me", "more", "my", "of", "on", "or",
+    "other", "overview", "please", "really", "simple", "simply", "so", "some", "student", "students", "teach",
+    "tell", "terms", "than", "that", "the", "their", "them", "there", "these", "they", "thing", "things",
+    "this", "those", "through", "to", "understand", "understanding", "use", "used", "uses", "using", "vs",
+    "want", "was", "way", "ways", "we", "were", "what", "whats", "when", "where", "which", "who", "why",
+    "will", "with", "work", "works", "working", "would", "you", "your"
+}
+
+# Words that start or end a candidate phrase but are not part of the topic
+# ("calculate velocity", "causes climate change", "black holes form")
+LEADING_VERBS = {
+    "calculate", "cause", "caused", "causes", "compare", "draw", "find", "list", "make", "show", "solve",
+    "summarize", "write"
+}
+TRAILING_VERBS = {
+    "begin", "begins", "change", "changes", "end", "ended", "form", "formed", "forms", "grow", "grows",
+    "happened", "move", "moves", "occur", "occurs", "start", "started", "starts"
+}
+
+SUBJECT_LEXICON: Dict[str, Dict[str, List[str]]] = {
+    "biology": {
+        "photosynthesis": ["chlorophyll", "plants"],
+        "cell": ["cell biology", "organelle"],
+        "mitochondria": ["cellular respiration", "cell"],
+        "cellular respiration": ["mitochondria", "ATP"],
+        "DNA": ["genetics", "gene"],
+        "gene": ["DNA", "heredity"],
+        "evolution": ["natural selection", "Charles Darwin"],
+        "natural selection": ["evolution", "adaptation"],
+        "ecosystem": ["food chain", "ecology"],
+        "food chain": ["ecosystem", "food web"],
+        "immune system": ["white blood cell", "antibody"],
+        "virus": ["infection", "immune system"],
+        "bacteria": ["microorganism", "infection"],
+        "digestive system": ["digestion", "stomach"],
+        "heart": ["circulatory system", "blood"],
+        "mitosis": ["cell division", "meiosis"],
+        "meiosis": ["cell division", "mitosis"],
+    },
+    "physics": {
+        "gravity": ["Isaac Newton", "mass"],
+        "Newton's laws of motion": ["force", "Isaac Newton"],
+        "force": ["Newton's laws of motion", "acceleration"],
+        "energy": ["kinetic energy", "potential energy"],
+        "electricity": ["electric current", "voltage"],
+        "magnetism": ["magnetic field", "electromagnetism"],
+        "light": ["electromagnetic radiation", "optics"],
+        "sound": ["sound wave", "frequency"],
+        "friction": ["force", "motion"],
+        "black hole": ["general relativity", "gravity"],
+        "relativity": ["Albert Einstein", "spacetime"],
+        "quantum mechanics": ["quantum physics", "wave-particle duality"],
+        "speed of light": ["light", "special relativity"],
+        "velocity": ["speed", "acceleration"],
+    },
+    "chemistry": {
+        "atom": ["proton", "electron"],
+        "molecule": ["chemical bond", "atom"],
+        "chemical reaction": ["reactant", "chemical equation"],
+        "periodic table": ["chemical element", "Dmitri Mendeleev"],
+        "acid": ["pH", "base"],
+        "pH": ["acid", "base"],
+        "chemical bond": ["covalent bond", "ionic bond"],
+        "water cycle": ["evaporation", "condensation"],
+    },
+    "earth science": {
+        "climate change": ["greenhouse gas", "global warming"],
+        "greenhouse effect": ["greenhouse gas", "carbon dioxide"],
+        "plate tectonics": ["earthquake", "continental drift"],
+        "earthquake": ["plate tectonics", "seismic wave"],
+        "volcano": ["magma", "plate tectonics"],
+        "weather": ["atmosphere", "climate"],
+        "rock cycle": ["igneous rock", "sedimentary rock"],
+        "solar system": ["planet", "Sun"],
+        "Moon": ["lunar phase", "tide"],
+        "tide": ["Moon", "gravity"],
+        "season": ["axial tilt", "Earth's orbit"],
+    },
+    "mathematics": {
+        "fraction": ["numerator", "denominator"],
+        "Pythagorean theorem": ["right triangle", "hypotenuse"],
+        "algebra": ["equation", "variable"],
+        "equation": ["algebra", "variable"],
+        "probability": ["statistics", "random event"],
+        "prime number": ["number theory", "divisor"],
+        "pi": ["circle", "circumference"],
+        "derivative": ["calculus", "rate of change"],
+    },
+    "computer science": {
+        "machine learning": ["artificial intelligence", "algorithm"],
+        "artificial intelligence": ["machine learning", "computer science"],
+        "algorithm": ["computer science", "programming"],
+        "Internet": ["computer network", "World Wide Web"],
+        "computer programming": ["programming language", "algorithm"],
+        "neural network": ["machine learning", "deep learning"],
+    },
+    "history": {
+        "World War II": ["Axis powers", "Allies of World War II"],
+        "World War I": ["Central Powers", "Treaty of Versailles"],
+        "Industrial Revolution": ["steam engine", "factory"],
+        "French Revolution": ["Napoleon", "Bastille"],
+        "Renaissance": ["Leonardo da Vinci", "humanism"],
+        "democracy": ["government", "election"],
+    },
+}
+
+SYNONYMS = {
+    "global warming": "climate change",
+    "ai": "artificial intelligence",
+    "ml": "machine learning",
+    "ww2": "world war ii",
+    "wwii": "world war ii",
+    "world war 2": "world war ii",
+    "second world war": "world war ii",
+    "ww1": "world war i",
+    "wwi": "world war i",
+    "world war 1": "world war i",
+    "first world war": "world war i",
+    "newtons laws": "newton's laws of motion",
+    "newton's laws": "newton's laws of motion",
+    "laws of motion": "newton's laws of motion",
+    "pythagoras theorem": "pythagorean theorem",
+    "coding": "computer programming",
+    "programming": "computer programming",
+    "greenhouse gases": "greenhouse effect",
+    # Plurals that singularize() does not undo
+    "volcanoes": "volcano",
+    "viruses": "virus",
+}
+
+# lowercase topic -> (Wikipedia title, subject, related terms), built once at import
+TOPICS: Dict[str, Tuple[str, str, List[str]]] = {
+    title.lower(): (title, subject, related)
+    for subject, topics in SUBJECT_LEXICON.items()
+    for title, related in topics.items()
+}
+
+MAX_KEYWORDS = 5
+
+
+class KeywordExtraction:
+    def __init__(self, keywords: List[str], confidence: float, subject: Optional[str] = None):
+        self.keywords = keywords
+        self.confidence = confidence
+        self.subject = subject
+
+    def as_dict(self) -> Dict:
+        return {"keywords": self.keywords, "confidence": self.confidence, "subject": self.subject}
+
+
+def singularize(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def candidate_phrases(query: str) -> List[List[str]]:
+    """RAKE candidates: runs of non-stopwords between stopwords and punctuation."""
+    phrases, current = [], []
+    for token in re.findall(r"[a-z0-9']+|[^\sa-z0-9']", query.lower()):
+        token = token.strip("'")
+        if not token or not re.match(r"[a-z0-9]", token) or token in EDUCATIONAL_STOPWORDS:
+            if current:
+                phrases.append(current)
+            current = []
+        else:
+            current.append(token)
+    if current:
+        phrases.append(current)
+
+    trimmed = []
+    for phrase in phrases:
+        while phrase and phrase[0] in LEADING_VERBS:
+            phrase = phrase[1:]
+        while len(phrase) > 1 and phrase[-1] in TRAILING_VERBS and " ".join(phrase) not in TOPICS:
+            phrase = phrase[:-1]
+        if phrase and not all(word.isdigit() for word in phrase):
+            trimmed.append(phrase)
+    return trimmed
+
+
+def rake_scores(phrases: List[List[str]]) -> List[float]:
+    frequency, degree = defaultdict(int), defaultdict(int)
+    for phrase in phrases:
+        for word in phrase:
+            frequency[word] += 1
+            degree[word] += len(phrase)
+    return [sum(degree[word] / frequency[word] for word in phrase) for phrase in phrases]
+
+
+def phrase_topic(words: List[str]) -> Optional[str]:
+    """Lexicon topic named by exactly these words (after synonyms and plurals)."""
+    ngram = " ".join(words)
+    for form in (ngram, " ".join(singularize(word) for word in words)):
+        form = SYNONYMS.get(form, form)
+        if form in TOPICS:
+            return form
+    return None
+
+
+def lookup_topic(words: List[str]) -> Optional[str]:
+    """Longest n-gram of the phrase that names a lexicon topic."""
+    for size in range(len(words), 0, -1):
+        for start in range(len(words) - size + 1):
+            topic = phrase_topic(words[start:start + size])
+            if topic:
+                return topic
+    return None
+
+
+class KeywordExtractor:
+    def extract(self, query: str) -> KeywordExtraction:
+        phrases = candidate_phrases(query)
+        if not phrases:
+            return KeywordExtraction([query], 0.0)
+
+        scores = rake_scores(phrases)
+        ranked = [phrase for _, phrase in sorted(zip(scores, phrases), key=lambda pair: -pair[0])]
+
+        keywords = [query]
+        subject = None
+        topic = lookup_topic(ranked[0])
+        if topic:
+            title, subject, related = TOPICS[topic]
+            keywords.append(title)
+        keywords.extend(" ".join(phrase) for phrase in ranked if not topic or phrase_topic(phrase) != topic)
+        if topic:
+            keywords.extend(related)
+
+        unique, seen = [], set()
+        for keyword in keywords:
+            if keyword.lower() not in seen:
+                seen.add(keyword.lower())
+                unique.append(keyword)
+
+        return KeywordExtraction(unique[:MAX_KEYWORDS], self.confidence(ranked, topic), subject)
+
+    @staticmethod
+    def confidence(ranked: List[List[str]], topic: Optional[str]) -> float:
+        # A known topic in the only phrase is the strongest signal; a single
+        # short phrase ("What is a quasar?") is still a clear search term,
+        # while several competing phrases or a long question is left to the LLM.
+        content_words = sum(len(phrase) for phrase in ranked)
+        if topic and len(ranked) == 1:
+            score = 0.9
+        elif topic:
+            score = 0.65
+        elif len(ranked) == 1 and len(ranked[0]) <= 3:
+            score = 0.7
+        elif len(ranked) <= 2 and len(ranked[0]) <= 3:
+            score = 0.5
+        else:
+            score = 0.3
+        if content_words > 6:
+            score -= 0.2
+        return round(max(score, 0.0), 2)
+
+
+keyword_extractor = KeywordExtractor()
@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class LLMResponseCache:
+    """Two-tier, content-addressed cache for Gemini responses.
+
+    Tier one is an in-memory LRU bounded by the total UTF-8 size of the
+    cached texts. Tier two is a SQLite file whose entries expire after
+    ``ttl_seconds``; disk hits are promoted back into memory.
+
+    Async callers use ``get_async``/``set_async``: the memory tier is checked
+    inline and only SQLite reads and writes go to a worker thread, so a
+    cache miss or write never fsyncs on the event loop.
+    """
+
+    def __init__(self, max_memory_bytes: int, db_path: Optional[str] = None, ttl_seconds: float = 7 * 24 * 3600):
+        self.max_memory_bytes = max_memory_bytes
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()  # memory tier and counters
+        self._db_lock = threading.Lock()  # SQLite tier
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expired": 0,
+            "writes": 0
+        }
+
+        self._db = None
+        if db_path:
+            directory = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, model TEXT, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM llm_responses WHERE expires_at < ?", (time.time(),))
+            self._db.commit()
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, params: Optional[Dict] = None) -> str:
+        payload = json.dumps(
+            {"model": model_name, "prompt": prompt, "params": params or {}},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._get_memory(key)
+        return value if value is not None else self._get_disk(key)
+
+    async def get_async(self, key: str) -> Optional[str]:
+        value = self._get_memory(key)
+        if value is not None:
+            return value
+        if self._db is None:
+            return self._get_disk(key)  # No disk tier: only counts the miss
+        return await asyncio.to_thread(self._get_disk, key)
+
+    def set(self, key: str, value: str, model_name: Optional[str] = None):
+        self._set_memory(key, value)
+        self._write_disk(key, value, model_name)
+
+    async def set_async(self, key: str, value: str, model_name: Optional[str] = None):
+        self._set_memory(key, value)
+        if self._db is not None:
+            await asyncio.to_thread(self._write_disk, key, value, model_name)
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+            return value
+
+    def _get_disk(self, key: str) -> Optional[str]:
+        row = None
+        expired = False
+        with self._db_lock:
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT response, expires_at FROM llm_responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] < time.time():
+                    self._db.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                    self._db.commit()
+                    row, expired = None, True
+
+        with self._lock:
+            if row is not None:
+                self._counters["disk_hits"] += 1
+                self._remember(key, row[0])
+                return row[0]
+            if expired:
+                self._counters["expired"] += 1
+            self._counters["misses"] += 1
+            return None
+
+    def _set_memory(self, key: str, value: str):
+        with self._lock:
+            self._remember(key, value)
+            self._counters["writes"] += 1
+
+    def _write_disk(self, key: str, value: str, model_name: Optional[str]):
+        with self._db_lock:
+            if self._db is not None:
+                now = time.time()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, model, response, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, model_name, value, now, now + self.ttl_seconds)
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, value: str):
+        size = len(value.encode("utf-8"))
+        if size > self.max_memory_bytes:
+            return
+
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous.encode("utf-8"))
+
+        self._memory[key] = value
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted.encode("utf-8"))
+            self._counters["evictions"] += 1
+
+    def stats(self) -> Dict:
+        disk_entries = None
+        with self._db_lock:
+            if self._db is not None:
+                disk_entries = self._db.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        with self._lock:
+            lookups = self._counters["memory_hits"] + self._counters["disk_hits"] + self._counters["misses"]
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            return {
+                **self._counters,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "disk_entries": disk_entries
+            }
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,335 @@
+import google.generativeai as genai
+import asyncio
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional
+from app.core.config import settings
+from app.services.llm_cache import LLMResponseCache
+
+
+class LLMTimeoutError(TimeoutError):
+    """Raised when a Gemini call does not finish within its per-call timeout."""
+
+
+class ModelMetrics:
+    """Counters for one model's execution lane. Only touched from event loop threads."""
+
+    def __init__(self):
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.total_latency = 0.0
+        self.max_queue_depth = 0
+
+    def as_dict(self) -> Dict:
+        finished = self.completed + self.failed
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "max_queue_depth": self.max_queue_depth,
+            "avg_latency_ms": round(self.total_latency / finished * 1000, 1) if finished else 0.0
+        }
+
+
+class ModelSettings:
+    """Connection and concurrency limits for one Gemini model."""
+
+    def __init__(self, max_concurrency: int, timeout_seconds: float, generation_config: Optional[Dict] = None):
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.generation_config = generation_config or {}
+
+    def as_dict(self) -> Dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout_seconds,
+            "generation_config": self.generation_config
+        }
+
+
+class LLMClientRegistry:
+    """Process-wide owner of the Gemini configuration and model handles.
+
+    ``genai.configure()`` is called once and every ``GenerativeModel`` is
+    created on first use and then shared by all services, so a request no
+    longer pays the client setup cost.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        default_model: Optional[str] = None,
+        model_settings: Optional[Dict[str, Dict]] = None,
+        transport: Optional[str] = None,
+        cache: Optional[LLMResponseCache] = None
+    ):
+        self.api_key = api_key
+        self.default_model = default_model or settings.LLM_DEFAULT_MODEL
+        self.transport = transport
+        self.cache = cache
+        self._model_settings = model_settings or {}
+        self._models: Dict[str, genai.GenerativeModel] = {}
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._semaphores: Dict[str, "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"] = {}
+        self._metrics: Dict[str, ModelMetrics] = {}
+        self._lock = threading.Lock()
+        self._configured = False
+
+        if self.api_key:
+            configure_kwargs = {"api_key": self.api_key}
+            if self.transport:
+                configure_kwargs["transport"] = self.transport
+            genai.configure(**configure_kwargs)
+            self._configured = True
+
+    @property
+    def available(self) -> bool:
+        return self._configured
+
+    def settings_for(self, model_name: Optional[str] = None) -> ModelSettings:
+        overrides = self._model_settings.get(model_name or self.default_model, {})
+        return ModelSettings(
+            max_concurrency=int(overrides.get("max_concurrency", settings.LLM_MAX_CONCURRENCY)),
+            timeout_seconds=float(overrides.get("timeout_seconds", settings.LLM_TIMEOUT_SECONDS)),
+            generation_config=overrides.get("generation_config")
+        )
+
+    def get_model(self, model_name: Optional[str] = None) -> Optional[genai.GenerativeModel]:
+        """Return the shared model handle, or None when no API key is configured."""
+        if not self._configured:
+            return None
+
+        name = model_name or self.default_model
+        model = self._models.get(name)
+        if model is None:
+            with self._lock:
+                model = self._models.get(name)
+                if model is None:
+                    model_settings = self.settings_for(name)
+                    model = genai.GenerativeModel(
+                        name,
+                        generation_config=model_settings.generation_config or None
+                    )
+                    self._models[name] = model
+                    print(f"🤖 Created shared model handle: {name}")
+        return model
+
+    def _lane(self, name: str):
+        """Return the dedicated executor, loop-local semaphore and metrics for a model."""
+        with self._lock:
+            executor = self._executors.get(name)
+            if executor is None:
+                limit = self.settings_for(name).max_concurrency
+                executor = ThreadPoolExecutor(max_workers=limit, thread_name_prefix=f"llm-{name}")
+                self._executors[name] = executor
+                self._semaphores[name] = weakref.WeakKeyDictionary()
+                self._metrics[name] = ModelMetrics()
+
+            # asyncio primitives are bound to one event loop, so keep one per loop
+            loop = asyncio.get_running_loop()
+            semaphores = self._semaphores[name]
+            semaphore = semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.settings_for(name).max_concurrency)
+                semaphores[loop] = semaphore
+        return executor, semaphore, self._metrics[name]
+
+    async def generate_text(
+        self,
+        prompt: str,
+        model_name: Optional[str] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+        **generate_kwargs
+    ) -> str:
+        """Run ``generate_content`` off the event loop and return the response text.
+
+        Responses are looked up in the response cache first, keyed by model,
+        prompt and generation parameters. At most ``max_concurrency`` calls
+        per model are in flight; callers beyond that wait in the queue. A
+        call that exceeds its timeout raises ``LLMTimeoutError`` while its
+        slot stays held until the worker thread actually finishes, so the
+        limit is never exceeded.
+        """
+        name = model_name or self.default_model
+        model = self.get_model(name)
+        if model is None:
+            raise RuntimeError("Gemini API not configured")
+
+        cache_key = None
+        if use_cache and self.cache is not None:
+            params = {**self.settings_for(name).generation_config, **generate_kwargs}
+            cache_key = self.cache.make_key(name, prompt, params)
+            cached = await self.cache.get_async(cache_key)
+            if cached is not None:
+                return cached
+
+        text = await self._execute(
+            name, lambda: model.generate_content(prompt, **generate_kwargs).text, timeout
+        )
+        if cache_key is not None and text:
+            await self.cache.set_async(cache_key, text, name)
+        return text
+
+    async def stream_text(
+        self,
+        prompt: str,
+        model_name: Optional[str] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+        **generate_kwargs
+    ) -> AsyncIterator[str]:
+        """Yield response text chunks as Gemini streams them.
+
+        Runs in the same bounded lane as ``generate_text``; the timeout covers
+        the whole stream. A cached response is yielded as a single chunk and
+        a completed stream is written back to the cache.
+        """
+        name = model_name or self.default_model
+        model = self.get_model(name)
+        if model is None:
+            raise RuntimeError("Gemini API not configured")
+
+        cache_key = None
+        if use_cache and self.cache is not None:
+            params = {**self.settings_for(name).generation_config, **generate_kwargs}
+            cache_key = self.cache.make_key(name, prompt, params)
+            cached = await self.cache.get_async(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+
+        def produce():
+            for chunk in model.generate_content(prompt, stream=True, **generate_kwargs):
+                if chunk.text:
+                    loop.call_soon_threadsafe(chunks.put_nowait, chunk.text)
+
+        finished = asyncio.ensure_future(self._execute(name, produce, timeout))
+        parts: List[str] = []
+        try:
+            while True:
+                next_chunk = asyncio.ensure_future(chunks.get())
+                await asyncio.wait({next_chunk, finished}, return_when=asyncio.FIRST_COMPLETED)
+                if next_chunk.done():
+                    parts.append(next_chunk.result())
+                    yield parts[-1]
+                    continue
+
+                next_chunk.cancel()
+                finished.result()  # Re-raise errors and timeouts from the producer
+                while not chunks.empty():
+                    parts.append(chunks.get_nowait())
+                    yield parts[-1]
+                break
+        finally:
+            if not finished.done():
+                finished.cancel()
+
+        if cache_key is not None and parts:
+            await self.cache.set_async(cache_key, "".join(parts), name)
+
+    async def _execute(self, name: str, work: Callable, timeout: Optional[float]):
+        timeout = timeout if timeout is not None else self.settings_for(name).timeout_seconds
+        executor, semaphore, metrics = self._lane(name)
+        loop = asyncio.get_running_loop()
+
+        metrics.queued += 1
+        metrics.max_queue_depth = max(metrics.max_queue_depth, metrics.queued)
+        try:
+            await semaphore.acquire()
+        finally:
+            metrics.queued -= 1
+
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        future = loop.run_in_executor(executor, work)
+
+        def release(_):
+            metrics.in_flight -= 1
+            metrics.total_latency += time.perf_counter() - started
+            if future.cancelled() or future.exception() is not None:
+                metrics.failed += 1
+            else:
+                metrics.completed += 1
+            semaphore.release()
+
+        future.add_done_callback(release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            metrics.timeouts += 1
+            raise LLMTimeoutError(f"{name} did not respond within {timeout:.0f}s")
+
+    def stats(self) -> Dict:
+        return {
+            "configured": self._configured,
+            "default_model": self.default_model,
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "models": {
+                name: {
+                    **self.settings_for(name).as_dict(),
+                    **(self._metrics[name].as_dict() if name in self._metrics else ModelMetrics().as_dict())
+                } for name in self._models
+            }
+        }
+
+    def close(self):
+        with self._lock:
+            for executor in self._executors.values():
+                executor.shutdown(wait=False, cancel_futures=True)
+            self._executors.clear()
+            self._semaphores.clear()
+            self._metrics.clear()
+            self._models.clear()
+        if self.cache is not None:
+            self.cache.close()
+
+
+_registry: Optional[LLMClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def init_llm_registry() -> LLMClientRegistry:
+    """Create the process-wide registry. Called once from the app lifespan."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LLMClientRegistry(
+                api_key=settings.GEMINI_API_KEY,
+                default_model=settings.LLM_DEFAULT_MODEL,
+                model_settings=settings.LLM_MODEL_SETTINGS,
+                transport=settings.LLM_TRANSPORT,
+                cache=LLMResponseCache(
+                    max_memory_bytes=settings.LLM_CACHE_MAX_BYTES,
+                    db_path=settings.LLM_CACHE_PATH,
+                    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS
+                ) if settings.LLM_CACHE_ENABLED else None
+            )
+        return _registry
+
+
+def get_llm_registry() -> LLMClientRegistry:
+    """FastAPI dependency returning the shared registry.
+
+    Scripts that build services outside the app (such as the exercise test
+    scripts) get the same lazily created instance.
+    """
+    return _registry or init_llm_registry()
+
+
+def shutdown_llm_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is not None:
+            _registry.close()
+            _registry = None
@@ -0,0 +1,218 @@
+"""Offline Wikipedia abstracts in an SQLite FTS5 index.
+
+Build the index once from a dump, then search_sources answers from it
+before any network provider is tried:
+
+    python -m app.services.local_wikipedia ingest abstracts.jsonl
+    python -m app.services.local_wikipedia ingest enwiki-latest-abstract.xml.gz --replace
+    python -m app.services.local_wikipedia search "photosynthesis"
+
+JSONL lines need ``title`` and ``abstract`` (``url`` is optional). XML
+files use the ``<doc><title/><url/><abstract/></doc>`` layout of the
+official abstracts dump.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib.parse import quote
+from app.core.config import settings
+
+SNIPPET_LENGTH = 300
+# bm25() column weights: a title match counts for more than an abstract match
+TITLE_WEIGHT = 10.0
+ABSTRACT_WEIGHT = 1.0
+# Question words that would otherwise have to appear in the abstract for a match
+STOPWORDS = {
+    "a", "an", "and", "are", "can", "do", "does", "explain", "for", "how", "in", "is", "it",
+    "me", "of", "on", "or", "the", "to", "what", "when", "where", "which", "who", "why", "work", "works"
+}
+
+
+def article_url(title: str) -> str:
+    return f"https://en.wikipedia.org/wiki/{quote(title.replace(' ', '_'))}"
+
+
+def match_expression(keyword: str) -> Optional[str]:
+    """Turn free text into an FTS5 query where every non-stopword term must match."""
+    terms = [term for term in re.findall(r"\w+", keyword.lower()) if term not in STOPWORDS]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms)
+
+
+class LocalWikipediaIndex:
+    """FTS5 table of (title, abstract, url) ranked with BM25."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS abstracts USING fts5("
+            "title, abstract, url UNINDEXED, tokenize = 'porter unicode61')"
+        )
+        self._db.commit()
+
+    def ingest(self, records: Iterable[Dict], replace: bool = False, batch_size: int = 5000) -> int:
+        """Load title/abstract records, optionally wiping the index first. Returns rows added."""
+        added = 0
+        with self._lock:
+            if replace:
+                self._db.execute("DELETE FROM abstracts")
+
+            batch = []
+            for record in records:
+                title = (record.get("title") or "").strip()
+                abstract = re.sub(r"\s+", " ", record.get("abstract") or "").strip()
+                if not title or not abstract:
+                    continue
+                batch.append((title, abstract, record.get("url") or article_url(title)))
+                if len(batch) >= batch_size:
+                    self._db.executemany("INSERT INTO abstracts (title, abstract, url) VALUES (?, ?, ?)", batch)
+                    added += len(batch)
+                    batch = []
+            if batch:
+                self._db.executemany("INSERT INTO abstracts (title, abstract, url) VALUES (?, ?, ?)", batch)
+                added += len(batch)
+
+            # Merge the b-tree segments written during the load so queries touch fewer pages
+            self._db.execute("INSERT INTO abstracts (abstracts) VALUES ('optimize')")
+            self._db.commit()
+        return added
+
+    def search(self, keyword: str, limit: int = 1) -> List[Dict]:
+        expression = match_expression(keyword)
+        if expression is None:
+            return []
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT title, abstract, url, bm25(abstracts, ?, ?) AS score FROM abstracts "
+                "WHERE abstracts MATCH ? ORDER BY score LIMIT ?",
+                (TITLE_WEIGHT, ABSTRACT_WEIGHT, expression, limit)
+            ).fetchall()
+        return [{"title": title, "abstract": abstract, "url": url, "score": score} for title, abstract, url, score in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM abstracts").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class LocalWikipediaProvider:
+    """Source provider answering from the local index with no network access."""
+
+    def __init__(self, index: LocalWikipediaIndex):
+        self.index = index
+        self._counters = {"queries": 0, "hits": 0, "total_ms": 0.0}
+
+    def search(self, keyword: str) -> List[Dict]:
+        started = time.perf_counter()
+        rows = self.index.search(keyword, limit=1)
+        self._counters["queries"] += 1
+        self._counters["total_ms"] += (time.perf_counter() - started) * 1000
+        if rows:
+            self._counters["hits"] += 1
+        return [self.to_source(row) for row in rows]
+
+    @staticmethod
+    def to_source(row: Dict) -> Dict:
+        return {
+            "title": row["title"],
+            "url": row["url"],
+            "snippet": row["abstract"][:SNIPPET_LENGTH],
+            "content": row["abstract"],
+            "source_type": "wikipedia"
+        }
+
+    def stats(self) -> Dict:
+        queries = self._counters["queries"]
+        return {
+            "queries": queries,
+            "hits": self._counters["hits"],
+            "avg_query_ms": round(self._counters["total_ms"] / queries, 3) if queries else 0.0,
+            "documents": self.index.count()
+        }
+
+
+_provider: Optional[LocalWikipediaProvider] = None
+
+
+def get_local_wikipedia() -> Optional[LocalWikipediaProvider]:
+    """Process-wide provider, or None when disabled or no index has been built yet."""
+    global _provider
+    if _provider is None and settings.LOCAL_WIKIPEDIA_ENABLED and os.path.exists(settings.LOCAL_WIKIPEDIA_INDEX_PATH):
+        _provider = LocalWikipediaProvider(LocalWikipediaIndex(settings.LOCAL_WIKIPEDIA_INDEX_PATH))
+    return _provider
+
+
+def close_local_wikipedia():
+    global _provider
+    if _provider is not None:
+        _provider.index.close()
+        _provider = None
+
+
+def read_jsonl(path: str) -> Iterator[Dict]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_abstract_xml(path: str) -> Iterator[Dict]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        for _, element in ET.iterparse(f):
+            if element.tag != "doc":
+                continue
+            title = element.findtext("title") or ""
+            # The official dump prefixes every title with "Wikipedia: "
+            if title.startswith("Wikipedia: "):
+                title = title[len("Wikipedia: "):]
+            yield {"title": title, "abstract": element.findtext("abstract"), "url": element.findtext("url")}
+            element.clear()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Manage the offline Wikipedia abstracts index")
+    parser.add_argument("--index", default=settings.LOCAL_WIKIPEDIA_INDEX_PATH, help="SQLite index file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Load a JSONL or abstracts XML dump (optionally .gz)")
+    ingest.add_argument("path")
+    ingest.add_argument("--replace", action="store_true", help="Clear the index before loading")
+
+    search = commands.add_parser("search", help="Query the index")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=5)
+
+    args = parser.parse_args(argv)
+    index = LocalWikipediaIndex(args.index)
+
+    if args.command == "ingest":
+        reader = read_abstract_xml if ".xml" in args.path else read_jsonl
+        started = time.perf_counter()
+        added = index.ingest(reader(args.path), replace=args.replace)
+        print(f"✅ Indexed {added} abstracts in {time.perf_counter() - started:.1f}s ({index.count()} total)")
+    else:
+        for row in index.search(args.query, limit=args.limit):
+            print(f"{row['score']:8.3f}  {row['title']}  {row['url']}")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+
+
+class NegativeCache:
+    """Remembers (provider, keyword) pairs that recently came back empty.
+
+    search_sources checks it before starting a network branch, so a keyword
+    with no Wikipedia or DuckDuckGo result costs one lookup until the entry
+    expires. Timeouts are remembered for a shorter ``timeout_ttl_seconds``
+    since they are more likely to be transient. Entries are kept in memory
+    and mirrored to SQLite so they survive restarts.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float, timeout_ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.timeout_ttl_seconds = timeout_ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], float] = {}
+        self._counters = {"lookups": 0, "hits": 0, "recorded_empty": 0, "recorded_timeout": 0, "expired": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS negative_lookups ("
+            "provider TEXT NOT NULL, keyword TEXT NOT NULL, reason TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, PRIMARY KEY (provider, keyword))"
+        )
+        now = time.time()
+        self._db.execute("DELETE FROM negative_lookups WHERE expires_at <= ?", (now,))
+        self._db.commit()
+        for provider, keyword, expires_at in self._db.execute(
+            "SELECT provider, keyword, expires_at FROM negative_lookups"
+        ):
+            self._entries[(provider, keyword)] = expires_at
+
+    @staticmethod
+    def normalize_key(keyword: str) -> str:
+        return " ".join(keyword.split()).lower()
+
+    def is_dead(self, provider: str, keyword: str) -> bool:
+        key = (provider, self.normalize_key(keyword))
+        with self._lock:
+            self._counters["lookups"] += 1
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.time():
+                del self._entries[key]
+                self._counters["expired"] += 1
+                self._db.execute("DELETE FROM negative_lookups WHERE provider = ? AND keyword = ?", key)
+                self._db.commit()
+                return False
+            self._counters["hits"] += 1
+            return True
+
+    def record(self, provider: str, keyword: str, reason: str = "empty"):
+        ttl = self.timeout_ttl_seconds if reason == "timeout" else self.ttl_seconds
+        key = (provider, self.normalize_key(keyword))
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._entries[key] = expires_at
+            self._counters[f"recorded_{reason}"] += 1
+            self._db.execute(
+                "INSERT OR REPLACE INTO negative_lookups (provider, keyword, reason, expires_at) VALUES (?, ?, ?, ?)",
+                (*key, reason, expires_at)
+            )
+            self._db.commit()
+
+    def stats(self) -> Dict:
+        lookups = self._counters["lookups"]
+        return {
+            **self._counters,
+            "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries)
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_cache: Optional[NegativeCache] = None
+
+
+def get_negative_cache() -> Optional[NegativeCache]:
+    """Process-wide cache, or None when NEGATIVE_CACHE_ENABLED is off."""
+    global _cache
+    if _cache is None and settings.NEGATIVE_CACHE_ENABLED:
+        _cache = NegativeCache(
+            settings.NEGATIVE_CACHE_PATH,
+            ttl_seconds=settings.NEGATIVE_CACHE_TTL_SECONDS,
+            timeout_ttl_seconds=settings.NEGATIVE_CACHE_TIMEOUT_TTL_SECONDS
+        )
+    return _cache
+
+
+def close_negative_cache():
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
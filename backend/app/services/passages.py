@@ -0,0 +1,108 @@
+"""Source processing: split fetched text into passages and keep the relevant ones.
+
+Providers return the whole text they fetched as ``content``. Before sources
+reach the prompts, pack_sources splits that text into sentence-window
+passages, scores every passage against the query with BM25 in one
+vectorized numpy pass, and keeps the best passages that fit the token
+budget (each source is guaranteed its single best passage).
+"""
+
+import re
+from typing import Dict, List
+import numpy as np
+from app.services.local_wikipedia import STOPWORDS
+
+PASSAGE_SEPARATOR = " … "
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def stem(word: str) -> str:
+    """Light suffix stripping so 'forms', 'formed' and 'forming' share a term."""
+    for suffix, replacement in (("ies", "y"), ("ing", ""), ("ed", ""), ("es", ""), ("s", "")):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    return [stem(word) for word in re.findall(r"\w+", text.lower()) if word not in STOPWORDS]
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English prose
+    return max(1, len(text) // 4)
+
+
+def chunk_text(text: str, max_chars: int) -> List[str]:
+    """Split paragraphs on sentence boundaries into chunks of at most ``max_chars``."""
+    chunks = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        sentences = re.split(r"(?<=[.!?])\s+", re.sub(r"\s+", " ", paragraph).strip())
+        current = ""
+        for sentence in sentences:
+            if current and len(current) + len(sentence) + 1 > max_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current} {sentence}".strip()
+        if current:
+            chunks.append(current)
+    return [chunk[:max_chars] for chunk in chunks]
+
+
+def score_passages(query: str, passages: List[str]) -> np.ndarray:
+    """BM25 score of every passage for the query terms, computed as one matrix product."""
+    terms = sorted(set(tokenize(query)))
+    if not terms or not passages:
+        return np.zeros(len(passages), dtype=np.float32)
+
+    column = {term: i for i, term in enumerate(terms)}
+    tf = np.zeros((len(passages), len(terms)), dtype=np.float32)
+    lengths = np.zeros(len(passages), dtype=np.float32)
+    for row, passage in enumerate(passages):
+        tokens = tokenize(passage)
+        lengths[row] = len(tokens)
+        for token in tokens:
+            i = column.get(token)
+            if i is not None:
+                tf[row, i] += 1
+
+    df = (tf > 0).sum(axis=0)
+    idf = np.log(1.0 + (len(passages) - df + 0.5) / (df + 0.5))
+    length_norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(float(lengths.mean()), 1.0))
+    return (tf * (BM25_K1 + 1) / (tf + length_norm[:, None])) @ idf.astype(np.float32)
+
+
+def pack_sources(query: str, sources: List[Dict], token_budget: int, passage_chars: int = 400) -> List[Dict]:
+    """Replace each source's ``content`` with its most relevant passages within ``token_budget``."""
+    passages = []  # (source index, position in source, text)
+    for source_index, source in enumerate(sources):
+        text = source.get("content") or source.get("snippet", "")
+        for position, chunk in enumerate(chunk_text(text, passage_chars)):
+            passages.append((source_index, position, chunk))
+    if not passages:
+        return [{k: v for k, v in source.items() if k != "content"} for source in sources]
+
+    scores = score_passages(query, [text for _, _, text in passages])
+    # Best score first; on ties the earlier (lead) passage wins
+    order = sorted(range(len(passages)), key=lambda i: (-scores[i], passages[i][1]))
+
+    chosen, used, covered = set(), 0, set()
+    for i in order:
+        if passages[i][0] not in covered:
+            chosen.add(i)
+            covered.add(passages[i][0])
+            used += estimate_tokens(passages[i][2])
+    for i in order:
+        cost = estimate_tokens(passages[i][2])
+        if i not in chosen and used + cost <= token_budget:
+            chosen.add(i)
+            used += cost
+
+    packed = []
+    for source_index, source in enumerate(sources):
+        selected = [text for j, (owner, _, text) in enumerate(passages) if owner == source_index and j in chosen]
+        entry = {k: v for k, v in source.items() if k != "content"}
+        entry["snippet"] = PASSAGE_SEPARATOR.join(selected)
+        packed.append(entry)
+    return packed
@@ -0,0 +1,11 @@
+"""Query normalization shared by the explanation cache keys and the concept catalog.
+
+Standard library only, so importing it does not pull in the LLM and search stack.
+"""
+
+import re
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold and collapse whitespace/trailing punctuation so equal questions share a key."""
+    return re.sub(r"\s+", " ", query).strip().strip("?!.").strip().lower()
@@ -1,15 +1,12 @@
-import google.generativeai as genai
 import json
-from typing import Dict, List
+from typing import Dict, List, Optional
 from app.core.config import settings
+from app.services.llm_client import LLMClientRegistry, get_llm_registry
 
 class QuizService:
-    def __init__(self):
-        if settings.GEMINI_API_KEY:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
-            self.model = genai.GenerativeModel('gemini-2.5-pro')  # Using Pro version
-        else:
-            self.model = None
+    def __init__(self, llm: Optional[LLMClientRegistry] = None):
+        self.llm = llm or get_llm_registry()
+        self.model = self.llm.get_model()  # Shared handle, None without API key
     
     async def generate_quiz(self, explanation: str, difficulty: str = "medium") -> Dict:
         # TODO: EXERCISE 1B - Implement Quiz Generation (Prompt Engineering Session)
@@ -59,11 +56,7 @@ class QuizService:
                  Difficulty: {difficulty}"""
         
         try:
-            quiz_data = self.model.generate_content(prompt)
-            if quiz_data.parts and len(quiz_data.parts) > 0:
-                quiz_data = quiz_data.parts[0].text
-            else:
-                print(f"❌ No text content found in response: {quiz_data}")
+            quiz_data = await self.llm.generate_text(prompt)
             print(quiz_data)
             quiz_data = quiz_data.replace("```json", "").replace("```", "")
 
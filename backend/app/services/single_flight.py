@@ -0,0 +1,35 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key starts the work as its own task; callers that
+    arrive while it is running await the same task and receive its result
+    (or its exception). Because the work runs in a separate task, a caller
+    that disconnects does not cancel it for the others.
+    """
+
+    def __init__(self, name: str = "single_flight"):
+        self.name = name
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._counters = {"executions": 0, "coalesced": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            self._counters["executions"] += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self._counters["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def stats(self) -> Dict:
+        return {**self._counters, "in_flight": len(self._calls)}
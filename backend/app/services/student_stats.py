@@ -0,0 +1,178 @@
+"""Per-student dashboard totals kept in the ``student_stats`` rollup table.
+
+/api/progress/stats reads one StudentStats row instead of counting Progress
+and LearningSession rows on every call. The explain and quiz-submit
+endpoints update the row in the same transaction as the rows it counts;
+counters are bumped with ``column = column + n`` and the recent-topics list
+is re-read from learning_sessions under a lock on the row, so concurrent
+requests do not overwrite each other. A student without a row (data from
+before the table existed) is computed from the tables once, on first use.
+
+    python -m app.services.student_stats rebuild
+"""
+
+import argparse
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.database import upsert_insert
+from app.models.models import LearningSession, Progress, StudentStats
+
+MASTERY_THRESHOLD = 85
+RECENT_TOPICS_LIMIT = 5
+
+
+def progress_totals_query(student_id: Optional[str] = None):
+    statement = select(
+        Progress.student_id,
+        func.count(),
+        func.coalesce(func.sum(case((Progress.mastery_level >= MASTERY_THRESHOLD, 1), else_=0)), 0)
+    ).group_by(Progress.student_id)
+    return statement.where(Progress.student_id == student_id) if student_id else statement
+
+
+def session_totals_query(student_id: Optional[str] = None):
+    statement = select(LearningSession.student_id, func.count()).group_by(LearningSession.student_id)
+    return statement.where(LearningSession.student_id == student_id) if student_id else statement
+
+
+def recent_topics_query(student_id: Optional[str] = None):
+    if student_id:
+        # One student: a range scan of ix_learning_sessions_student_started
+        return select(
+            LearningSession.student_id, LearningSession.id, LearningSession.query, LearningSession.started_at
+        ).where(LearningSession.student_id == student_id).order_by(
+            LearningSession.started_at.desc()
+        ).limit(RECENT_TOPICS_LIMIT)
+    position = func.row_number().over(
+        partition_by=LearningSession.student_id,
+        order_by=LearningSession.started_at.desc()
+    ).label("position")
+    ranked = select(
+        LearningSession.student_id, LearningSession.id, LearningSession.query, LearningSession.started_at, position
+    ).subquery()
+    return select(ranked.c.student_id, ranked.c.id, ranked.c.query, ranked.c.started_at).where(
+        ranked.c.position <= RECENT_TOPICS_LIMIT
+    ).order_by(ranked.c.student_id, ranked.c.position)
+
+
+def topic_entry(session_id: str, query: str, started_at: Optional[datetime]) -> Dict:
+    return {
+        "query": query,
+        "started_at": started_at.isoformat() if started_at else None,
+        "session_id": session_id
+    }
+
+
+def build_stats(progress_rows, session_rows, topic_rows) -> Dict[str, StudentStats]:
+    stats: Dict[str, StudentStats] = {}
+
+    def row(student_id: str) -> StudentStats:
+        if student_id not in stats:
+            stats[student_id] = StudentStats(
+                student_id=student_id, total_concepts=0, mastered_concepts=0, total_sessions=0, recent_topics=[]
+            )
+        return stats[student_id]
+
+    for student_id, total, mastered in progress_rows:
+        row(student_id).total_concepts = total
+        row(student_id).mastered_concepts = mastered
+    for student_id, total in session_rows:
+        row(student_id).total_sessions = total
+    for student_id, session_id, query, started_at in topic_rows:
+        row(student_id).recent_topics.append(topic_entry(session_id, query, started_at))
+    return stats
+
+
+async def load_student_stats(db: AsyncSession, student_id: str) -> StudentStats:
+    """The student's rollup row, computed from the tables if it does not exist yet.
+
+    Call it before adding the rows that are about to be counted, so they are
+    not included in a freshly computed row as well as added on top. The first
+    row is inserted with ON CONFLICT DO NOTHING, so concurrent first requests
+    for a student all end up reading the same row.
+    """
+    stats = await db.get(StudentStats, student_id)
+    if stats is None:
+        computed = build_stats(
+            (await db.execute(progress_totals_query(student_id))).all(),
+            (await db.execute(session_totals_query(student_id))).all(),
+            (await db.execute(recent_topics_query(student_id))).all()
+        ).get(student_id)
+        table = StudentStats.__table__
+        await db.execute(
+            upsert_insert(db.bind.dialect.name, table).values(
+                student_id=student_id,
+                total_concepts=computed.total_concepts if computed else 0,
+                mastered_concepts=computed.mastered_concepts if computed else 0,
+                total_sessions=computed.total_sessions if computed else 0,
+                recent_topics=computed.recent_topics if computed else [],
+                updated_at=datetime.utcnow()
+            ).on_conflict_do_nothing(index_elements=[table.c.student_id])
+        )
+        stats = await db.get(StudentStats, student_id)
+    return stats
+
+
+def increment(stats: StudentStats, column: str, amount: int = 1):
+    if inspect(stats).persistent:
+        # UPDATE ... SET column = column + amount, safe against concurrent requests
+        setattr(stats, column, getattr(StudentStats, column) + amount)
+    else:
+        setattr(stats, column, (getattr(stats, column) or 0) + amount)
+
+
+async def record_session(db: AsyncSession, stats: StudentStats, session: LearningSession):
+    """Count a new (added, not yet flushed) session and put it at the front of the recent topics."""
+    increment(stats, "total_sessions")
+    # Concurrent sessions of the student wait here (no-op on SQLite, where the
+    # flush below already holds the database write lock), so each one re-reads
+    # the list with the others' sessions in it
+    await db.execute(
+        select(StudentStats.student_id).where(StudentStats.student_id == stats.student_id).with_for_update()
+    )
+    await db.flush([session])
+    rows = (await db.execute(recent_topics_query(stats.student_id))).all()
+    stats.recent_topics = [topic_entry(session_id, query, started_at) for _, session_id, query, started_at in rows]
+
+
+def record_progress(stats: StudentStats, previous_mastery: Optional[float], mastery: float, created: bool):
+    if created:
+        increment(stats, "total_concepts")
+    if (previous_mastery or 0) < MASTERY_THRESHOLD <= mastery:
+        increment(stats, "mastered_concepts")
+
+
+def rebuild(db) -> int:
+    """Recompute every student's row from Progress and LearningSession (sync Session)."""
+    stats = build_stats(
+        db.execute(progress_totals_query()).all(),
+        db.execute(session_totals_query()).all(),
+        db.execute(recent_topics_query()).all()
+    )
+    db.query(StudentStats).delete()
+    db.add_all(stats.values())
+    db.commit()
+    return len(stats)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Manage the student_stats rollup table")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="Recompute every student's totals from the source tables")
+    parser.parse_args(argv)
+
+    from app.database.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        print(f"✅ Rebuilt stats for {rebuild(db)} students")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
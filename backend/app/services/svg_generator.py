@@ -1,13 +1,11 @@
-import google.generativeai as genai
+from typing import Optional
 from app.core.config import settings
+from app.services.llm_client import LLMClientRegistry, get_llm_registry
 
 class SVGGenerator:
-    def __init__(self):
-        if settings.GEMINI_API_KEY:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
-            self.model = genai.GenerativeModel('gemini-2.5-pro')  # Using Pro version
-        else:
-            self.model = None
+    def __init__(self, llm: Optional[LLMClientRegistry] = None):
+        self.llm = llm or get_llm_registry()
+        self.model = self.llm.get_model()  # Shared handle, None without API key
         
     async def generate_svg_flashcard(self, topic: str, explanation: str) -> str:
         # TODO: EXERCISE 1C - Implement SVG Flashcard Generation (Prompt Engineering Session)
@@ -66,7 +64,7 @@ class SVGGenerator:
         """
         
         try:
-            # TODO: Generate content using self.model.generate_content(prompt)
+            # TODO: Generate content using await self.llm.generate_text(prompt)
             # TODO: Clean the response using self.clean_svg_response()
             # TODO: Return the SVG content
             pass
@@ -91,8 +89,7 @@ class SVGGenerator:
         """
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return await self.llm.generate_text(prompt)
         except Exception as e:
             print(f"Error extracting core essence: {e}")
             return f"Core concept about {topic}"
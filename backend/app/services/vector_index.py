@@ -0,0 +1,350 @@
+"""Local vector index over fetched sources and past explanations.
+
+Vectors live in ``vectors.f32`` (raw float32 rows, memory-mapped on load)
+next to ``entries.jsonl`` (one row's id/title/url/text per line) and
+``df.npy`` (per-dimension document frequencies used for query IDF
+weighting). New rows are buffered in memory; every ``flush_every``
+additions and on shutdown they are appended to the end of both row files
+and the small df.npy is rewritten, so a flush costs the size of the batch,
+not of the index. Rows beyond the shorter of the two files (an interrupted
+flush) are dropped on load.
+
+Rebuild the explanation part from the database with:
+
+    python -m app.services.vector_index rebuild
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import math
+import os
+import re
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Dict, List, Optional
+import numpy as np
+from app.core.config import settings
+from app.services.local_wikipedia import STOPWORDS
+from app.services.passages import chunk_text
+
+CHUNK_CHARS = 600
+
+
+class Embedder(ABC):
+    """Interface for pluggable local embedders."""
+
+    dim: int
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Return a float32 (len(texts), dim) matrix of L2-normalized rows."""
+
+
+class HashingEmbedder(Embedder):
+    """Offline default: sign-hashed unigrams and bigrams with sublinear TF.
+
+    IDF is applied by the index at query time from its own document
+    frequencies, so stored rows never need re-embedding as the corpus grows.
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    @staticmethod
+    def tokens(text: str) -> List[str]:
+        words = [word for word in re.findall(r"\w+", text.lower()) if word not in STOPWORDS]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token, count in Counter(self.tokens(text)).items():
+                h = zlib.crc32(token.encode("utf-8"))
+                sign = 1.0 if h & 0x80000000 else -1.0
+                matrix[row, h % self.dim] += sign * (1.0 + math.log(count))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+
+def load_embedder(spec: str, dim: int) -> Embedder:
+    """``hashing`` or a ``package.module:ClassName`` taking a ``dim`` keyword."""
+    if spec == "hashing":
+        return HashingEmbedder(dim)
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)(dim=dim)
+
+
+class VectorIndex:
+    def __init__(self, directory: str, embedder: Embedder, flush_every: int = 64):
+        self.directory = directory
+        self.embedder = embedder
+        self.flush_every = flush_every
+        self._lock = threading.RLock()
+        self._vectors = np.zeros((0, embedder.dim), dtype=np.float32)
+        self._pending: List[np.ndarray] = []
+        self._pending_rows = 0
+        self._flushed_rows = 0
+        self._entries: List[Dict] = []
+        self._keys: Dict[str, int] = {}
+        self._kinds: Optional[np.ndarray] = None
+        self._df = np.zeros(embedder.dim, dtype=np.float64)
+        self._counters = {"searches": 0, "queries": 0, "added": 0, "flushes": 0}
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _map(self, rows: int) -> np.ndarray:
+        if rows == 0:
+            return np.zeros((0, self.embedder.dim), dtype=np.float32)
+        return np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="r", shape=(rows, self.embedder.dim))
+
+    def _write_meta(self):
+        with open(self._path("index.json"), "w", encoding="utf-8") as f:
+            json.dump({"dim": self.embedder.dim}, f)
+
+    def _convert_legacy_files(self):
+        """Indexes written before the append-only layout kept vectors.npy and entries.json."""
+        vectors = np.load(self._path("vectors.npy"), mmap_mode="r")
+        if vectors.shape[1] != self.embedder.dim:
+            print(f"⚠️ Vector index has dim {vectors.shape[1]}, embedder has {self.embedder.dim}; starting empty (run rebuild)")
+            return
+        with open(self._path("entries.json"), encoding="utf-8") as f:
+            entries = json.load(f)
+        with open(self._path("vectors.f32"), "wb") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        with open(self._path("entries.jsonl"), "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+        del vectors
+        self._write_meta()
+        os.remove(self._path("vectors.npy"))
+        os.remove(self._path("entries.json"))
+
+    def _load(self):
+        if os.path.exists(self._path("vectors.npy")) and not os.path.exists(self._path("vectors.f32")):
+            self._convert_legacy_files()
+        if not os.path.exists(self._path("vectors.f32")):
+            return
+        with open(self._path("index.json"), encoding="utf-8") as f:
+            dim = json.load(f)["dim"]
+        if dim != self.embedder.dim:
+            print(f"⚠️ Vector index has dim {dim}, embedder has {self.embedder.dim}; starting empty (run rebuild)")
+            for name in ("vectors.f32", "entries.jsonl", "df.npy", "index.json"):
+                if os.path.exists(self._path(name)):
+                    os.remove(self._path(name))
+            return
+
+        row_bytes = dim * 4
+        size = os.path.getsize(self._path("vectors.f32"))
+        with open(self._path("entries.jsonl"), encoding="utf-8") as f:
+            entries = []
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # half-written last line
+                entries.append(json.loads(line))
+
+        rows = min(size // row_bytes, len(entries))
+        if size != rows * row_bytes or len(entries) != rows:
+            # An interrupted flush: keep the rows both files have
+            os.truncate(self._path("vectors.f32"), rows * row_bytes)
+            self._entries = entries[:rows]
+            with open(self._path("entries.jsonl"), "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in self._entries)
+        else:
+            self._entries = entries
+        self._flushed_rows = rows
+        self._vectors = self._map(rows)
+        self._keys = {entry["key"]: row for row, entry in enumerate(self._entries)}
+        if os.path.exists(self._path("df.npy")) and size == rows * row_bytes and len(entries) == rows:
+            self._df = np.load(self._path("df.npy"))
+        else:
+            self._df = (np.asarray(self._vectors) != 0).sum(axis=0).astype(np.float64)
+
+    @staticmethod
+    def make_key(kind: str, text: str) -> str:
+        return hashlib.sha1(f"{kind}\0{text}".encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, items: List[Dict]) -> int:
+        """Add ``{kind, text, title, url, ref}`` items, skipping texts already indexed."""
+        with self._lock:
+            new_items = []
+            for item in items:
+                key = self.make_key(item["kind"], item["text"])
+                if key not in self._keys and item["text"].strip():
+                    self._keys[key] = len(self._entries) + len(new_items)
+                    new_items.append({**item, "key": key})
+            if not new_items:
+                return 0
+
+            # Title (page title or the student's question) and chunk get equal weight, so a short
+            # question can match its topic even when the chunk itself is long
+            vectors = self.embedder.embed([item["title"] for item in new_items]) \
+                + self.embedder.embed([item["text"] for item in new_items])
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            self._pending.append(vectors)
+            self._pending_rows += len(new_items)
+            self._entries.extend(new_items)
+            self._df += (vectors != 0).sum(axis=0)
+            self._kinds = None
+            self._counters["added"] += len(new_items)
+
+            if self._pending_rows >= self.flush_every:
+                self.flush()
+            return len(new_items)
+
+    def search(self, queries: List[str], k: int = 5, kinds: Optional[List[str]] = None) -> List[List[Dict]]:
+        """Top-k entries per query, scored with one (queries x rows) matmul."""
+        with self._lock:
+            if not queries or not self._entries:
+                return [[] for _ in queries]
+
+            idf = np.log((1.0 + len(self._entries)) / (1.0 + self._df)) + 1.0
+            weighted = self.embedder.embed(queries) * idf.astype(np.float32)
+            weighted /= np.maximum(np.linalg.norm(weighted, axis=1, keepdims=True), 1e-12)
+
+            # Score the memory-mapped block and any unflushed rows without copying the mapped matrix
+            scores = np.hstack([weighted @ block.T for block in [self._vectors, *self._pending]])
+
+            if kinds:
+                if self._kinds is None:
+                    self._kinds = np.array([entry["kind"] for entry in self._entries])
+                scores[:, ~np.isin(self._kinds, kinds)] = -np.inf
+
+            self._counters["searches"] += 1
+            self._counters["queries"] += len(queries)
+
+            k = min(k, scores.shape[1])
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            results = []
+            for row, candidates in enumerate(top):
+                ordered = candidates[np.argsort(-scores[row, candidates])]
+                results.append([
+                    {**self._entries[i], "score": float(scores[row, i])}
+                    for i in ordered if np.isfinite(scores[row, i])
+                ])
+            return results
+
+    def flush(self):
+        """Append buffered rows to vectors.f32 and entries.jsonl, and rewrite df.npy."""
+        with self._lock:
+            if not self._pending:
+                return
+            rows = np.vstack(self._pending).astype(np.float32)
+            entries = self._entries[self._flushed_rows:self._flushed_rows + len(rows)]
+
+            if not self._flushed_rows:
+                self._write_meta()
+            with open(self._path("vectors.f32"), "ab") as f:
+                f.write(rows.tobytes())
+            with open(self._path("entries.jsonl"), "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            np.save(self._path("df.tmp.npy"), self._df)
+            os.replace(self._path("df.tmp.npy"), self._path("df.npy"))
+
+            self._flushed_rows += len(rows)
+            self._vectors = self._map(self._flushed_rows)
+            self._pending, self._pending_rows = [], 0
+            self._counters["flushes"] += 1
+
+    def stats(self) -> Dict:
+        kinds = Counter(entry["kind"] for entry in self._entries)
+        return {**self._counters, "rows": len(self._entries), "pending": self._pending_rows, "kinds": dict(kinds)}
+
+    def close(self):
+        self.flush()
+
+
+def source_items(sources: List[Dict]) -> List[Dict]:
+    return [
+        {
+            "kind": "source",
+            "text": chunk,
+            "title": source.get("title", ""),
+            "url": source.get("url", ""),
+            "ref": source.get("source_type", "")
+        }
+        for source in sources
+        for chunk in chunk_text(source.get("content") or source.get("snippet", ""), CHUNK_CHARS)
+    ]
+
+
+def explanation_items(session_id: str, query: str, explanation: str) -> List[Dict]:
+    return [
+        {"kind": "explanation", "text": chunk, "title": query, "url": "", "ref": session_id}
+        for chunk in chunk_text(explanation, CHUNK_CHARS)
+    ]
+
+
+_index: Optional[VectorIndex] = None
+
+
+def get_vector_index() -> Optional[VectorIndex]:
+    """Process-wide index, or None when VECTOR_INDEX_ENABLED is off."""
+    global _index
+    if _index is None and settings.VECTOR_INDEX_ENABLED:
+        _index = VectorIndex(
+            settings.VECTOR_INDEX_DIR,
+            load_embedder(settings.VECTOR_EMBEDDER, settings.VECTOR_INDEX_DIM),
+            flush_every=settings.VECTOR_INDEX_FLUSH_EVERY
+        )
+    return _index
+
+
+def close_vector_index():
+    global _index
+    if _index is not None:
+        _index.close()
+        _index = None
+
+
+def remember_explanation(session_id: str, query: str, explanation: str):
+    index = get_vector_index()
+    if index is not None and explanation:
+        index.add(explanation_items(session_id, query, explanation))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Manage the local vector index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="Index every stored LearningSession explanation")
+    search = commands.add_parser("search", help="Query the index")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    index = get_vector_index()
+    if index is None:
+        print("⚠️ VECTOR_INDEX_ENABLED is off")
+        return
+
+    if args.command == "rebuild":
+        from app.database.database import SessionLocal
+        from app.models.models import LearningSession
+
+        db = SessionLocal()
+        try:
+            added = 0
+            for session_id, query, explanation in db.query(
+                LearningSession.id, LearningSession.query, LearningSession.explanation
+            ).yield_per(500):
+                if explanation:
+                    added += index.add(explanation_items(session_id, query, explanation))
+        finally:
+            db.close()
+        print(f"✅ Added {added} explanation chunks ({len(index)} rows total)")
+    else:
+        for hit in index.search([args.query], k=args.limit)[0]:
+            print(f"{hit['score']:.3f}  [{hit['kind']}] {hit['title']}  {hit['text'][:80]}")
+    close_vector_index()
+
+
+if __name__ == "__main__":
+    main()
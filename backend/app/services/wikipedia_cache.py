@@ -0,0 +1,128 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from app.core.config import settings
+
+
+class CachedResponse:
+    def __init__(self, data: Dict, etag: Optional[str], last_modified: Optional[str], fetched_at: float):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def validators(self) -> Dict[str, str]:
+        """Headers for a conditional GET against the origin."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class WikipediaCache:
+    """SQLite store of Wikipedia summary and search responses with their validators.
+
+    Entries younger than ``fresh_seconds`` are served as-is. Entries up to
+    ``stale_seconds`` old are served immediately while the provider
+    revalidates them in the background (stale-while-revalidate). Older
+    entries are only used to make the refetch conditional.
+    """
+
+    def __init__(self, db_path: str, fresh_seconds: float, stale_seconds: float):
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self._lock = threading.Lock()
+        self._counters = {
+            "fresh_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "not_modified": 0,
+            "stored": 0
+        }
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS wikipedia_responses ("
+            "kind TEXT NOT NULL, key TEXT NOT NULL, body TEXT NOT NULL, "
+            "etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL, "
+            "PRIMARY KEY (kind, key))"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def normalize_key(value: str) -> str:
+        return " ".join(value.replace("_", " ").split()).lower()
+
+    def get(self, kind: str, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM wikipedia_responses WHERE kind = ? AND key = ?",
+                (kind, self.normalize_key(key))
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(json.loads(row[0]), row[1], row[2], row[3])
+
+    def put(self, kind: str, key: str, data: Dict, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO wikipedia_responses (kind, key, body, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, self.normalize_key(key), json.dumps(data), etag, last_modified, time.time())
+            )
+            self._db.commit()
+
+    def touch(self, kind: str, key: str):
+        """Mark an entry fresh again after a 304 Not Modified."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE wikipedia_responses SET fetched_at = ? WHERE kind = ? AND key = ?",
+                (time.time(), kind, self.normalize_key(key))
+            )
+            self._db.commit()
+
+    def record(self, counter: str):
+        self._counters[counter] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM wikipedia_responses").fetchone()[0]
+        return {**self._counters, "entries": entries}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_cache: Optional[WikipediaCache] = None
+
+
+def get_wikipedia_cache() -> Optional[WikipediaCache]:
+    """Process-wide cache, or None when WIKIPEDIA_CACHE_ENABLED is off."""
+    global _cache
+    if _cache is None and settings.WIKIPEDIA_CACHE_ENABLED:
+        _cache = WikipediaCache(
+            settings.WIKIPEDIA_CACHE_PATH,
+            fresh_seconds=settings.WIKIPEDIA_CACHE_FRESH_SECONDS,
+            stale_seconds=settings.WIKIPEDIA_CACHE_STALE_SECONDS
+        )
+    return _cache
+
+
+def close_wikipedia_cache():
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
@@ -0,0 +1,181 @@
+import asyncio
+import httpx
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+from app.services.wikipedia_cache import CachedResponse, WikipediaCache, get_wikipedia_cache
+
+SUMMARY_URL = "https://en.wikipedia.org/api/rest_v1/page/summary/{title}"
+SEARCH_URL = "https://en.wikipedia.org/w/api.php"
+SNIPPET_LENGTH = 300
+# prop=extracts returns intro extracts for at most 20 pages per request
+MAX_BATCH_TITLES = 20
+
+# Background revalidations in flight, keyed by (kind, key) so a hot stale entry is refreshed once
+_revalidations: Dict[Tuple[str, str], asyncio.Task] = {}
+
+
+class WikipediaProvider:
+    """Wikipedia retrieval over the shared pooled HTTP client.
+
+    Tries the REST summary for the keyword as a page title first and falls
+    back to a one-result full-text search, whose best title is then
+    summarized. search_many resolves several keywords as titles (following
+    normalization and redirects) in a single api.php request.
+
+    All calls go through the shared WikipediaCache when it is enabled, so
+    repeat topics are answered from disk and stale entries are refreshed
+    with conditional requests after the caller already has its answer.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, cache: Optional[WikipediaCache] = None):
+        self.client = client
+        self.cache = cache or get_wikipedia_cache()
+
+    async def search(self, keyword: str) -> List[Dict]:
+        """Sources for a keyword; request errors (httpx.HTTPError) propagate to the caller."""
+        summary = await self.fetch_summary(keyword)
+        if summary is None:
+            title = await self.search_title(keyword)
+            if title:
+                summary = await self.fetch_summary(title)
+
+        return [self.to_source(summary)] if summary else []
+
+    async def search_many(self, keywords: List[str]) -> Dict[str, List[Dict]]:
+        """Resolve keywords as page titles in one round trip; keywords without a page map to []."""
+        titles = []
+        for keyword in keywords:
+            title = keyword.replace("|", " ").strip()
+            if title and title not in titles:
+                titles.append(title)
+        titles = titles[:MAX_BATCH_TITLES]
+        if not titles:
+            return {keyword: [] for keyword in keywords}
+
+        data = await self._get_json("batch", "|".join(titles), SEARCH_URL, params={
+            "action": "query",
+            "format": "json",
+            "formatversion": 2,
+            "prop": "extracts|info|pageprops",
+            "exintro": 1,
+            "explaintext": 1,
+            "exlimit": "max",
+            "inprop": "url",
+            "ppprop": "disambiguation",
+            "redirects": 1,
+            "titles": "|".join(titles)
+        })
+        resolved = self.map_pages(titles, data or {})
+        return {keyword: resolved.get(keyword.replace("|", " ").strip(), []) for keyword in keywords}
+
+    def map_pages(self, titles: List[str], data: Dict) -> Dict[str, List[Dict]]:
+        """Follow the normalized/redirects chains of a batched query back to each requested title."""
+        query = data.get("query", {})
+        renamed = {entry["from"]: entry["to"] for entry in query.get("normalized", []) + query.get("redirects", [])}
+        pages = {page.get("title"): page for page in query.get("pages", [])}
+
+        results = {}
+        for requested in titles:
+            title, seen = requested, set()
+            while title in renamed and title not in seen:
+                seen.add(title)
+                title = renamed[title]
+            page = pages.get(title)
+            if page is None or page.get("missing") or page.get("invalid") \
+                    or "disambiguation" in page.get("pageprops", {}) or not page.get("extract"):
+                results[requested] = []
+                continue
+            results[requested] = [self.to_source({
+                "title": page["title"],
+                "extract": page["extract"],
+                "content_urls": {"desktop": {"page": page.get("fullurl")}}
+            })]
+        return results
+
+    async def fetch_summary(self, title: str) -> Optional[Dict]:
+        """Return the REST summary for a title, or None for missing and disambiguation pages."""
+        url = SUMMARY_URL.format(title=quote(title.replace(" ", "_"), safe=""))
+        data = await self._get_json("summary", title, url)
+        if data is None or data.get("type") == "disambiguation" or not data.get("extract"):
+            return None
+        return data
+
+    async def search_title(self, keyword: str) -> Optional[str]:
+        data = await self._get_json("search", keyword, SEARCH_URL, params={
+            "action": "query",
+            "format": "json",
+            "list": "search",
+            "srsearch": keyword,
+            "srlimit": 1
+        })
+        if data is None:
+            return None
+
+        results = data.get("query", {}).get("search", [])
+        return results[0]["title"] if results else None
+
+    async def _get_json(self, kind: str, key: str, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """GET a JSON body, serving fresh cache entries directly and stale ones while revalidating."""
+        if self.cache is None:
+            response = await self.client.get(url, params=params)
+            return response.json() if response.status_code == 200 else None
+
+        entry = self.cache.get(kind, key)
+        if entry is not None and entry.age < self.cache.fresh_seconds:
+            self.cache.record("fresh_hits")
+            return entry.data
+        if entry is not None and entry.age < self.cache.stale_seconds:
+            self.cache.record("stale_hits")
+            self._revalidate_in_background(kind, key, url, params, entry)
+            return entry.data
+
+        self.cache.record("misses")
+        return await self._fetch(kind, key, url, params, entry)
+
+    async def _fetch(self, kind: str, key: str, url: str, params: Optional[Dict],
+                     entry: Optional[CachedResponse]) -> Optional[Dict]:
+        headers = entry.validators() if entry is not None else {}
+        response = await self.client.get(url, params=params, headers=headers)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(kind, key)
+            self.cache.record("not_modified")
+            return entry.data
+        if response.status_code != 200:
+            return None
+
+        data = response.json()
+        self.cache.put(kind, key, data, response.headers.get("etag"), response.headers.get("last-modified"))
+        self.cache.record("stored")
+        return data
+
+    def _revalidate_in_background(self, kind: str, key: str, url: str, params: Optional[Dict],
+                                  entry: CachedResponse):
+        task_key = (kind, self.cache.normalize_key(key))
+        if task_key in _revalidations:
+            return
+
+        async def revalidate():
+            try:
+                await self._fetch(kind, key, url, params, entry)
+            except Exception as e:
+                print(f"   ⚠️ Wikipedia revalidation failed for {kind} '{key}': {e}")
+
+        task = asyncio.ensure_future(revalidate())
+        _revalidations[task_key] = task
+        task.add_done_callback(lambda _: _revalidations.pop(task_key, None))
+
+    @staticmethod
+    def to_source(summary: Dict) -> Dict:
+        title = summary.get("title", "")
+        url = summary.get("content_urls", {}).get("desktop", {}).get("page") \
+            or f"https://en.wikipedia.org/wiki/{quote(title.replace(' ', '_'))}"
+        extract = re.sub(r"\s+", " ", summary.get("extract", "")).strip()
+        return {
+            "title": title,
+            "url": url,
+            "snippet": extract[:SNIPPET_LENGTH],
+            "content": extract,
+            "source_type": "wikipedia"
+        }
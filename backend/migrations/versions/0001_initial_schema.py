@@ -0,0 +1,104 @@
+"""Initial schema with hot-path indexes
+
+Databases created before migrations (by ``create_all`` at import) already
+have the tables, so each table and index is only created when missing.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) for the filters the API runs on every request
+INDEXES = [
+    ('ix_progress_student_concept', 'progress', ['student_id', 'concept_id']),
+    ('ix_learning_sessions_student_started', 'learning_sessions', ['student_id', 'started_at']),
+    ('ix_learning_sessions_student_concept', 'learning_sessions', ['student_id', 'concept_id']),
+    ('ix_quizzes_session_id', 'quizzes', ['session_id']),
+    ('ix_concepts_name', 'concepts', ['name']),
+    ('ix_concepts_subject', 'concepts', ['subject']),
+]
+
+
+def create_tables(existing):
+    if 'students' not in existing:
+        op.create_table(
+            'students',
+            sa.Column('id', sa.String(), primary_key=True),
+            sa.Column('username', sa.String(), nullable=False, unique=True),
+            sa.Column('email', sa.String(), nullable=False, unique=True),
+            sa.Column('grade_level', sa.Integer()),
+            sa.Column('created_at', sa.DateTime()),
+            sa.Column('last_active', sa.DateTime()),
+            sa.Column('preferences', sa.JSON()),
+        )
+    if 'concepts' not in existing:
+        op.create_table(
+            'concepts',
+            sa.Column('id', sa.String(), primary_key=True),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('subject', sa.String()),
+            sa.Column('description', sa.Text()),
+            sa.Column('prerequisites', sa.JSON()),
+            sa.Column('related_topics', sa.JSON()),
+            sa.Column('created_at', sa.DateTime()),
+        )
+    if 'learning_sessions' not in existing:
+        op.create_table(
+            'learning_sessions',
+            sa.Column('id', sa.String(), primary_key=True),
+            sa.Column('student_id', sa.String(), sa.ForeignKey('students.id')),
+            sa.Column('concept_id', sa.String(), sa.ForeignKey('concepts.id')),
+            sa.Column('query', sa.Text()),
+            sa.Column('explanation', sa.Text()),
+            sa.Column('sources', sa.JSON()),
+            sa.Column('svg_diagrams', sa.JSON()),
+            sa.Column('started_at', sa.DateTime()),
+            sa.Column('completed_at', sa.DateTime()),
+        )
+    if 'quizzes' not in existing:
+        op.create_table(
+            'quizzes',
+            sa.Column('id', sa.String(), primary_key=True),
+            sa.Column('session_id', sa.String(), sa.ForeignKey('learning_sessions.id')),
+            sa.Column('questions', sa.JSON()),
+            sa.Column('student_responses', sa.JSON()),
+            sa.Column('score', sa.Float()),
+            sa.Column('mastery_achieved', sa.Boolean()),
+            sa.Column('created_at', sa.DateTime()),
+        )
+    if 'progress' not in existing:
+        op.create_table(
+            'progress',
+            sa.Column('id', sa.String(), primary_key=True),
+            sa.Column('student_id', sa.String(), sa.ForeignKey('students.id')),
+            sa.Column('concept_id', sa.String(), sa.ForeignKey('concepts.id')),
+            sa.Column('mastery_level', sa.Float()),
+            sa.Column('attempts', sa.Integer()),
+            sa.Column('last_reviewed', sa.DateTime()),
+            sa.Column('updated_at', sa.DateTime()),
+        )
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    create_tables(set(inspector.get_table_names()))
+
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    for table in ('progress', 'quizzes', 'learning_sessions', 'concepts', 'students'):
+        op.drop_table(table)
@@ -0,0 +1,33 @@
+"""Student stats rollup table
+
+Rows are filled lazily on first use, or for everyone at once with
+``python -m app.services.student_stats rebuild``.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'student_stats',
+        sa.Column('student_id', sa.String(), sa.ForeignKey('students.id'), primary_key=True),
+        sa.Column('total_concepts', sa.Integer(), nullable=False),
+        sa.Column('mastered_concepts', sa.Integer(), nullable=False),
+        sa.Column('total_sessions', sa.Integer(), nullable=False),
+        sa.Column('recent_topics', sa.JSON()),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+
+
+def downgrade():
+    op.drop_table('student_stats')
@@ -0,0 +1,138 @@
+"""Move inline SVG flashcards into the blob store
+
+learning_sessions.svg_diagrams used to hold the SVG text itself; it now
+holds SHA-256 references into the blob store (BLOB_STORE_DIR), served by
+GET /api/flashcards/{hash}.
+
+Blobs are read and written here with a frozen copy of the store's on-disk
+layout as of this revision (a ``blobs`` table in ``blobs.db`` plus one
+``<aa>/<hash>`` file per blob, each row naming its codec), not with
+app.services.blob_store. New blobs are always zlib, which every later
+store can read.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+learning_sessions = sa.table(
+    'learning_sessions',
+    sa.column('id', sa.String()),
+    sa.column('svg_diagrams', sa.JSON()),
+)
+
+HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+class Blobs:
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(directory, 'blobs.db'))
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS blobs ('
+            'hash TEXT PRIMARY KEY, content_type TEXT NOT NULL, codec TEXT NOT NULL, '
+            'size INTEGER NOT NULL, stored_size INTEGER NOT NULL, refs INTEGER NOT NULL, created_at REAL NOT NULL)'
+        )
+
+    def path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def put_text(self, text, content_type):
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        updated = self.db.execute('UPDATE blobs SET refs = refs + 1 WHERE hash = ?', (digest,)).rowcount
+        if not (updated and os.path.exists(self.path(digest))):
+            stored = zlib.compress(data, 9)
+            os.makedirs(os.path.dirname(self.path(digest)), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path(digest)))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(stored)
+            os.replace(tmp_path, self.path(digest))
+            self.db.execute(
+                'INSERT OR REPLACE INTO blobs (hash, content_type, codec, size, stored_size, refs, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (digest, content_type, 'zlib', len(data), len(stored), 1, time.time())
+            )
+        self.db.commit()
+        return digest
+
+    def get_text(self, digest):
+        row = self.db.execute('SELECT codec FROM blobs WHERE hash = ?', (digest,)).fetchone()
+        if row is None or not os.path.exists(self.path(digest)):
+            return None
+        with open(self.path(digest), 'rb') as f:
+            data = f.read()
+        if row[0] == 'zstd':
+            import zstandard
+            data = zstandard.ZstdDecompressor().decompress(data)
+        else:
+            data = zlib.decompress(data)
+        return data.decode('utf-8')
+
+    def close(self):
+        self.db.close()
+
+
+def rewrite_diagrams(convert, batch_size=500):
+    bind = op.get_bind()
+    last_id = ''
+    while True:
+        rows = bind.execute(
+            sa.select(learning_sessions.c.id, learning_sessions.c.svg_diagrams)
+            .where(learning_sessions.c.id > last_id, learning_sessions.c.svg_diagrams.isnot(None))
+            .order_by(learning_sessions.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        for session_id, diagrams in rows:
+            converted = [convert(diagram) for diagram in diagrams or []]
+            if converted != diagrams:
+                bind.execute(
+                    learning_sessions.update()
+                    .where(learning_sessions.c.id == session_id)
+                    .values(svg_diagrams=converted)
+                )
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    store = Blobs(settings.BLOB_STORE_DIR)
+    try:
+        rewrite_diagrams(
+            lambda diagram: diagram if HASH_PATTERN.match(diagram) else store.put_text(diagram, 'image/svg+xml')
+        )
+    finally:
+        store.close()
+
+
+def downgrade():
+    store = Blobs(settings.BLOB_STORE_DIR)
+
+    def inline(diagram):
+        text = store.get_text(diagram) if HASH_PATTERN.match(diagram) else None
+        return diagram if text is None else text
+
+    try:
+        rewrite_diagrams(inline)
+    finally:
+        store.close()
@@ -0,0 +1,125 @@
+"""Store explanations, sources and quiz questions compressed
+
+The columns become binary (CompressedText / CompressedJSON) and every
+existing value is rewritten compressed (see app/database/compression.py).
+The value format is a frozen copy of that module's as of this revision:
+``MAGIC | codec | dictionary id (2 bytes) | payload``. Upgrades write zlib
+without a dictionary; ``python -m app.database.compression recompress``
+moves values to the current codec and dictionary afterwards.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+
+import os
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+COMPRESSED_COLUMNS = [
+    ('learning_sessions', 'id', ['explanation', 'sources']),
+    ('quizzes', 'id', ['questions']),
+]
+# column -> type before this revision
+PLAIN_TYPES = {
+    ('learning_sessions', 'explanation'): sa.Text(),
+    ('learning_sessions', 'sources'): sa.JSON(),
+    ('quizzes', 'questions'): sa.JSON(),
+}
+
+MAGIC = b'\x00C'
+HEADER_SIZE = len(MAGIC) + 3
+CODEC_RAW, CODEC_ZLIB, CODEC_ZSTD = b'r', b'z', b's'
+MIN_COMPRESS_BYTES = 64
+
+
+def compress(data):
+    if len(data) >= MIN_COMPRESS_BYTES:
+        compressor = zlib.compressobj(6)
+        payload = compressor.compress(data) + compressor.flush()
+        if len(payload) < len(data):
+            return MAGIC + CODEC_ZLIB + (0).to_bytes(2, 'big') + payload
+    return MAGIC + CODEC_RAW + (0).to_bytes(2, 'big') + data
+
+
+def decompress(value):
+    if not value.startswith(MAGIC):
+        return value
+    codec = value[2:3]
+    dictionary_id = int.from_bytes(value[3:5], 'big')
+    payload = value[HEADER_SIZE:]
+    if codec == CODEC_RAW:
+        return payload
+    dictionary = None
+    if dictionary_id:
+        with open(os.path.join(settings.COMPRESSION_DICTIONARY_DIR, f'zdict_{dictionary_id}.bin'), 'rb') as f:
+            dictionary = f.read()
+    if codec == CODEC_ZSTD:
+        import zstandard
+        dict_data = zstandard.ZstdCompressionDict(dictionary, dict_type=zstandard.DICT_TYPE_RAWCONTENT) \
+            if dictionary else None
+        return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(payload)
+    decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+    return decompressor.decompress(payload) + decompressor.flush()
+
+
+def rewrite_rows(bind, table, key, columns, compressed=True, batch_size=500):
+    rows_table = sa.table(table, sa.column(key), *[sa.column(name) for name in columns])
+    last_key = ''
+    while True:
+        rows = bind.execute(
+            sa.select(rows_table).where(rows_table.c[key] > last_key).order_by(rows_table.c[key]).limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        for row in rows:
+            values = {}
+            for name in columns:
+                value = row._mapping[name]
+                if value is None or (compressed and isinstance(value, bytes) and value.startswith(MAGIC)):
+                    continue
+                data = value.encode('utf-8') if isinstance(value, str) else decompress(bytes(value))
+                if compressed:
+                    values[name] = compress(data)
+                else:
+                    # SQLite keeps whatever storage class is written, so plain values go back as TEXT
+                    values[name] = data.decode('utf-8') if bind.dialect.name == 'sqlite' else data
+            if values:
+                bind.execute(rows_table.update().where(rows_table.c[key] == row._mapping[key]).values(**values))
+        last_key = rows[-1]._mapping[key]
+
+
+def alter_types(to_binary):
+    for table, _, columns in COMPRESSED_COLUMNS:
+        with op.batch_alter_table(table) as batch:
+            for name in columns:
+                plain = PLAIN_TYPES[(table, name)]
+                if to_binary:
+                    cast = f"{name}::text" if isinstance(plain, sa.JSON) else name
+                    batch.alter_column(name, existing_type=plain, type_=sa.LargeBinary(),
+                                       postgresql_using=f"convert_to({cast}, 'UTF8')")
+                else:
+                    cast = "::json" if isinstance(plain, sa.JSON) else ""
+                    batch.alter_column(name, existing_type=sa.LargeBinary(), type_=plain,
+                                       postgresql_using=f"convert_from({name}, 'UTF8'){cast}")
+
+
+def upgrade():
+    alter_types(to_binary=True)
+    for table, key, columns in COMPRESSED_COLUMNS:
+        rewrite_rows(op.get_bind(), table, key, columns)
+
+
+def downgrade():
+    for table, key, columns in COMPRESSED_COLUMNS:
+        rewrite_rows(op.get_bind(), table, key, columns, compressed=False)
+    alter_types(to_binary=False)
@@ -0,0 +1,73 @@
+"""One progress row per student and concept
+
+Duplicate rows (from concurrent quiz submissions) are merged into the
+oldest one: best mastery, summed attempts, latest review and update. The
+merged students' student_stats rows are dropped, so they are recomputed
+on next use. ix_progress_student_concept then becomes unique, which the
+quiz-submit upsert relies on.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+progress = sa.table(
+    'progress',
+    sa.column('id', sa.String()),
+    sa.column('student_id', sa.String()),
+    sa.column('concept_id', sa.String()),
+    sa.column('mastery_level', sa.Float()),
+    sa.column('attempts', sa.Integer()),
+    sa.column('last_reviewed', sa.DateTime()),
+    sa.column('updated_at', sa.DateTime()),
+)
+student_stats = sa.table('student_stats', sa.column('student_id', sa.String()))
+
+
+def highest(values):
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def merge_duplicates():
+    bind = op.get_bind()
+    duplicates = bind.execute(
+        sa.select(progress.c.student_id, progress.c.concept_id)
+        .where(progress.c.concept_id.isnot(None))
+        .group_by(progress.c.student_id, progress.c.concept_id)
+        .having(sa.func.count() > 1)
+    ).all()
+    for student_id, concept_id in duplicates:
+        rows = bind.execute(
+            sa.select(progress)
+            .where(progress.c.student_id == student_id, progress.c.concept_id == concept_id)
+            .order_by(progress.c.updated_at, progress.c.id)
+        ).all()
+        keep, extra = rows[0], rows[1:]
+        bind.execute(progress.update().where(progress.c.id == keep.id).values(
+            mastery_level=highest(row.mastery_level for row in rows),
+            attempts=sum(row.attempts or 0 for row in rows),
+            last_reviewed=highest(row.last_reviewed for row in rows),
+            updated_at=highest(row.updated_at for row in rows),
+        ))
+        bind.execute(progress.delete().where(progress.c.id.in_([row.id for row in extra])))
+        bind.execute(student_stats.delete().where(student_stats.c.student_id == student_id))
+
+
+def upgrade():
+    merge_duplicates()
+    op.drop_index('ix_progress_student_concept', table_name='progress')
+    op.create_index('ix_progress_student_concept', 'progress', ['student_id', 'concept_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_progress_student_concept', table_name='progress')
+    op.create_index('ix_progress_student_concept', 'progress', ['student_id', 'concept_id'])
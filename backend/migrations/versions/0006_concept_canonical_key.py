@@ -0,0 +1,147 @@
+"""Canonical keys for concepts
+
+Adds concepts.canonical_key behind a unique index. The oldest concept for
+each key gets it here. Later duplicates keep NULL (the index allows
+several) until ``python -m app.services.concept_catalog merge`` folds
+them into that concept, since that moves sessions and progress.
+
+The key function and its word lists are a frozen copy of
+app.services.concept_catalog.canonical_concept_key as of this revision, so
+later changes to the canonicalization do not change what this migration
+writes; ``merge --rekey`` brings old keys up to date.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+concepts = sa.table(
+    'concepts',
+    sa.column('id', sa.String()),
+    sa.column('name', sa.String()),
+    sa.column('canonical_key', sa.String()),
+    sa.column('created_at', sa.DateTime()),
+)
+
+# Frozen copy of the keyword_extractor word lists and lexicon topics
+STOPWORDS = {
+    'a', 'about', 'after', 'all', 'also', 'an', 'and', 'any', 'are', 'as', 'at', 'be', 'because', 'been',
+    'before', 'being', 'between', 'by', 'can', 'could', 'define', 'definition', 'describe', 'did',
+    'difference', 'do', 'does', 'during', 'each', 'easy', 'example', 'examples', 'explain', 'explanation',
+    'for', 'from', 'give', 'happen', 'happens', 'has', 'have', 'help', 'how', 'i', 'if', 'in', 'into', 'is',
+    'it', 'its', 'kid', 'kids', 'know', 'learn', 'like', 'me', 'mean', 'meaning', 'means', 'more', 'my', 'of',
+    'on', 'or', 'other', 'overview', 'please', 'really', 'simple', 'simply', 'so', 'some', 'student',
+    'students', 'teach', 'tell', 'terms', 'than', 'that', 'the', 'their', 'them', 'there', 'these', 'they',
+    'thing', 'things', 'this', 'those', 'through', 'to', 'understand', 'understanding', 'use', 'used', 'uses',
+    'using', 'vs', 'want', 'was', 'way', 'ways', 'we', 'were', 'what', 'whats', 'when', 'where', 'which',
+    'who', 'why', 'will', 'with', 'work', 'working', 'works', 'would', 'you', 'your'
+}
+LEADING_VERBS = {
+    'calculate', 'cause', 'caused', 'causes', 'compare', 'draw', 'find', 'list', 'make', 'show', 'solve',
+    'summarize', 'write'
+}
+TRAILING_VERBS = {
+    'begin', 'begins', 'change', 'changes', 'end', 'ended', 'form', 'formed', 'forms', 'grow', 'grows',
+    'happened', 'move', 'moves', 'occur', 'occurs', 'start', 'started', 'starts'
+}
+TOPICS = {
+    'acid', 'algebra', 'algorithm', 'artificial intelligence', 'atom', 'bacteria', 'black hole', 'cell',
+    'cellular respiration', 'chemical bond', 'chemical reaction', 'climate change', 'computer programming',
+    'democracy', 'derivative', 'digestive system', 'dna', 'earthquake', 'ecosystem', 'electricity', 'energy',
+    'equation', 'evolution', 'food chain', 'force', 'fraction', 'french revolution', 'friction', 'gene',
+    'gravity', 'greenhouse effect', 'heart', 'immune system', 'industrial revolution', 'internet', 'light',
+    'machine learning', 'magnetism', 'meiosis', 'mitochondria', 'mitosis', 'molecule', 'moon',
+    'natural selection', 'neural network', "newton's laws of motion", 'periodic table', 'ph',
+    'photosynthesis', 'pi', 'plate tectonics', 'prime number', 'probability', 'pythagorean theorem',
+    'quantum mechanics', 'relativity', 'renaissance', 'rock cycle', 'season', 'solar system', 'sound',
+    'speed of light', 'tide', 'velocity', 'virus', 'volcano', 'water cycle', 'weather', 'world war i',
+    'world war ii'
+}
+SYNONYMS = {
+    'global warming': 'climate change',
+    'ai': 'artificial intelligence',
+    'ml': 'machine learning',
+    'ww2': 'world war ii',
+    'wwii': 'world war ii',
+    'world war 2': 'world war ii',
+    'second world war': 'world war ii',
+    'ww1': 'world war i',
+    'wwi': 'world war i',
+    'world war 1': 'world war i',
+    'first world war': 'world war i',
+    'newtons laws': "newton's laws of motion",
+    "newton's laws": "newton's laws of motion",
+    'laws of motion': "newton's laws of motion",
+    'pythagoras theorem': 'pythagorean theorem',
+    'coding': 'computer programming',
+    'programming': 'computer programming',
+    'greenhouse gases': 'greenhouse effect',
+    'volcanoes': 'volcano',
+    'viruses': 'virus',
+}
+
+
+def singularize(word):
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+def phrase_topic(words):
+    ngram = ' '.join(words)
+    for form in (ngram, ' '.join(singularize(word) for word in words)):
+        form = SYNONYMS.get(form, form)
+        if form in TOPICS:
+            return form
+    return None
+
+
+def canonical_concept_key(name):
+    normalized = re.sub(r'\s+', ' ', name).strip().strip('?!.').strip().lower()
+    tokens = (token.strip("'") for token in re.findall(r"[a-z0-9']+", normalized))
+    words = [token for token in tokens if token and token not in STOPWORDS]
+    while words and words[0] in LEADING_VERBS:
+        words = words[1:]
+    while len(words) > 1 and words[-1] in TRAILING_VERBS:
+        words = words[:-1]
+    topic = phrase_topic(normalized.split()) or (phrase_topic(words) if words else None)
+    if topic:
+        return topic
+    return ' '.join(singularize(word) for word in words) if words else normalized
+
+
+def assign_keys():
+    bind = op.get_bind()
+    seen = set()
+    rows = bind.execute(
+        sa.select(concepts.c.id, concepts.c.name).order_by(concepts.c.created_at, concepts.c.id)
+    ).all()
+    for concept_id, name in rows:
+        key = canonical_concept_key(name)
+        if key not in seen:
+            seen.add(key)
+            bind.execute(concepts.update().where(concepts.c.id == concept_id).values(canonical_key=key))
+
+
+def upgrade():
+    op.add_column('concepts', sa.Column('canonical_key', sa.String()))
+    assign_keys()
+    op.create_index('ix_concepts_canonical_key', 'concepts', ['canonical_key'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_concepts_canonical_key', table_name='concepts')
+    with op.batch_alter_table('concepts') as batch:
+        batch.drop_column('canonical_key')
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Checks for the single-transaction explain write path and the batched activity writer (temporary SQLite file).
+
+Usage: python test_activity_writer.py
+"""
+
+import asyncio
+import tempfile
+from datetime import datetime
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event, select
+
+from app.api.explain import save_learning_session
+from app.models.models import Concept, Student, StudentStats
+from app.services.activity_writer import ActivityWriter
+from test_async_database import make_sessionmaker
+
+
+def count_statements(engine):
+    counts = {"commits": 0, "updates": 0, "selects": 0}
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def on_commit(connection):
+        counts["commits"] += 1
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def on_execute(connection, cursor, statement, parameters, context, executemany):
+        for kind in ("update", "select"):
+            if statement.lstrip().lower().startswith(kind):
+                counts[kind + "s"] += 1
+
+    return counts
+
+
+def test_explain_write_path_commits_once():
+    with tempfile.TemporaryDirectory() as directory:
+        engine, Session = make_sessionmaker(directory)
+        result = {"explanation": "Plants turn light into sugar.", "sources": []}
+
+        async def run():
+            counts = count_statements(engine)
+            async with Session() as db:
+                session = await save_learning_session(db, "student-1", "photosynthesis", result)
+            # Concept, session and the new stats row land together in one commit
+            assert counts["commits"] == 1
+
+            counts.update(commits=0, selects=0)
+            async with Session() as db:
+                await save_learning_session(db, "student-1", "What is photosynthesis?", result)
+            # Concept probe, stats row, its row lock and the recent topics; nothing is refreshed after the commit
+            assert counts["commits"] == 1 and counts["selects"] == 4
+            async with Session() as db:
+                concept = await db.get(Concept, session.concept_id)
+                stats = await db.get(StudentStats, "student-1")
+                assert concept.name == "photosynthesis" and stats.total_sessions == 2
+            await engine.dispose()
+
+        asyncio.run(run())
+
+
+def test_activity_writer_batches_touches():
+    with tempfile.TemporaryDirectory() as directory:
+        engine, Session = make_sessionmaker(directory)
+
+        async def run():
+            async with Session() as db:
+                for name in ("ada", "grace", "alan"):
+                    db.add(Student(id=name, username=name, email=f"{name}@example.com"))
+                await db.commit()
+
+            counts = count_statements(engine)
+            writer = ActivityWriter(Session, interval_ms=20)
+            writer.touch("ada", datetime(2026, 1, 1, 9))
+            writer.touch("ada", datetime(2026, 1, 1, 8))  # older touches never win
+            writer.touch("grace", datetime(2026, 1, 1, 10))
+            await asyncio.sleep(0.1)
+
+            assert counts == {"commits": 1, "updates": 1, "selects": 0}
+            assert writer.stats()["rows_written"] == 2 and writer.stats()["pending"] == 0
+
+            # Anything still pending is written on shutdown
+            writer.touch("alan", datetime(2026, 1, 1, 11))
+            await writer.close()
+            async with Session() as db:
+                rows = dict((await db.execute(select(Student.id, Student.last_active))).all())
+            assert rows == {
+                "ada": datetime(2026, 1, 1, 9),
+                "grace": datetime(2026, 1, 1, 10),
+                "alan": datetime(2026, 1, 1, 11)
+            }
+            await engine.dispose()
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_explain_write_path_commits_once()
+    test_activity_writer_batches_touches()
+    print("✅ Activity writer checks passed")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Checks for the async database layer behind the API endpoints (temporary SQLite file).
+
+Usage: python test_async_database.py
+"""
+
+import asyncio
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import async_database_url, get_db, upsert_insert
+from app.models.models import Base, Concept, LearningSession, Student
+from app.api.auth import create_access_token
+from app.api.explain import save_learning_session
+from app.main import app
+
+
+def make_sessionmaker(directory: str):
+    engine = create_async_engine(async_database_url(f"sqlite:///{directory}/test.db"))
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    return engine, sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert async_database_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert async_database_url("postgres://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert async_database_url("postgresql+asyncpg://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+
+
+def test_upsert_insert_rejects_other_dialects():
+    assert hasattr(upsert_insert("sqlite", Concept.__table__), "on_conflict_do_nothing")
+    try:
+        upsert_insert("mysql", Concept.__table__)
+        assert False, "mysql upsert accepted"
+    except ValueError as e:
+        assert "mysql" in str(e) and "postgresql, sqlite" in str(e)
+
+
+def test_save_learning_session_reuses_concept():
+    with tempfile.TemporaryDirectory() as directory:
+        engine, Session = make_sessionmaker(directory)
+        result = {"explanation": "Plants turn light into sugar.", "sources": []}
+
+        async def run():
+            async with Session() as db:
+                first = await save_learning_session(db, "student-1", "photosynthesis", result)
+                second = await save_learning_session(db, "student-2", "photosynthesis", result)
+                assert first.concept_id == second.concept_id
+                assert first.explanation == result["explanation"]
+            async with Session() as db:
+                assert await db.get(LearningSession, second.id) is not None
+                assert await db.get(Concept, first.concept_id) is not None
+            await engine.dispose()
+
+        asyncio.run(run())
+
+
+def test_endpoints_use_async_session():
+    with tempfile.TemporaryDirectory() as directory:
+        engine, Session = make_sessionmaker(directory)
+
+        async def override_get_db():
+            async with Session() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            async def add_student():
+                async with Session() as db:
+                    db.add(Student(id="student-1", username="ada", email="ada@example.com", grade_level=8))
+                    await db.commit()
+
+            asyncio.run(add_student())
+            client = TestClient(app)
+            headers = {"Authorization": f"Bearer {create_access_token({'sub': 'ada'})}"}
+
+            me = client.get("/api/auth/me", headers=headers).json()
+            assert me["id"] == "student-1" and me["username"] == "ada"
+            assert client.get("/api/progress/", headers=headers).json() == {"concepts": [], "next_cursor": None}
+            stats = client.get("/api/progress/stats", headers=headers).json()
+            assert stats["total_sessions"] == 0 and stats["recent_topics"] == []
+            assert client.get("/api/quiz/missing", headers=headers).status_code == 404
+            assert client.get("/api/recommendations/missing", headers=headers).status_code == 404
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            asyncio.run(engine.dispose())
+
+
+if __name__ == "__main__":
+    test_async_database_url()
+    test_upsert_insert_rejects_other_dialects()
+    test_save_learning_session_reuses_concept()
+    test_endpoints_use_async_session()
+    print("✅ Async database checks passed")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Checks for the content-addressed flashcard store and its endpoint (temporary directories).
+
+Usage: python test_blob_store.py
+"""
+
+import hashlib
+import json
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import sqlalchemy as sa
+from alembic import command
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.database.migrations import alembic_config, upgrade_database
+from app.services.blob_store import BlobStore, get_blob_store
+from app.main import app
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="400" height="300">' + "<rect/>" * 200 + "</svg>"
+
+
+def test_put_dedups_and_compresses():
+    with tempfile.TemporaryDirectory() as directory:
+        store = BlobStore(directory)
+        first = store.put_text(SVG, "image/svg+xml")
+        second = store.put_text(SVG, "image/svg+xml")
+        assert first == second == hashlib.sha256(SVG.encode()).hexdigest()
+        assert os.path.exists(store.path(first))
+
+        data, content_type = store.get(first)
+        assert data.decode() == SVG and content_type == "image/svg+xml"
+        assert store.get("0" * 64) is None
+        assert store.get("../blobs.db") is None
+
+        stats = store.stats()
+        assert stats["blobs"] == 1 and stats["dedup_hits"] == 1
+        assert stats["stored_bytes"] < stats["size_bytes"]
+        store.close()
+
+        # Rows remember their codec, so reopening with another default still reads them
+        reopened = BlobStore(directory, codec="zlib")
+        assert reopened.get(first)[0].decode() == SVG
+        reopened.close()
+
+
+def test_flashcard_endpoint_serves_immutable_blobs():
+    with tempfile.TemporaryDirectory() as directory:
+        store = BlobStore(directory)
+        digest = store.put_text(SVG, "image/svg+xml")
+        app.dependency_overrides[get_blob_store] = lambda: store
+        try:
+            client = TestClient(app)
+            response = client.get(f"/api/flashcards/{digest}")
+            assert response.status_code == 200 and response.text == SVG
+            assert response.headers["content-type"].startswith("image/svg+xml")
+            assert "immutable" in response.headers["cache-control"]
+            assert response.headers["etag"] == f'"{digest}"'
+
+            cached = client.get(f"/api/flashcards/{digest}", headers={"If-None-Match": f'"{digest}"'})
+            assert cached.status_code == 304 and not cached.content
+            assert client.get(f"/api/flashcards/{'f' * 64}").status_code == 404
+            assert client.get("/api/flashcards/not-a-hash").status_code == 404
+        finally:
+            app.dependency_overrides.pop(get_blob_store, None)
+            store.close()
+
+
+def test_migration_moves_inline_svgs_into_store():
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/app.db"
+        previous_dir, settings.BLOB_STORE_DIR = settings.BLOB_STORE_DIR, f"{directory}/blobs"
+        try:
+            upgrade_database(url, "0002")
+            engine = sa.create_engine(url)
+            engine.execute(
+                sa.text("INSERT INTO learning_sessions (id, svg_diagrams) VALUES ('ls1', :svg), ('ls2', '[]')"),
+                svg=json.dumps([SVG])
+            )
+            upgrade_database(url)
+
+            stored = engine.execute(sa.text("SELECT svg_diagrams FROM learning_sessions WHERE id = 'ls1'")).scalar()
+            digest = hashlib.sha256(SVG.encode()).hexdigest()
+            assert stored == f'["{digest}"]'
+            store = BlobStore(settings.BLOB_STORE_DIR)
+            assert store.get(digest)[0].decode() == SVG
+            store.close()
+
+            # Downgrading puts the SVG text back inline
+            command.downgrade(alembic_config(url), "0002")
+            stored = engine.execute(sa.text("SELECT svg_diagrams FROM learning_sessions WHERE id = 'ls1'")).scalar()
+            assert json.loads(stored) == [SVG]
+        finally:
+            settings.BLOB_STORE_DIR = previous_dir
+
+
+if __name__ == "__main__":
+    test_put_dedups_and_compresses()
+    test_flashcard_endpoint_serves_immutable_blobs()
+    test_migration_moves_inline_svgs_into_store()
+    print("✅ Blob store checks passed")
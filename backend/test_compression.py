@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Checks for the compressed column types and their migration (temporary directories).
+
+Usage: python test_compression.py
+"""
+
+import json
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import sqlalchemy as sa
+from alembic import command
+
+from app.database import compression
+from app.database.compression import (
+    CODEC_ZLIB, CompressedJSON, CompressedText, Dictionaries, compress, decompress, train_dictionary
+)
+from app.database.migrations import alembic_config, upgrade_database
+
+EXPLANATION = (
+    "Photosynthesis is the process by which green plants use sunlight to turn carbon dioxide "
+    "and water into glucose and oxygen. It happens in the chloroplasts of plant cells. "
+) * 8
+SOURCES = [{"title": "Photosynthesis", "url": "https://example.org/photosynthesis"}] * 5
+
+
+def test_round_trip_and_legacy_values():
+    text, document = CompressedText(), CompressedJSON()
+    stored = text.process_bind_param(EXPLANATION, None)
+    assert stored.startswith(compression.MAGIC) and len(stored) < len(EXPLANATION)
+    assert text.process_result_value(stored, None) == EXPLANATION
+    assert document.process_result_value(document.process_bind_param(SOURCES, None), None) == SOURCES
+
+    # Short values are stored raw, legacy text and bytes are read unchanged
+    assert decompress(compress(b"short")) == b"short"
+    assert text.process_result_value("plain", None) == "plain"
+    assert text.process_result_value(b"plain", None) == "plain"
+    assert document.process_result_value('["a"]', None) == ["a"]
+    assert text.process_bind_param(None, None) is None
+
+
+def test_dictionary_improves_small_values():
+    samples = [EXPLANATION.replace("green plants", f"plant {i}") for i in range(10)]
+    previous = compression.dictionaries
+    with tempfile.TemporaryDirectory() as directory:
+        compression.dictionaries = Dictionaries(directory)
+        try:
+            value = samples[0][:300].encode("utf-8")
+            without = compress(value, CODEC_ZLIB)
+            dictionary_id = compression.dictionaries.add(train_dictionary(samples))
+            with_dictionary = compress(value, CODEC_ZLIB)
+
+            assert dictionary_id == 1 and with_dictionary[3:5] == (1).to_bytes(2, "big")
+            assert len(with_dictionary) < len(without)
+            # Values keep naming the dictionary they were written with
+            assert decompress(without) == decompress(with_dictionary) == value
+        finally:
+            compression.dictionaries = previous
+
+
+def test_migration_compresses_existing_rows():
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/app.db"
+        upgrade_database(url, "0003")
+        engine = sa.create_engine(url)
+        engine.execute(
+            sa.text("INSERT INTO learning_sessions (id, explanation, sources) VALUES ('ls1', :explanation, :sources)"),
+            explanation=EXPLANATION, sources=json.dumps(SOURCES)
+        )
+        upgrade_database(url)
+
+        stored = engine.execute(sa.text("SELECT explanation FROM learning_sessions")).scalar()
+        assert isinstance(stored, bytes) and len(stored) < len(EXPLANATION)
+        table = sa.table("learning_sessions", sa.column("explanation", CompressedText()),
+                         sa.column("sources", CompressedJSON()))
+        assert engine.execute(sa.select(table)).one() == (EXPLANATION, SOURCES)
+
+        command.downgrade(alembic_config(url), "0003")
+        assert engine.execute(sa.text("SELECT explanation FROM learning_sessions")).scalar() == EXPLANATION
+
+
+if __name__ == "__main__":
+    test_round_trip_and_legacy_values()
+    test_dictionary_improves_small_values()
+    test_migration_compresses_existing_rows()
+    print("✅ Compression checks passed")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Checks for concept canonicalization, lookup and the offline merge job (temporary SQLite files).
+
+Usage: python test_concept_catalog.py
+"""
+
+import asyncio
+import subprocess
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import sqlalchemy as sa
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import use_sqlite_wal
+from app.database.migrations import upgrade_database
+from app.models.models import Concept
+from app.services.concept_catalog import canonical_concept_key, find_or_create_concept, merge_duplicates
+from test_async_database import make_sessionmaker
+
+
+def test_canonical_concept_key():
+    for query in ("Photosynthesis", "photosynthesis ", "What is photosynthesis?", "explain photosynthesis please"):
+        assert canonical_concept_key(query) == "photosynthesis"
+    assert canonical_concept_key("How do black holes form?") == canonical_concept_key("black hole") == "black hole"
+    assert canonical_concept_key("Tell me about WW2") == "world war ii"
+    assert canonical_concept_key("laws of motion") == canonical_concept_key("Newton's laws")
+    assert canonical_concept_key("chapter 3") != canonical_concept_key("chapter 4")
+    assert canonical_concept_key("What is it?") == "what is it"
+
+
+def test_catalog_does_not_import_the_explanation_stack():
+    check = (
+        "import sys; import app.services.concept_catalog; "
+        "assert 'app.services.explanation_service' not in sys.modules and 'httpx' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", check], cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+
+
+def test_concurrent_variants_share_one_concept():
+    with tempfile.TemporaryDirectory() as directory:
+        engine, Session = make_sessionmaker(directory)
+        use_sqlite_wal(engine.sync_engine)
+        queries = ["Photosynthesis", "photosynthesis ", "What is photosynthesis?", "Gravity", "what is gravity"] * 6
+
+        async def run():
+            async def lookup(query):
+                async with Session() as db:
+                    concept_id = await find_or_create_concept(db, query, "")
+                    await db.commit()
+                    return concept_id
+
+            ids = await asyncio.gather(*(lookup(query) for query in queries))
+            async with Session() as db:
+                keys = (await db.scalars(sa.select(Concept.canonical_key))).all()
+            await engine.dispose()
+            return ids, keys
+
+        ids, keys = asyncio.run(run())
+        assert sorted(keys) == ["gravity", "photosynthesis"]
+        by_key = {}
+        for query, concept_id in zip(queries, ids):
+            by_key.setdefault(canonical_concept_key(query), set()).add(concept_id)
+        assert all(len(concept_ids) == 1 for concept_ids in by_key.values())
+
+
+def test_migration_and_merge_fold_duplicates():
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/app.db"
+        upgrade_database(url, "0005")
+        engine = sa.create_engine(url)
+        engine.execute(sa.text(
+            "INSERT INTO concepts (id, name, created_at) VALUES "
+            "('c1', 'Photosynthesis', '2026-01-01 00:00:00.000000'), "
+            "('c2', 'what is photosynthesis?', '2026-01-02 00:00:00.000000'), "
+            "('c3', 'gravity', '2026-01-03 00:00:00.000000')"
+        ))
+        engine.execute(sa.text(
+            "INSERT INTO learning_sessions (id, student_id, concept_id) VALUES ('ls1', 's1', 'c2'), ('ls2', 's2', 'c2')"
+        ))
+        engine.execute(sa.text(
+            "INSERT INTO progress (id, student_id, concept_id, mastery_level, attempts) VALUES "
+            "('p1', 's1', 'c1', 60, 1), ('p2', 's1', 'c2', 90, 2), ('p3', 's2', 'c2', 40, 1)"
+        ))
+        engine.execute(sa.text(
+            "INSERT INTO student_stats (student_id, total_concepts, mastered_concepts, total_sessions) "
+            "VALUES ('s1', 2, 1, 1), ('s2', 1, 0, 1)"
+        ))
+        upgrade_database(url)
+
+        # The oldest concept of each key is keyed by the migration; the duplicate waits for the merge job
+        keys = dict(engine.execute(sa.text("SELECT id, canonical_key FROM concepts")).all())
+        assert keys == {"c1": "photosynthesis", "c2": None, "c3": "gravity"}
+
+        db = sessionmaker(bind=engine, autoflush=False)()
+        try:
+            assert merge_duplicates(db) == 1
+            assert merge_duplicates(db) == 0
+        finally:
+            db.close()
+
+        assert [row[0] for row in engine.execute(sa.text("SELECT id FROM concepts ORDER BY id"))] == ["c1", "c3"]
+        assert {row[0] for row in engine.execute(sa.text("SELECT concept_id FROM learning_sessions"))} == {"c1"}
+        progress = engine.execute(sa.text(
+            "SELECT student_id, concept_id, mastery_level, attempts FROM progress ORDER BY student_id"
+        )).all()
+        assert [tuple(row) for row in progress] == [("s1", "c1", 90, 3), ("s2", "c1", 40, 1)]
+        # Both students' totals changed, so their rollup rows are recomputed on next use
+        assert engine.execute(sa.text("SELECT count(*) FROM student_stats")).scalar() == 0
+
+
+if __name__ == "__main__":
+    test_canonical_concept_key()
+    test_catalog_does_not_import_the_explanation_stack()
+    test_concurrent_variants_share_one_concept()
+    test_migration_and_merge_fold_duplicates()
+    print("✅ Concept catalog checks passed")
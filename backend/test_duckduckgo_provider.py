@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Checks for the DuckDuckGo provider's thread pool, metrics and domain filter (no network needed).
+
+Usage: python test_duckduckgo_provider.py
+"""
+
+import asyncio
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.duckduckgo_provider import DuckDuckGoProvider, is_educational_host
+
+
+class SlowSession:
+    """Stands in for a DDGS session with a blocking text search."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def text(self, query, **kwargs):
+        time.sleep(self.delay)
+        return [
+            {"href": "https://shop.example.com/gravity", "title": "Buy gravity", "body": "Great deals"},
+            {"href": "https://www.khanacademy.org/gravity", "title": "Gravity", "body": "Gravity pulls masses together."}
+        ]
+
+
+def test_educational_hosts_match_by_suffix():
+    assert is_educational_host("https://www.khanacademy.org/science")
+    assert is_educational_host("https://physics.mit.edu/a")
+    assert is_educational_host("https://en.wikipedia.org/wiki/Gravity")
+    assert not is_educational_host("https://example.com/khanacademy.org")
+    assert not is_educational_host("https://notnature.com/")
+
+
+def test_slow_searches_queue_on_their_own_pool():
+    provider = DuckDuckGoProvider(max_workers=1)
+    provider._session = lambda: SlowSession(0.2)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        searches = asyncio.gather(*(provider.search(f"gravity {i}") for i in range(3)))
+        await asyncio.sleep(0.05)
+        # Work on the default executor is not stuck behind DuckDuckGo
+        started = time.perf_counter()
+        await loop.run_in_executor(None, lambda: None)
+        other_wait = time.perf_counter() - started
+        return await searches, other_wait
+
+    results, other_wait = asyncio.run(run())
+    assert other_wait < 0.1
+    assert all(result[0]["url"] == "https://www.khanacademy.org/gravity" for result in results)
+    stats = provider.stats()
+    # One worker, so at least two searches were waiting at once
+    assert stats["completed"] == 3 and stats["max_queue_depth"] >= 2
+    assert stats["queued"] == 0 and stats["in_flight"] == 0
+    provider.close()
+
+
+def test_cancelled_queued_searches_leave_the_queue():
+    provider = DuckDuckGoProvider(max_workers=1)
+    provider._session = lambda: SlowSession(0.2)
+
+    async def run():
+        running = asyncio.ensure_future(provider.search("gravity"))
+        queued = [asyncio.ensure_future(provider.search(f"gravity {i}")) for i in range(3)]
+        await asyncio.sleep(0.05)
+        assert provider.stats()["queued"] == 3
+        # As when another source branch wins or the deadline passes
+        for task in queued:
+            task.cancel()
+        await asyncio.gather(*queued, return_exceptions=True)
+        return await running
+
+    result = asyncio.run(run())
+    assert result[0]["url"] == "https://www.khanacademy.org/gravity"
+    stats = provider.stats()
+    assert stats["queued"] == 0 and stats["in_flight"] == 0 and stats["completed"] == 1
+    provider.close()
+
+
+if __name__ == "__main__":
+    test_educational_hosts_match_by_suffix()
+    test_slow_searches_queue_on_their_own_pool()
+    test_cancelled_queued_searches_leave_the_queue()
+    print("✅ DuckDuckGo provider checks passed")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Checks for the server-sent events of /api/explain/stream with a stubbed LLM stream (temporary SQLite file).
+
+Usage: python test_explain_stream.py
+"""
+
+import asyncio
+import json
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.database.database import get_db
+from app.models.models import LearningSession, Student
+from app.api.auth import create_access_token
+from app.api.dependencies import get_explanation_service, get_svg_generator
+from app.services.blob_store import close_blob_store
+from app.services.explanation_service import ExplanationService
+from app.services.negative_cache import NegativeCache
+from app.main import app
+from test_async_database import make_sessionmaker
+
+TOKENS = ["Plants ", "turn light ", "into sugar."]
+SVG = '<svg xmlns="http://www.w3.org/2000/svg"><text>photosynthesis</text></svg>'
+
+
+class StreamingLLM:
+    """Stands in for the LLM registry: a model handle and a chunked text stream."""
+
+    available = True
+
+    def get_model(self, model_name=None):
+        return object()
+
+    async def stream_text(self, prompt, **kwargs):
+        for token in TOKENS:
+            await asyncio.sleep(0)
+            yield token
+
+
+class StubSVGGenerator:
+    def __init__(self, error=None):
+        self.error = error
+
+    async def generate_svg_flashcard(self, topic, explanation):
+        if self.error:
+            raise self.error
+        return SVG
+
+
+def make_service(directory, search_error=None):
+    negative_cache = NegativeCache(os.path.join(directory, "negative.db"), ttl_seconds=60, timeout_ttl_seconds=60)
+    service = ExplanationService(llm=StreamingLLM(), negative_cache=negative_cache)
+    service.vector_index = None
+    service.local_wikipedia = None
+
+    async def search_sources(keywords):
+        if search_error:
+            raise search_error
+        return []
+
+    service.search_sources = search_sources
+    return service
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def stream(client, method, service, svg_generator):
+    app.dependency_overrides[get_explanation_service] = lambda: service
+    app.dependency_overrides[get_svg_generator] = lambda: svg_generator
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'ada'})}"}
+    if method == "GET":
+        response = client.get("/api/explain/stream", params={"query": "What is photosynthesis?"}, headers=headers)
+    else:
+        response = client.post("/api/explain/stream", json={"query": "What is photosynthesis?"}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    return parse_events(response.text)
+
+
+def test_stream_events():
+    with tempfile.TemporaryDirectory() as directory:
+        engine, Session = make_sessionmaker(directory)
+        previous_dir, settings.BLOB_STORE_DIR = settings.BLOB_STORE_DIR, f"{directory}/blobs"
+        close_blob_store()
+
+        async def seed():
+            async with Session() as db:
+                db.add(Student(id="student-1", username="ada", email="ada@example.com"))
+                await db.commit()
+
+        async def saved_sessions():
+            async with Session() as db:
+                return dict((await db.execute(select(LearningSession.id, LearningSession.query))).all())
+
+        async def override_get_db():
+            async with Session() as db:
+                yield db
+
+        asyncio.run(seed())
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            client = TestClient(app)
+            for method in ("GET", "POST"):
+                events = stream(client, method, make_service(directory), StubSVGGenerator())
+                names = [name for name, _ in events]
+                assert names == ["keywords", "sources", "token", "token", "token", "explanation", "flashcard", "done"]
+                data = dict(events)
+                assert "photosynthesis" in data["keywords"]["keywords"]
+                assert data["sources"]["sources"] == []
+                assert [payload["text"] for name, payload in events if name == "token"] == TOKENS
+                assert data["explanation"]["explanation"] == "".join(TOKENS)
+                assert data["flashcard"] == {"svg_flashcard": SVG}
+                assert asyncio.run(saved_sessions())[data["done"]["session_id"]] == "What is photosynthesis?"
+
+            # A failing stage ends the stream with an error event
+            failing = make_service(directory, search_error=RuntimeError("search down"))
+            events = stream(client, "POST", failing, StubSVGGenerator())
+            assert [name for name, _ in events] == ["keywords", "error"]
+            assert events[-1][1] == {"detail": "Error generating explanation: search down"}
+
+            events = stream(client, "GET", make_service(directory), StubSVGGenerator(error=RuntimeError("no model")))
+            assert [name for name, _ in events][-3:] == ["token", "explanation", "error"]
+            assert "no model" in events[-1][1]["detail"]
+        finally:
+            for dependency in (get_db, get_explanation_service, get_svg_generator):
+                app.dependency_overrides.pop(dependency, None)
+            close_blob_store()
+            settings.BLOB_STORE_DIR = previous_dir
+            asyncio.run(engine.dispose())
+
+
+if __name__ == "__main__":
+    test_stream_events()
+    print("✅ Explain stream checks passed")
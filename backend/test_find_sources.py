@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Checks for the concurrent provider branches of ExplanationService.find_sources (no network needed).
+
+Usage: python test_find_sources.py
+"""
+
+import asyncio
+import tempfile
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+from app.services import explanation_service
+from app.services.explanation_service import ExplanationService
+from app.services.negative_cache import NegativeCache
+
+
+class FakeProvider:
+    """Answers after a per-keyword delay and records which calls were cancelled."""
+
+    def __init__(self, delays, found=()):
+        self.delays = delays
+        self.found = set(found)
+        self.calls = []
+        self.cancelled = []
+
+    def sources(self, keyword):
+        if keyword not in self.found:
+            return []
+        return [{"title": keyword.title(), "url": f"https://example.org/{keyword}", "content": f"About {keyword}."}]
+
+    async def search(self, keyword):
+        self.calls.append(keyword)
+        try:
+            await asyncio.sleep(self.delays.get(keyword, 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(keyword)
+            raise
+        return self.sources(keyword)
+
+    async def search_many(self, keywords):
+        results = {}
+        for keyword in keywords:
+            results[keyword] = await self.search(keyword)
+        return results
+
+
+def make_service(directory, wikipedia, duckduckgo):
+    service = ExplanationService(negative_cache=NegativeCache(
+        os.path.join(directory, "negative.db"), ttl_seconds=60, timeout_ttl_seconds=60
+    ))
+    service.vector_index = None
+    service.local_wikipedia = None
+    service.wikipedia.search_many = wikipedia.search_many
+    service.wikipedia.search = wikipedia.search
+    service.query_duckduckgo = duckduckgo.search
+    return service
+
+
+def run_find_sources(service, keywords):
+    previous = explanation_service.DDGS_AVAILABLE
+    explanation_service.DDGS_AVAILABLE = True
+    try:
+        return asyncio.run(service.find_sources(keywords))
+    finally:
+        explanation_service.DDGS_AVAILABLE = previous
+
+
+def test_slower_wikipedia_still_outranks_duckduckgo():
+    with tempfile.TemporaryDirectory() as directory:
+        wikipedia = FakeProvider({"gravity": 0.15}, found=["gravity"])
+        duckduckgo = FakeProvider({"gravity": 0.01, "mass": 0.01}, found=["gravity", "mass"])
+        service = make_service(directory, wikipedia, duckduckgo)
+
+        sources = run_find_sources(service, ["gravity", "mass"])
+        assert sources[0]["url"] == "https://example.org/gravity"
+        retrieval = service.last_retrieval
+        assert retrieval["provider"] == "wikipedia" and retrieval["branch"] == 0
+        # The DuckDuckGo branches had already finished, so nothing was left to cancel
+        assert retrieval["cancelled_branches"] == 0 and duckduckgo.cancelled == []
+        service.negative_cache.close()
+
+
+def test_duckduckgo_branches_win_in_keyword_order():
+    with tempfile.TemporaryDirectory() as directory:
+        wikipedia = FakeProvider({})
+        duckduckgo = FakeProvider({"gravity": 0.1, "mass": 0.01, "weight": 5}, found=["gravity", "mass", "weight"])
+        service = make_service(directory, wikipedia, duckduckgo)
+
+        started = time.perf_counter()
+        sources = run_find_sources(service, ["gravity", "mass", "weight"])
+        elapsed = time.perf_counter() - started
+
+        # "mass" answers first but waits behind "gravity"; "weight" is cancelled, not awaited
+        assert [source["title"] for source in sources] == ["Gravity"]
+        retrieval = service.last_retrieval
+        assert retrieval["provider"] == "duckduckgo" and retrieval["keyword"] == "gravity"
+        assert retrieval["branch"] == 1 and retrieval["cancelled_branches"] == 1
+        assert duckduckgo.cancelled == ["weight"] and elapsed < 1
+        # Wikipedia tried the batch, then full-text search on the first keyword
+        assert wikipedia.calls == ["gravity", "mass", "weight", "gravity"]
+        service.negative_cache.close()
+
+
+def test_deadlines_bound_slow_providers():
+    with tempfile.TemporaryDirectory() as directory:
+        wikipedia = FakeProvider({"gravity": 5}, found=["gravity"])
+        duckduckgo = FakeProvider({"gravity": 5}, found=["gravity"])
+        service = make_service(directory, wikipedia, duckduckgo)
+        previous = settings.WIKIPEDIA_DEADLINE_SECONDS, settings.DUCKDUCKGO_DEADLINE_SECONDS
+        settings.WIKIPEDIA_DEADLINE_SECONDS = settings.DUCKDUCKGO_DEADLINE_SECONDS = 0.05
+        try:
+            started = time.perf_counter()
+            sources = run_find_sources(service, ["gravity"])
+            elapsed = time.perf_counter() - started
+        finally:
+            settings.WIKIPEDIA_DEADLINE_SECONDS, settings.DUCKDUCKGO_DEADLINE_SECONDS = previous
+
+        assert sources == [] and service.last_retrieval is None and elapsed < 1
+        assert wikipedia.cancelled == duckduckgo.cancelled == ["gravity"]
+        # The DuckDuckGo timeout is remembered; the Wikipedia batch branch never records timeouts
+        assert service.negative_cache.is_dead("duckduckgo", "gravity")
+        assert not service.negative_cache.is_dead("wikipedia", "gravity")
+        service.negative_cache.close()
+
+
+if __name__ == "__main__":
+    test_slower_wikipedia_still_outranks_duckduckgo()
+    test_duckduckgo_branches_win_in_keyword_order()
+    test_deadlines_bound_slow_providers()
+    print("✅ Find sources checks passed")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Checks for the shared outbound HTTP client (no network needed).
+
+Usage: python test_http_client.py
+"""
+
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.services import http_client
+from app.services.http_client import (
+    HostStats, close_http_client, get_http_client, http_client_stats, http_limits, init_http_client
+)
+
+
+def respond(request):
+    if request.url.path == "/moved":
+        return httpx.Response(302, headers={"Location": "/wiki/Gravity"})
+    status = 503 if request.url.host == "flaky.example.org" else 200
+    return httpx.Response(status, json={"user_agent": request.headers["user-agent"]})
+
+
+def test_requests_use_shared_settings_and_count_hosts():
+    http_client._stats = HostStats()
+
+    async def run():
+        # Another test may have left the shared client open on the real transport
+        await close_http_client()
+        client = init_http_client(transport=httpx.MockTransport(respond))
+        try:
+            assert get_http_client() is client and init_http_client() is client
+            assert client.timeout == httpx.Timeout(
+                settings.HTTP_READ_TIMEOUT_SECONDS,
+                connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+                pool=settings.HTTP_POOL_TIMEOUT_SECONDS
+            )
+
+            response = await client.get("https://en.wikipedia.org/moved")
+            assert response.status_code == 200 and str(response.url) == "https://en.wikipedia.org/wiki/Gravity"
+            assert response.json() == {"user_agent": settings.HTTP_USER_AGENT}
+            assert (await client.get("https://flaky.example.org/search")).status_code == 503
+            return http_client_stats()
+        finally:
+            await close_http_client()
+
+    stats = asyncio.run(run())
+    assert stats["open"] is True
+    # The redirect is a second request to the same host
+    assert stats["hosts"] == {
+        "en.wikipedia.org": {"requests": 2, "server_errors": 0},
+        "flaky.example.org": {"requests": 1, "server_errors": 1}
+    }
+    assert stats["limits"] == {
+        "max_connections": settings.HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        "keepalive_expiry": settings.HTTP_KEEPALIVE_EXPIRY_SECONDS
+    }
+    assert http_client_stats() == {"open": False, "hosts": {}}
+
+
+def test_limits_follow_settings():
+    previous = settings.HTTP_MAX_CONNECTIONS
+    settings.HTTP_MAX_CONNECTIONS = 7
+    try:
+        assert http_limits().max_connections == 7
+    finally:
+        settings.HTTP_MAX_CONNECTIONS = previous
+    assert http_limits().max_keepalive_connections == settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+
+
+def test_lifespan_opens_and_closes_the_client():
+    from app.main import app
+
+    previous = settings.DATABASE_MIGRATE_ON_STARTUP
+    settings.DATABASE_MIGRATE_ON_STARTUP = False
+    try:
+        with TestClient(app) as client:
+            shared = app.state.http_client
+            assert get_http_client() is shared and not shared.is_closed
+            assert client.get("/metrics").json()["http"]["open"] is True
+        assert shared.is_closed
+        assert http_client_stats() == {"open": False, "hosts": {}}
+    finally:
+        settings.DATABASE_MIGRATE_ON_STARTUP = previous
+
+
+if __name__ == "__main__":
+    test_requests_use_shared_settings_and_count_hosts()
+    test_limits_follow_settings()
+    test_lifespan_opens_and_closes_the_client()
+    print("✅ HTTP client checks passed")
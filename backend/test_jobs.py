@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Checks for the background JobManager and the flashcard job endpoints (temporary SQLite file).
+
+Usage: python test_jobs.py
+"""
+
+import asyncio
+import tempfile
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from app.database.database import get_db
+from app.models.models import Student
+from app.api.auth import create_access_token
+from app.services.jobs import JobManager, get_job_manager
+from app.main import app
+from test_async_database import make_sessionmaker
+
+
+class GatedWork:
+    """Job body that runs until its gate opens, tracking how many run at once."""
+
+    def __init__(self, result=None, error=None):
+        self.gate = asyncio.Event()
+        self.result = result
+        self.error = error
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await self.gate.wait()
+        finally:
+            self.running -= 1
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def test_job_lifecycle():
+    async def run():
+        jobs = JobManager(max_workers=2)
+        work, failing = GatedWork(result={"svg": "<svg/>"}), GatedWork(error=RuntimeError("model unavailable"))
+        job = jobs.submit("flashcard", work, owner_id="student-1")
+        failed = jobs.submit("flashcard", failing)
+        assert job.status == "pending" and jobs.get(job.id) is job
+        await asyncio.sleep(0)
+        assert job.status == failed.status == "running" and not job.finished
+
+        work.gate.set()
+        failing.gate.set()
+        assert await job.wait(1) and await failed.wait(1)
+        assert job.status == "completed" and job.result == {"svg": "<svg/>"} and job.error is None
+        assert failed.status == "failed" and failed.error == "model unavailable" and failed.result is None
+        assert job.finished_at >= job.created_at
+        assert jobs.stats() == {"submitted": 2, "completed": 1, "failed": 1, "running": 0, "pending": 0, "retained": 2}
+
+    asyncio.run(run())
+
+
+def test_max_workers_bounds_running_jobs():
+    async def run():
+        jobs = JobManager(max_workers=2)
+        work = GatedWork(result="done")
+        submitted = [jobs.submit("flashcard", work) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        stats = jobs.stats()
+        assert work.running == 2 and stats["running"] == 2 and stats["pending"] == 3
+
+        work.gate.set()
+        assert all([await job.wait(1) for job in submitted])
+        assert work.peak == 2 and jobs.stats()["completed"] == 5
+
+    asyncio.run(run())
+
+
+def test_finished_jobs_are_pruned_after_retention():
+    async def run():
+        jobs = JobManager(max_workers=2, retention_seconds=0.05)
+        finished, unfinished = GatedWork(result="done"), GatedWork()
+        old = jobs.submit("flashcard", finished)
+        slow = jobs.submit("flashcard", unfinished)
+        finished.gate.set()
+        await old.wait(1)
+        assert jobs.get(old.id) is old
+
+        await asyncio.sleep(0.1)
+        # Pruning happens on submit; jobs still running are never dropped
+        newer = jobs.submit("flashcard", GatedWork())
+        assert jobs.get(old.id) is None and jobs.get(slow.id) is slow and jobs.get(newer.id) is newer
+        assert jobs.stats()["retained"] == 2
+        await jobs.shutdown()
+
+    asyncio.run(run())
+
+
+def test_flashcard_job_endpoints():
+    with tempfile.TemporaryDirectory() as directory:
+        engine, Session = make_sessionmaker(directory)
+        jobs = JobManager(max_workers=2)
+
+        async def override_get_db():
+            async with Session() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_job_manager] = lambda: jobs
+
+        async def run():
+            async with Session() as db:
+                db.add(Student(id="student-1", username="ada", email="ada@example.com"))
+                db.add(Student(id="student-2", username="bob", email="bob@example.com"))
+                await db.commit()
+            ada = {"Authorization": f"Bearer {create_access_token({'sub': 'ada'})}"}
+            bob = {"Authorization": f"Bearer {create_access_token({'sub': 'bob'})}"}
+
+            work = GatedWork(result={"flashcard_url": "/api/flashcards/abc"})
+            failing = GatedWork(error=RuntimeError("model unavailable"))
+            job = jobs.submit("flashcard", work, owner_id="student-1")
+            failed = jobs.submit("flashcard", failing, owner_id="student-1")
+            url = f"/api/explain/flashcard/{job.id}"
+
+            async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+                assert (await client.get(url, headers=ada)).json()["status"] in ("pending", "running")
+                # Other students and unknown ids get a 404
+                assert (await client.get(url, headers=bob)).status_code == 404
+                assert (await client.get("/api/explain/flashcard/missing", headers=ada)).status_code == 404
+
+                # A long-poll that times out returns the job as it is
+                started = time.perf_counter()
+                body = (await client.get(url, params={"wait": 0.05}, headers=ada)).json()
+                assert body["status"] == "running" and time.perf_counter() - started >= 0.05
+
+                # A long-poll returns as soon as the job finishes
+                poll = asyncio.ensure_future(client.get(url, params={"wait": 5}, headers=ada))
+                await asyncio.sleep(0.05)
+                assert not poll.done()
+                started = time.perf_counter()
+                work.gate.set()
+                body = (await poll).json()
+                assert time.perf_counter() - started < 1
+                assert body["status"] == "completed" and body["result"] == {"flashcard_url": "/api/flashcards/abc"}
+
+                events = await client.get(f"{url}/events", headers=ada)
+                assert events.headers["content-type"].startswith("text/event-stream")
+                assert events.text.startswith("event: flashcard\n")
+
+                failing.gate.set()
+                events = await client.get(f"/api/explain/flashcard/{failed.id}/events", headers=ada)
+                assert events.text.startswith("event: error\n") and "model unavailable" in events.text
+            await engine.dispose()
+
+        try:
+            asyncio.run(run())
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_job_manager, None)
+
+
+if __name__ == "__main__":
+    test_job_lifecycle()
+    test_max_workers_bounds_running_jobs()
+    test_finished_jobs_are_pruned_after_retention()
+    test_flashcard_job_endpoints()
+    print("✅ Job checks passed")
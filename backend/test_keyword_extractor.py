@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Checks for the local keyword extractor and the LLM fallback in extract_keywords (no API key needed).
+
+Usage: python test_keyword_extractor.py
+"""
+
+import asyncio
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.keyword_extractor import keyword_extractor
+from app.services.explanation_service import ExplanationService
+
+
+class FakeLLM:
+    """Stands in for LLMClientRegistry and counts keyword calls."""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+
+    def get_model(self, name=None):
+        return object()
+
+    async def generate_text(self, prompt, **kwargs):
+        self.calls += 1
+        return self.answer
+
+
+def test_common_questions_are_confident():
+    cases = {
+        "What is gravity?": "gravity",
+        "How do black holes form?": "black hole",
+        "Why did WW2 start?": "World War II",
+        "What causes global warming?": "climate change",
+        "What is a quasar?": "quasar"
+    }
+    for query, topic in cases.items():
+        result = keyword_extractor.extract(query)
+        assert result.keywords[0] == query
+        assert result.keywords[1] == topic, (query, result.keywords)
+        assert result.confidence >= 0.6
+        assert len(result.keywords) <= 5
+
+
+def test_extraction_is_fast():
+    started = time.perf_counter()
+    for _ in range(1000):
+        keyword_extractor.extract("How does photosynthesis work in plants?")
+    assert (time.perf_counter() - started) / 1000 < 0.001
+
+
+def test_llm_only_for_low_confidence_queries():
+    llm = FakeLLM("vaccine, immune system, antibody")
+    service = ExplanationService(llm=llm)
+
+    keywords = asyncio.run(service.extract_keywords("What is gravity?"))
+    assert keywords[1] == "gravity" and llm.calls == 0
+
+    query = "how do vaccines train the immune system to fight new viruses"
+    keywords = asyncio.run(service.extract_keywords(query))
+    assert llm.calls == 1
+    assert keywords == [query, "vaccine", "immune system", "antibody"]
+
+
+if __name__ == "__main__":
+    test_common_questions_are_confident()
+    test_extraction_is_fast()
+    test_llm_only_for_low_confidence_queries()
+    print("✅ Keyword extractor checks passed")
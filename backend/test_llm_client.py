@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Checks for the shared LLM client registry (no API key or network needed).
+
+Usage: python test_llm_client.py
+"""
+
+import asyncio
+import tempfile
+import threading
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.llm_client import LLMClientRegistry, LLMTimeoutError
+from app.services.llm_cache import LLMResponseCache
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class SlowModel:
+    """Stands in for genai.GenerativeModel with a blocking generate_content."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def generate_content(self, prompt, **kwargs):
+        time.sleep(self.delay)
+        return FakeResponse(f"answer to {prompt}")
+
+
+def make_registry(delay, max_concurrency=4, timeout_seconds=5, cache=None):
+    registry = LLMClientRegistry(model_settings={
+        "fake": {"max_concurrency": max_concurrency, "timeout_seconds": timeout_seconds}
+    }, default_model="fake", cache=cache)
+    registry._configured = True
+    registry._models["fake"] = SlowModel(delay)
+    return registry
+
+
+def test_calls_overlap():
+    registry = make_registry(delay=0.2)
+
+    async def run():
+        started = time.perf_counter()
+        results = await asyncio.gather(*(registry.generate_text(f"q{i}") for i in range(4)))
+        return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(run())
+    assert results == [f"answer to q{i}" for i in range(4)]
+    # Four 0.2s calls run side by side instead of taking 0.8s in series
+    assert elapsed < 0.6, f"calls did not overlap ({elapsed:.2f}s)"
+    assert registry.stats()["models"]["fake"]["completed"] == 4
+    registry.close()
+
+
+def test_concurrency_limit_queues_callers():
+    registry = make_registry(delay=0.1, max_concurrency=2)
+
+    async def run():
+        return await asyncio.gather(*(registry.generate_text(f"q{i}") for i in range(6)))
+
+    asyncio.run(run())
+    stats = registry.stats()["models"]["fake"]
+    assert stats["max_queue_depth"] >= 4
+    assert stats["in_flight"] == 0 and stats["queued"] == 0
+    registry.close()
+
+
+def test_timeout():
+    registry = make_registry(delay=0.5, timeout_seconds=0.1)
+
+    async def run():
+        try:
+            await registry.generate_text("slow")
+        except LLMTimeoutError:
+            return True
+        return False
+
+    assert asyncio.run(run())
+    assert registry.stats()["models"]["fake"]["timeouts"] == 1
+    registry.close()
+
+
+def test_cache_serves_repeated_prompts():
+    cache = LLMResponseCache(max_memory_bytes=1024 * 1024)
+    registry = make_registry(delay=0.2, cache=cache)
+
+    async def run():
+        first = await registry.generate_text("photosynthesis")
+        started = time.perf_counter()
+        second = await registry.generate_text("photosynthesis")
+        return first, second, time.perf_counter() - started
+
+    first, second, elapsed = asyncio.run(run())
+    assert first == second
+    assert elapsed < 0.05
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["memory_hits"] == 1
+    assert registry.stats()["models"]["fake"]["completed"] == 1
+    registry.close()
+
+
+def test_cache_lru_byte_budget_and_disk_tier():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "llm_cache.db")
+        cache = LLMResponseCache(max_memory_bytes=10, db_path=path)
+        cache.set(cache.make_key("m", "a"), "12345")
+        cache.set(cache.make_key("m", "b"), "67890")
+        cache.set(cache.make_key("m", "c"), "abcde")  # pushes "a" out of memory
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["memory_bytes"] <= 10
+
+        assert cache.get(cache.make_key("m", "a")) == "12345"
+        assert cache.stats()["disk_hits"] == 1
+        cache.close()
+
+        # Entries survive a restart but respect the TTL
+        reopened = LLMResponseCache(max_memory_bytes=10, db_path=path, ttl_seconds=-1)
+        reopened.set(cache.make_key("m", "d"), "stale")
+        reopened._memory.clear()
+        assert reopened.get(cache.make_key("m", "d")) is None
+        assert reopened.stats()["expired"] == 1
+        reopened.close()
+
+
+class ThreadRecordingConnection:
+    """Wraps the cache's sqlite connection and records which threads use it."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.threads = set()
+
+    def execute(self, *args):
+        self.threads.add(threading.current_thread())
+        return self.connection.execute(*args)
+
+    def commit(self):
+        self.threads.add(threading.current_thread())
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+def test_disk_tier_stays_off_the_event_loop():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = LLMResponseCache(max_memory_bytes=1024 * 1024, db_path=os.path.join(directory, "llm_cache.db"))
+        registry = make_registry(delay=0.01, cache=cache)
+        connection = cache._db = ThreadRecordingConnection(cache._db)
+
+        async def run():
+            loop_thread = threading.current_thread()
+            first = await registry.generate_text("photosynthesis")
+            # Memory hits are answered inline, without touching SQLite
+            connection.threads.clear()
+            assert await registry.generate_text("photosynthesis") == first
+            assert connection.threads == set()
+
+            cache._memory.clear()
+            assert await registry.generate_text("photosynthesis") == first
+            return loop_thread
+
+        loop_thread = asyncio.run(run())
+        assert connection.threads and loop_thread not in connection.threads
+        stats = cache.stats()
+        assert stats["misses"] == 1 and stats["memory_hits"] == 1 and stats["disk_hits"] == 1
+        registry.close()
+
+
+if __name__ == "__main__":
+    test_calls_overlap()
+    test_concurrency_limit_queues_callers()
+    test_timeout()
+    test_cache_serves_repeated_prompts()
+    test_cache_lru_byte_budget_and_disk_tier()
+    test_disk_tier_stays_off_the_event_loop()
+    print("✅ LLM client checks passed")
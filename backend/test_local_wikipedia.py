@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Checks for the offline Wikipedia FTS5 index and its use in search_sources (no network needed).
+
+Usage: python test_local_wikipedia.py
+"""
+
+import asyncio
+import json
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.local_wikipedia import LocalWikipediaIndex, LocalWikipediaProvider, main
+from app.services.explanation_service import ExplanationService
+
+ABSTRACTS = [
+    {"title": "Photosynthesis", "abstract": "Photosynthesis is a process used by plants to convert light energy into chemical energy."},
+    {"title": "Chlorophyll", "abstract": "Chlorophyll is a green pigment that absorbs light for photosynthesis in plants."},
+    {"title": "Gravity", "abstract": "Gravity is a fundamental interaction which causes mutual attraction between things with mass."}
+]
+
+
+def build_index(directory):
+    source = os.path.join(directory, "abstracts.jsonl")
+    with open(source, "w") as f:
+        f.write("\n".join(json.dumps(record) for record in ABSTRACTS))
+    path = os.path.join(directory, "index.db")
+    main(["--index", path, "ingest", source])
+    return LocalWikipediaIndex(path)
+
+
+def test_bm25_prefers_title_matches():
+    with tempfile.TemporaryDirectory() as directory:
+        index = build_index(directory)
+        assert index.count() == 3
+        rows = index.search("How does photosynthesis work?", limit=5)
+        assert [row["title"] for row in rows] == ["Photosynthesis", "Chlorophyll"]
+        assert index.search("quantum entanglement") == []
+        index.close()
+
+
+def test_search_sources_uses_local_index_first():
+    with tempfile.TemporaryDirectory() as directory:
+        index = build_index(directory)
+        service = ExplanationService(local_wikipedia=LocalWikipediaProvider(index))
+
+        sources = asyncio.run(service.search_sources(["what is gravity", "gravity"]))
+        assert sources[0]["title"] == "Gravity"
+        assert sources[0]["url"] == "https://en.wikipedia.org/wiki/Gravity"
+        assert service.last_retrieval["provider"] == "local_wikipedia"
+        assert service.last_retrieval["keyword"] == "what is gravity"
+        index.close()
+
+
+if __name__ == "__main__":
+    test_bm25_prefers_title_matches()
+    test_search_sources_uses_local_index_first()
+    print("✅ Local Wikipedia index checks passed")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Checks for the Alembic migrations and the query plan benchmark (temporary SQLite files).
+
+Usage: python test_migrations.py
+"""
+
+import contextlib
+import io
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import sqlalchemy as sa
+from alembic import command
+
+from app.database.migrations import alembic_config, upgrade_database
+from app.database import benchmark
+
+HOT_PATH_INDEXES = {
+    "ix_progress_student_concept",
+    "ix_learning_sessions_student_started",
+    "ix_learning_sessions_student_concept",
+    "ix_quizzes_session_id",
+    "ix_concepts_name",
+    "ix_concepts_subject",
+}
+
+
+def index_names(url: str) -> set:
+    inspector = sa.inspect(sa.create_engine(url))
+    return {index["name"] for table in inspector.get_table_names() for index in inspector.get_indexes(table)}
+
+
+def test_upgrade_creates_schema_and_indexes():
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/app.db"
+        upgrade_database(url)
+        tables = set(sa.inspect(sa.create_engine(url)).get_table_names())
+        assert {"students", "concepts", "learning_sessions", "quizzes", "progress"} <= tables
+        assert HOT_PATH_INDEXES <= index_names(url)
+
+        command.downgrade(alembic_config(url), "base")
+        assert sa.inspect(sa.create_engine(url)).get_table_names() == ["alembic_version"]
+
+
+def test_upgrade_adopts_database_created_without_migrations():
+    from app.models.models import Base
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/app.db"
+        engine = sa.create_engine(url)
+        # What create_all built before migrations existed: the original tables, no indexes
+        legacy_tables = [Base.metadata.tables[name] for name in
+                         ("students", "concepts", "learning_sessions", "quizzes", "progress")]
+        Base.metadata.create_all(bind=engine, tables=legacy_tables)
+        for table in legacy_tables:
+            for index in table.indexes:
+                index.drop(bind=engine)
+        # Added by a later revision
+        engine.execute("ALTER TABLE concepts DROP COLUMN canonical_key")
+        engine.execute("INSERT INTO concepts (id, name) VALUES ('c1', 'gravity')")
+
+        upgrade_database(url)
+        assert HOT_PATH_INDEXES <= index_names(url)
+        assert engine.execute("SELECT name FROM concepts").scalar() == "gravity"
+
+
+def test_benchmark_uses_indexes_after_migration():
+    output = io.StringIO()
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(output):
+        benchmark.main(["--path", f"{directory}/bench.db", "--sessions", "2000", "--students", "50",
+                        "--concepts", "20", "--repeat", "2", "--keep"])
+        # Recreated indexes keep their uniqueness
+        inspector = sa.inspect(sa.create_engine(f"sqlite:///{directory}/bench.db"))
+        unique = {index["name"] for table in inspector.get_table_names()
+                  for index in inspector.get_indexes(table) if index["unique"]}
+        assert {"ix_progress_student_concept", "ix_concepts_canonical_key"} <= unique
+    before, after = output.getvalue().split("=== after")
+    assert "SCAN learning_sessions" in before
+    assert "USING INDEX ix_progress_student_concept" in after
+    assert "USING INDEX ix_quizzes_session_id" in after
+
+
+if __name__ == "__main__":
+    test_upgrade_creates_schema_and_indexes()
+    test_upgrade_adopts_database_created_without_migrations()
+    test_benchmark_uses_indexes_after_migration()
+    print("✅ Migration checks passed")
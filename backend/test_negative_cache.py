@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Checks for the negative cache of empty provider lookups (no network needed).
+
+Usage: python test_negative_cache.py
+"""
+
+import asyncio
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.negative_cache import NegativeCache
+from app.services.explanation_service import ExplanationService
+
+
+class CountingSearch:
+    def __init__(self, results=None, error=None):
+        self.results = results or []
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self, keyword):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.results if isinstance(keyword, str) else {k: self.results for k in keyword}
+
+
+def test_misses_persist_and_expire():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "negative.db")
+        cache = NegativeCache(path, ttl_seconds=60, timeout_ttl_seconds=-1)
+        cache.record("wikipedia", "Flurbo  Theory")
+        cache.record("duckduckgo", "slow topic", reason="timeout")
+        cache.close()
+
+        reopened = NegativeCache(path, ttl_seconds=60, timeout_ttl_seconds=-1)
+        assert reopened.is_dead("wikipedia", "flurbo theory")
+        assert not reopened.is_dead("duckduckgo", "slow topic")  # timeout entry already expired
+        assert not reopened.is_dead("duckduckgo", "flurbo theory")
+        stats = reopened.stats()
+        assert stats["hits"] == 1 and stats["lookups"] == 3
+        reopened.close()
+
+
+def test_dead_keywords_skip_the_network():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = NegativeCache(os.path.join(directory, "negative.db"), ttl_seconds=60, timeout_ttl_seconds=60)
+        service = ExplanationService(negative_cache=cache)
+        service.vector_index = None
+        service.local_wikipedia = None
+        batch = service.wikipedia.search_many = CountingSearch()
+        wikipedia = service.wikipedia.search = CountingSearch()
+        duckduckgo = service.query_duckduckgo = CountingSearch(error=RuntimeError("rate limited"))
+
+        for _ in range(3):
+            assert asyncio.run(service.search_sources(["flurbo theory"])) == []
+
+        assert batch.calls == 1 and wikipedia.calls == 1
+        # Errors are not remembered as misses
+        assert duckduckgo.calls == 3
+        cache.close()
+
+
+if __name__ == "__main__":
+    test_misses_persist_and_expire()
+    test_dead_keywords_skip_the_network()
+    print("✅ Negative cache checks passed")
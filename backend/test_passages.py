@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Checks for passage chunking and BM25 packing of source text (no network needed).
+
+Usage: python test_passages.py
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.passages import chunk_text, estimate_tokens, pack_sources, score_passages
+
+ARTICLE = (
+    "The Moon is Earth's only natural satellite. It orbits at an average distance of 384,400 km. "
+    "The Moon was visited by twelve astronauts during the Apollo program.\n\n"
+    "Tides on Earth are mostly caused by the gravity of the Moon pulling on the oceans. "
+    "High tides occur on the side of Earth facing the Moon and on the opposite side. "
+    "The Moon's surface is covered in craters formed by impacts."
+)
+
+
+def test_chunk_text_splits_paragraphs_and_sentences():
+    chunks = chunk_text(ARTICLE, max_chars=120)
+    assert all(len(chunk) <= 120 for chunk in chunks)
+    assert any(chunk.startswith("Tides on Earth") for chunk in chunks)
+
+
+def test_bm25_ranks_relevant_passage_first():
+    passages = chunk_text(ARTICLE, max_chars=120)
+    scores = score_passages("what causes ocean tides", passages)
+    assert passages[int(scores.argmax())].startswith("Tides on Earth")
+
+
+def test_pack_sources_keeps_relevant_text_within_budget():
+    sources = [{"title": "Moon", "url": "u", "snippet": ARTICLE[:300], "content": ARTICLE, "source_type": "wikipedia"}]
+    packed = pack_sources("what causes ocean tides", sources, token_budget=40, passage_chars=120)
+    assert "content" not in packed[0]
+    assert "gravity of the Moon" in packed[0]["snippet"]
+    assert "Apollo" not in packed[0]["snippet"]
+    assert estimate_tokens(packed[0]["snippet"]) <= 45
+
+
+if __name__ == "__main__":
+    test_chunk_text_splits_paragraphs_and_sentences()
+    test_bm25_ranks_relevant_passage_first()
+    test_pack_sources_keeps_relevant_text_within_budget()
+    print("✅ Passage packing checks passed")
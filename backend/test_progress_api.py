@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Checks for the paginated progress listing (temporary SQLite file).
+
+Usage: python test_progress_api.py
+"""
+
+import asyncio
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database.database import get_db
+from app.models.models import Student, Concept, Progress
+from app.api.auth import create_access_token
+from app.main import app
+from test_async_database import make_sessionmaker
+
+# (concept id, subject, mastery); two ties at 80 and one concept never scored
+PROGRESS = [
+    ("c1", "biology", 95.0), ("c2", "physics", 80.0), ("c3", "biology", 80.0),
+    ("c4", "physics", 60.0), ("c5", "biology", 40.0), ("c6", "history", None),
+    ("c7", "physics", 99.0),
+]
+
+
+def seed(Session):
+    async def run():
+        async with Session() as db:
+            db.add(Student(id="student-1", username="ada", email="ada@example.com", grade_level=8))
+            db.add(Student(id="student-2", username="bob", email="bob@example.com", grade_level=8))
+            for i, (concept_id, subject, mastery) in enumerate(PROGRESS):
+                db.add(Concept(id=concept_id, name=f"concept {concept_id}", subject=subject))
+                db.add(Progress(id=f"p{i}", student_id="student-1", concept_id=concept_id,
+                                mastery_level=mastery, attempts=1))
+            db.add(Progress(id="other", student_id="student-2", concept_id="c1", mastery_level=10.0, attempts=1))
+            await db.commit()
+
+    asyncio.run(run())
+
+
+def test_progress_pages_by_mastery_with_keyset_cursor():
+    with tempfile.TemporaryDirectory() as directory:
+        engine, Session = make_sessionmaker(directory)
+        seed(Session)
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        async def override_get_db():
+            async with Session() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            client = TestClient(app)
+            headers = {"Authorization": f"Bearer {create_access_token({'sub': 'ada'})}"}
+
+            seen, cursor = [], None
+            while True:
+                params = {"limit": 3, **({"after": cursor} if cursor else {})}
+                statements.clear()
+                page = client.get("/api/progress/", params=params, headers=headers).json()
+                # The current user lookup plus one joined query, however many concepts
+                assert len(statements) == 2
+                seen.extend(page["concepts"])
+                cursor = page["next_cursor"]
+                if not cursor:
+                    break
+
+            masteries = [item["mastery"] for item in seen]
+            assert masteries == sorted(masteries, reverse=True)
+            assert masteries[0] == 99.0 and masteries[-1] == 0.0
+            assert sorted(item["concept_id"] for item in seen) == sorted(c for c, _, _ in PROGRESS)
+            assert seen[0]["name"] == "concept c7" and seen[0]["subject"] == "physics"
+
+            physics = client.get("/api/progress/", params={"subject": "physics"}, headers=headers).json()
+            assert [item["concept_id"] for item in physics["concepts"]] == ["c7", "c2", "c4"]
+            assert physics["next_cursor"] is None
+
+            assert client.get("/api/progress/", params={"after": "not-a-cursor"}, headers=headers).status_code == 400
+            assert client.get("/api/progress/", params={"limit": 0}, headers=headers).status_code == 422
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            asyncio.run(engine.dispose())
+
+
+if __name__ == "__main__":
+    test_progress_pages_by_mastery_with_keyset_cursor()
+    print("✅ Progress API checks passed")
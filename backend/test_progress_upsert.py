@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Stress checks for the atomic progress upsert behind quiz submissions (temporary SQLite files).
+
+Usage: python test_progress_upsert.py
+"""
+
+import asyncio
+import random
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import sqlalchemy as sa
+from sqlalchemy import select
+
+from app.api.explain import save_learning_session
+from app.api.quiz import record_quiz_result
+from app.database.database import use_sqlite_wal
+from app.database.migrations import upgrade_database
+from app.models.models import Progress, Student, StudentStats
+from app.services.student_stats import MASTERY_THRESHOLD
+from test_async_database import make_sessionmaker
+
+SUBMISSIONS = 300
+CONCURRENCY = 30
+
+
+def test_concurrent_submissions_keep_every_attempt():
+    with tempfile.TemporaryDirectory() as directory:
+        engine, Session = make_sessionmaker(directory)
+        use_sqlite_wal(engine.sync_engine)
+        scores = random.Random(24)
+        # Three concepts; the third is never mastered
+        submissions = [(f"concept-{i % 3}", scores.uniform(0, 100 if i % 3 < 2 else 80)) for i in range(SUBMISSIONS)]
+
+        async def run():
+            async with Session() as db:
+                db.add(Student(id="student-1", username="ada", email="ada@example.com"))
+                await db.commit()
+            async with Session() as db:
+                for concept_id, _ in submissions[:3]:
+                    await save_learning_session(db, "student-1", concept_id, {"explanation": "x", "sources": []})
+
+            concept_ids = {}
+            async with Session() as db:
+                for row in (await db.execute(sa.text("SELECT id, name FROM concepts"))).all():
+                    concept_ids[row.name] = row.id
+
+            limit = asyncio.Semaphore(CONCURRENCY)
+
+            async def submit(concept_name, score):
+                async with limit, Session() as db:
+                    await record_quiz_result(db, "student-1", concept_ids[concept_name], score)
+                    await db.commit()
+
+            await asyncio.gather(*(submit(name, score) for name, score in submissions))
+
+            async with Session() as db:
+                rows = (await db.scalars(select(Progress))).all()
+                stats = await db.get(StudentStats, "student-1")
+            await engine.dispose()
+            return concept_ids, rows, stats
+
+        concept_ids, rows, stats = asyncio.run(run())
+        # One row per concept with every attempt counted and the best score kept
+        by_concept = {row.concept_id: row for row in rows}
+        assert len(rows) == len(by_concept) == 3
+        for name, concept_id in concept_ids.items():
+            scores = [score for concept, score in submissions if concept == name]
+            assert by_concept[concept_id].attempts == len(scores)
+            assert by_concept[concept_id].mastery_level == max(scores)
+        assert stats.total_concepts == 3
+        assert stats.mastered_concepts == sum(row.mastery_level >= MASTERY_THRESHOLD for row in rows) == 2
+
+
+def test_migration_merges_duplicate_progress():
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/app.db"
+        upgrade_database(url, "0004")
+        engine = sa.create_engine(url)
+        engine.execute(sa.text(
+            "INSERT INTO progress (id, student_id, concept_id, mastery_level, attempts, updated_at) VALUES "
+            "('p1', 's1', 'c1', 60, 2, '2026-01-01 00:00:00.000000'), ('p2', 's1', 'c1', 90, 1, '2026-01-02 00:00:00.000000'), "
+            "('p3', 's1', 'c2', 50, 1, '2026-01-01 00:00:00.000000')"
+        ))
+        engine.execute(sa.text(
+            "INSERT INTO student_stats (student_id, total_concepts, mastered_concepts, total_sessions) "
+            "VALUES ('s1', 3, 1, 0)"
+        ))
+        upgrade_database(url)
+
+        rows = engine.execute(sa.text("SELECT id, mastery_level, attempts FROM progress ORDER BY id")).all()
+        assert [tuple(row) for row in rows] == [("p1", 90, 3), ("p3", 50, 1)]
+        # Inflated totals are dropped and recomputed on next use
+        assert engine.execute(sa.text("SELECT count(*) FROM student_stats")).scalar() == 0
+        try:
+            engine.execute(sa.text("INSERT INTO progress (id, student_id, concept_id) VALUES ('p4', 's1', 'c2')"))
+            assert False, "duplicate progress row accepted"
+        except sa.exc.IntegrityError:
+            pass
+
+
+if __name__ == "__main__":
+    test_concurrent_submissions_keep_every_attempt()
+    test_migration_merges_duplicate_progress()
+    print("✅ Progress upsert checks passed")
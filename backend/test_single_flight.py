@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Checks for SingleFlight request coalescing (no network needed).
+
+Usage: python test_single_flight.py
+"""
+
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.single_flight import SingleFlight
+
+
+class SlowWork:
+    def __init__(self, result="answer", error=None, delay=0.05):
+        self.result = result
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {"value": self.result}
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight("test")
+    work = SlowWork()
+
+    async def run():
+        callers = asyncio.gather(*(flight.do("gravity", work) for _ in range(10)))
+        await asyncio.sleep(0.01)
+        assert flight.stats()["in_flight"] == 1
+        return await callers
+
+    results = asyncio.run(run())
+    assert work.calls == 1
+    # Every waiter gets the very same result object
+    assert all(result is results[0] for result in results) and results[0] == {"value": "answer"}
+    assert flight.stats() == {"executions": 1, "coalesced": 9, "in_flight": 0}
+
+
+def test_exception_reaches_every_waiter():
+    flight = SingleFlight("test")
+    work = SlowWork(error=ValueError("provider down"))
+
+    async def run():
+        return await asyncio.gather(*(flight.do("gravity", work) for _ in range(5)), return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert work.calls == 1
+    assert all(isinstance(error, ValueError) and str(error) == "provider down" for error in errors)
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_key_is_forgotten_after_completion():
+    flight = SingleFlight("test")
+    work = SlowWork(delay=0)
+
+    async def run():
+        first = await flight.do("gravity", work)
+        assert flight.stats()["in_flight"] == 0
+        second = await flight.do("gravity", work)
+        # Different keys never share an execution
+        other = await asyncio.gather(flight.do("atom", work), flight.do("cell", work))
+        return first, second, other
+
+    first, second, _ = asyncio.run(run())
+    assert work.calls == 4 and first is not second
+    assert flight.stats() == {"executions": 4, "coalesced": 0, "in_flight": 0}
+
+
+def test_cancelled_waiter_does_not_cancel_the_others():
+    flight = SingleFlight("test")
+    work = SlowWork(delay=0.1)
+
+    async def run():
+        leaving = asyncio.ensure_future(flight.do("gravity", work))
+        staying = asyncio.ensure_future(flight.do("gravity", work))
+        await asyncio.sleep(0.02)
+        # The first caller disconnects, even though it started the work
+        leaving.cancel()
+        result = await staying
+        try:
+            await leaving
+            assert False, "cancelled waiter returned a result"
+        except asyncio.CancelledError:
+            pass
+        return result
+
+    assert asyncio.run(run()) == {"value": "answer"}
+    assert work.calls == 1 and flight.stats()["in_flight"] == 0
+
+
+if __name__ == "__main__":
+    test_concurrent_callers_share_one_execution()
+    test_exception_reaches_every_waiter()
+    test_key_is_forgotten_after_completion()
+    test_cancelled_waiter_does_not_cancel_the_others()
+    print("✅ Single flight checks passed")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Checks for the student_stats rollup behind /api/progress/stats (temporary SQLite file).
+
+Usage: python test_student_stats.py
+"""
+
+import asyncio
+import tempfile
+import sys
+import os
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import get_db, use_sqlite_wal
+from app.models.models import Student, Concept, LearningSession, Progress, Quiz, StudentStats
+from app.api.auth import create_access_token
+from app.api.dependencies import get_quiz_service
+from app.api.explain import save_learning_session
+from app.services import student_stats
+from app.main import app
+from test_async_database import make_sessionmaker
+
+
+class FixedScoreQuizService:
+    def __init__(self, score):
+        self.score = score
+
+    def evaluate_quiz(self, questions, answers):
+        return {"score": self.score, "feedback": "", "mastery_achieved": self.score >= 85,
+                "correct_answers": 0, "total_questions": len(answers)}
+
+
+def seed(Session):
+    async def run():
+        async with Session() as db:
+            db.add(Student(id="student-1", username="ada", email="ada@example.com", grade_level=8))
+            db.add(Concept(id="c1", name="gravity"))
+            db.add(Concept(id="c2", name="photosynthesis"))
+            started = datetime(2026, 1, 1)
+            for i in range(6):
+                db.add(LearningSession(id=f"ls{i}", student_id="student-1", concept_id="c1",
+                                       query=f"question {i}", explanation="", started_at=started + timedelta(hours=i)))
+            db.add(Progress(id="p1", student_id="student-1", concept_id="c1", mastery_level=90.0, attempts=2))
+            db.add(Quiz(id="q1", session_id="ls0", questions={"questions": []}))
+            await db.commit()
+
+    asyncio.run(run())
+
+
+def test_stats_backfill_incremental_updates_and_rebuild():
+    with tempfile.TemporaryDirectory() as directory:
+        engine, Session = make_sessionmaker(directory)
+        seed(Session)
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        async def override_get_db():
+            async with Session() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_quiz_service] = lambda: FixedScoreQuizService(88.0)
+        try:
+            client = TestClient(app)
+            headers = {"Authorization": f"Bearer {create_access_token({'sub': 'ada'})}"}
+
+            # No stats row yet: computed from the tables and stored
+            stats = client.get("/api/progress/stats", headers=headers).json()
+            assert stats["total_concepts_studied"] == 1 and stats["concepts_mastered"] == 1
+            assert stats["total_sessions"] == 6
+            assert [topic["session_id"] for topic in stats["recent_topics"]] == ["ls5", "ls4", "ls3", "ls2", "ls1"]
+
+            statements.clear()
+            client.get("/api/progress/stats", headers=headers)
+            assert len(statements) == 2  # the current user and the stats row
+
+            async def explain_and_quiz():
+                async with Session() as db:
+                    session = await save_learning_session(
+                        db, "student-1", "photosynthesis", {"explanation": "Plants make sugar.", "sources": []}
+                    )
+                    db.add(Quiz(id="q2", session_id=session.id, questions={"questions": []}))
+                    await db.commit()
+                    return session.id
+
+            new_session_id = asyncio.run(explain_and_quiz())
+            response = client.post("/api/quiz/submit", json={"quiz_id": "q2", "answers": []}, headers=headers)
+            assert response.status_code == 200
+
+            stats = client.get("/api/progress/stats", headers=headers).json()
+            assert stats["total_sessions"] == 7
+            assert stats["total_concepts_studied"] == 2 and stats["concepts_mastered"] == 2
+            assert stats["recent_topics"][0]["session_id"] == new_session_id
+            assert len(stats["recent_topics"]) == student_stats.RECENT_TOPICS_LIMIT
+
+            # Retaking a mastered concept changes neither count
+            assert client.post("/api/quiz/submit", json={"quiz_id": "q1", "answers": []}, headers=headers).status_code == 200
+            again = client.get("/api/progress/stats", headers=headers).json()
+            assert again["total_concepts_studied"] == 2 and again["concepts_mastered"] == 2
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_quiz_service, None)
+            asyncio.run(engine.dispose())
+
+        sync_engine = create_engine(f"sqlite:///{directory}/test.db")
+        db = sessionmaker(bind=sync_engine)()
+        try:
+            incremental = db.get(StudentStats, "student-1")
+            expected = (incremental.total_concepts, incremental.mastered_concepts,
+                        incremental.total_sessions, incremental.recent_topics)
+            assert student_stats.rebuild(db) == 1
+            db.expire_all()
+            rebuilt = db.get(StudentStats, "student-1")
+            assert (rebuilt.total_concepts, rebuilt.mastered_concepts,
+                    rebuilt.total_sessions, rebuilt.recent_topics) == expected
+        finally:
+            db.close()
+            sync_engine.dispose()
+
+
+def test_concurrent_first_requests_share_one_row():
+    with tempfile.TemporaryDirectory() as directory:
+        engine, Session = make_sessionmaker(directory)
+        use_sqlite_wal(engine.sync_engine)
+        result = {"explanation": "Plants turn light into sugar.", "sources": []}
+
+        async def run():
+            async with Session() as db:
+                db.add(Student(id="student-1", username="ada", email="ada@example.com", grade_level=8))
+                db.add(Concept(id="c1", name="gravity", canonical_key="gravity"))
+                await db.commit()
+
+            # No stats row yet and no other write before it: every request computes one and tries to insert it
+            async def explain(i):
+                async with Session() as db:
+                    return await save_learning_session(db, "student-1", "gravity", result)
+
+            sessions = await asyncio.gather(*(explain(i) for i in range(20)))
+            async with Session() as db:
+                stats = await db.get(StudentStats, "student-1")
+            await engine.dispose()
+            return sessions, stats
+
+        sessions, stats = asyncio.run(run())
+        assert stats.total_sessions == 20
+        # No session overwrote another's entry: the list holds the five newest
+        newest = sorted(sessions, key=lambda session: (session.started_at, session.id), reverse=True)
+        assert [topic["started_at"] for topic in stats.recent_topics] == [
+            session.started_at.isoformat() for session in newest[:student_stats.RECENT_TOPICS_LIMIT]
+        ]
+
+
+if __name__ == "__main__":
+    test_stats_backfill_incremental_updates_and_rebuild()
+    test_concurrent_first_requests_share_one_row()
+    print("✅ Student stats checks passed")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Checks for the numpy vector index and its use in search_sources (no network needed).
+
+Usage: python test_vector_index.py
+"""
+
+import asyncio
+import json
+import tempfile
+import threading
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from app.api.explain import save_learning_session
+from app.models.models import LearningSession
+from app.services import vector_index
+from app.services.vector_index import Embedder, HashingEmbedder, VectorIndex, chunk_text, explanation_items, source_items
+from app.services.explanation_service import ExplanationService
+from test_async_database import make_sessionmaker
+
+SOURCES = [
+    {"title": "Photosynthesis", "url": "https://en.wikipedia.org/wiki/Photosynthesis", "source_type": "wikipedia",
+     "snippet": "Photosynthesis is the process plants use to convert light energy into chemical energy stored in glucose."},
+    {"title": "Black hole", "url": "https://en.wikipedia.org/wiki/Black_hole", "source_type": "wikipedia",
+     "snippet": "A black hole is a region of spacetime where gravity is so strong that nothing can escape."}
+]
+
+
+def test_batched_search_and_persistence():
+    with tempfile.TemporaryDirectory() as directory:
+        index = VectorIndex(directory, HashingEmbedder(256), flush_every=2)
+        assert index.add(source_items(SOURCES)) == 2
+        assert index.add(source_items(SOURCES)) == 0  # duplicates are skipped
+        index.add(explanation_items("s1", "mitochondria", "Mitochondria are the powerhouse of the cell. They make ATP."))
+
+        results = index.search(["how do plants convert light energy", "gravity of a black hole"], k=1)
+        assert results[0][0]["title"] == "Photosynthesis"
+        assert results[1][0]["title"] == "Black hole"
+        only_explanations = index.search(["plants light energy"], k=3, kinds=["explanation"])[0]
+        assert all(hit["kind"] == "explanation" for hit in only_explanations)
+        index.close()
+
+        # Flushed rows are memory-mapped back on restart
+        reopened = VectorIndex(directory, HashingEmbedder(256))
+        assert len(reopened) == 3
+        assert reopened.search(["mitochondria atp"], k=1)[0][0]["ref"] == "s1"
+
+
+def test_flush_appends_only_the_new_rows():
+    with tempfile.TemporaryDirectory() as directory:
+        vectors_path = os.path.join(directory, "vectors.f32")
+        index = VectorIndex(directory, HashingEmbedder(256), flush_every=100)
+        index.add(source_items(SOURCES))
+        index.flush()
+        with open(vectors_path, "rb") as f:
+            first_flush = f.read()
+        assert len(first_flush) == 2 * 256 * 4
+
+        index.add(explanation_items("s1", "mitochondria", "Mitochondria are the powerhouse of the cell."))
+        index.flush()
+        with open(vectors_path, "rb") as f:
+            data = f.read()
+        # Earlier rows are left as they are; the batch is written after them
+        assert data[:len(first_flush)] == first_flush and len(data) == 3 * 256 * 4
+        assert index.search(["mitochondria"], k=1)[0][0]["ref"] == "s1"
+        index.close()
+
+        # A flush cut short after the vectors: the row without an entry is dropped on load
+        with open(vectors_path, "ab") as f:
+            f.write(b"\0" * 256 * 4)
+        reopened = VectorIndex(directory, HashingEmbedder(256))
+        assert len(reopened) == 3 and os.path.getsize(vectors_path) == 3 * 256 * 4
+        assert reopened.search(["black hole gravity"], k=1)[0][0]["title"] == "Black hole"
+
+
+def test_legacy_files_are_converted():
+    with tempfile.TemporaryDirectory() as directory:
+        entries = [{"key": "k1", "kind": "source", "text": "gravity", "title": "Gravity", "url": "", "ref": ""}]
+        np.save(os.path.join(directory, "vectors.npy"), HashingEmbedder(256).embed(["gravity"]))
+        with open(os.path.join(directory, "entries.json"), "w") as f:
+            json.dump(entries, f)
+
+        index = VectorIndex(directory, HashingEmbedder(256))
+        assert len(index) == 1 and index.search(["gravity"], k=1)[0][0]["title"] == "Gravity"
+        assert not os.path.exists(os.path.join(directory, "vectors.npy"))
+        assert os.path.exists(os.path.join(directory, "entries.jsonl"))
+
+
+def test_embedders_must_implement_embed():
+    class Unfinished(Embedder):
+        dim = 8
+
+    try:
+        Unfinished()
+        assert False, "embedder without embed() was created"
+    except TypeError:
+        pass
+
+
+def test_chunk_text_respects_limit():
+    text = " ".join(f"Sentence number {i} is here." for i in range(100))
+    chunks = chunk_text(text, max_chars=120)
+    assert len(chunks) > 1 and all(len(chunk) <= 120 for chunk in chunks)
+
+
+def test_search_sources_reuses_indexed_material():
+    with tempfile.TemporaryDirectory() as directory:
+        index = VectorIndex(directory, HashingEmbedder(256))
+        index.add(source_items(SOURCES))
+        service = ExplanationService(vector_index=index)
+
+        sources = asyncio.run(service.search_sources(["photosynthesis light energy", "photosynthesis"]))
+        assert sources[0]["title"] == "Photosynthesis"
+        assert sources[0]["source_type"] == "wikipedia"
+        assert service.last_retrieval["provider"] == "vector_index"
+
+
+def test_explanations_are_indexed_off_the_event_loop():
+    class BrokenIndex:
+        def __init__(self):
+            self.threads = []
+
+        def add(self, items):
+            self.threads.append(threading.current_thread())
+            raise OSError("disk full")
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine, Session = make_sessionmaker(directory)
+        previous, vector_index._index = vector_index._index, BrokenIndex()
+        result = {"explanation": "Plants turn light into sugar.", "sources": []}
+
+        async def run():
+            async with Session() as db:
+                session = await save_learning_session(db, "student-1", "photosynthesis", result)
+            async with Session() as db:
+                stored = await db.get(LearningSession, session.id)
+            await engine.dispose()
+            return stored
+
+        try:
+            # The committed session survives an indexing error
+            assert asyncio.run(run()) is not None
+            assert len(vector_index._index.threads) == 1
+            assert vector_index._index.threads[0] is not threading.main_thread()
+        finally:
+            vector_index._index = previous
+
+
+if __name__ == "__main__":
+    test_batched_search_and_persistence()
+    test_flush_appends_only_the_new_rows()
+    test_legacy_files_are_converted()
+    test_embedders_must_implement_embed()
+    test_chunk_text_respects_limit()
+    test_search_sources_reuses_indexed_material()
+    test_explanations_are_indexed_off_the_event_loop()
+    print("✅ Vector index checks passed")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Checks for the Wikipedia response cache and its revalidation (no network needed).
+
+Usage: python test_wikipedia_cache.py
+"""
+
+import asyncio
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from app.services.wikipedia_cache import WikipediaCache
+from app.services.wikipedia_provider import WikipediaProvider
+
+SUMMARY = {
+    "title": "Photosynthesis",
+    "extract": "Photosynthesis is the process plants use to turn light into chemical energy.",
+    "content_urls": {"desktop": {"page": "https://en.wikipedia.org/wiki/Photosynthesis"}}
+}
+
+
+def make_provider(cache, seen):
+    """Provider over a mock transport that records requests and honours If-None-Match."""
+
+    def handler(request):
+        seen.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=SUMMARY, headers={"ETag": '"v1"'})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return WikipediaProvider(client, cache=cache)
+
+
+def test_fresh_entries_skip_the_network():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = WikipediaCache(os.path.join(directory, "wiki.db"), fresh_seconds=60, stale_seconds=600)
+        seen = []
+        provider = make_provider(cache, seen)
+
+        async def run():
+            first = await provider.search("Photosynthesis")
+            second = await provider.search("  photosynthesis ")
+            await provider.client.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first == second and first[0]["title"] == "Photosynthesis"
+        assert len(seen) == 1
+        stats = cache.stats()
+        assert stats["misses"] == 1 and stats["fresh_hits"] == 1 and stats["entries"] == 1
+        cache.close()
+
+
+def test_stale_entries_are_served_then_revalidated():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = WikipediaCache(os.path.join(directory, "wiki.db"), fresh_seconds=0, stale_seconds=600)
+        seen = []
+        provider = make_provider(cache, seen)
+
+        async def run():
+            await provider.search("Photosynthesis")
+            served = await provider.search("Photosynthesis")
+            # Let the background conditional request finish
+            await asyncio.sleep(0.05)
+            await provider.client.aclose()
+            return served
+
+        served = asyncio.run(run())
+        assert served[0]["title"] == "Photosynthesis"
+        assert len(seen) == 2
+        assert seen[1].headers["if-none-match"] == '"v1"'
+        stats = cache.stats()
+        assert stats["stale_hits"] == 1 and stats["not_modified"] == 1
+        cache.close()
+
+
+if __name__ == "__main__":
+    test_fresh_entries_skip_the_network()
+    test_stale_entries_are_served_then_revalidated()
+    print("✅ Wikipedia cache checks passed")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Checks for batched Wikipedia title resolution (no network needed).
+
+Usage: python test_wikipedia_provider.py
+"""
+
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from app.services.wikipedia_provider import WikipediaProvider
+
+BATCH_RESPONSE = {
+    "query": {
+        "normalized": [{"from": "gravity", "to": "Gravity"}, {"from": "ww2", "to": "Ww2"}],
+        "redirects": [{"from": "Ww2", "to": "World War II"}],
+        "pages": [
+            {"title": "What is gravity?", "missing": True},
+            {"title": "Gravity", "extract": "Gravity is a fundamental interaction.",
+             "fullurl": "https://en.wikipedia.org/wiki/Gravity"},
+            {"title": "World War II", "extract": "World War II was a global conflict.",
+             "fullurl": "https://en.wikipedia.org/wiki/World_War_II"},
+            {"title": "Mercury", "extract": "Mercury may refer to:", "pageprops": {"disambiguation": ""}}
+        ]
+    }
+}
+
+
+def test_search_many_resolves_all_keywords_in_one_request():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json=BATCH_RESPONSE)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            provider = WikipediaProvider(client)
+            provider.cache = None
+            return await provider.search_many(["What is gravity?", "gravity", "ww2", "Mercury"])
+
+    results = asyncio.run(run())
+    assert len(seen) == 1
+    assert seen[0].url.params["titles"] == "What is gravity?|gravity|ww2|Mercury"
+    assert results["What is gravity?"] == []
+    assert results["gravity"][0]["url"] == "https://en.wikipedia.org/wiki/Gravity"
+    assert results["ww2"][0]["title"] == "World War II"
+    assert results["Mercury"] == []  # disambiguation pages are skipped
+
+
+if __name__ == "__main__":
+    test_search_many_resolves_all_keywords_in_one_request()
+    print("✅ Wikipedia provider checks passed")
@@ -1,6 +1,7 @@
 import React, { useState, useRef, useEffect } from 'react'
 import ChatMessage from './components/ChatMessage'
 import ChatInput from './components/ChatInput'
+import { explanationAPI } from './services/api_simple'
 import type { Message } from './types'
 import './App.css'
 
@@ -31,6 +32,7 @@ const App: React.FC = () => {
       timestamp: new Date()
     }
     setMessages(prev => [...prev, newMessage])
+    return newMessage.id
   }
 
   const handleUserMessage = async (content: string) => {
@@ -86,8 +88,8 @@ const App: React.FC = () => {
 
       const data = await response.json()
 
-      // Add explanation with SVG
-      addMessage({
+      // Add explanation; the SVG arrives from a background job shortly after
+      const explanationMessageId = addMessage({
         type: 'assistant',
         content: data.explanation,
         svgContent: data.svg_flashcard,
@@ -95,6 +97,14 @@ const App: React.FC = () => {
         keywords: data.keywords
       })
 
+      if (!data.svg_flashcard && data.flashcard_job_id) {
+        explanationAPI.waitForFlashcard(data.flashcard_job_id)
+          .then(svg => setMessages(prev =>
+            prev.map(m => m.id === explanationMessageId ? { ...m, svgContent: svg } : m)
+          ))
+          .catch(() => {})
+      }
+
       // Ask about quiz
       addMessage({
         type: 'assistant',
@@ -2,6 +2,7 @@ import React, { useState, useRef, useEffect } from 'react'
 import ChatMessage from './components/ChatMessage'
 import ChatInput from './components/ChatInput'
 import StreamingMessage from './components/StreamingMessage'
+import { explanationAPI } from './services/api_simple'
 import type { Message, StreamingStep } from './types'
 import './App.css'
 
@@ -42,12 +43,23 @@ const App: React.FC = () => {
   const addStreamingStep = (step: Omit<StreamingStep, 'id' | 'timestamp'>) => {
     const newStep: StreamingStep = {
       ...step,
-      id: Date.now().toString(),
+      // Real stream events can arrive within the same millisecond
+      id: `${Date.now()}-${Math.random().toString(36).slice(2, 8)}`,
       timestamp: new Date()
     }
     setStreamingSteps(prev => [...prev, newStep])
   }
 
+  const completeLastStreamingStep = (content?: string, brief?: string) => {
+    setStreamingSteps(prev =>
+      prev.map((step, index) =>
+        index === prev.length - 1
+          ? { ...step, status: 'completed', content: content ?? step.content, brief: brief ?? step.brief }
+          : step
+      )
+    )
+  }
+
   const clearStreaming = () => {
     // Mark streaming as completed and collapse it
     setStreamingCompleted(true)
@@ -103,11 +115,9 @@ const App: React.FC = () => {
       type: 'processing',
       content: 'Processing your request...',
       brief: 'Analyzing your query and preparing to search for information',
-      status: 'active'
+      status: 'completed'
     })
 
-    await sleep(500)
-
     // Step 2: Extracting keywords
     addStreamingStep({
       type: 'keywords',
@@ -116,67 +126,88 @@ const App: React.FC = () => {
       status: 'active'
     })
 
-    await sleep(800)
-
-    // Step 3: Searching sources
-    addStreamingStep({
-      type: 'sources',
-      content: 'Searching Wikipedia and educational sources...',
-      brief: 'Looking through Wikipedia and educational websites for reliable information',
-      status: 'active'
-    })
-
-    await sleep(1000)
-
     try {
-      // Make the actual API call
-      const response = await fetch('http://localhost:8000/api/explain', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ query })
-      })
-
-      const data = await response.json()
-
-      // Step 4: Found sources
-      addStreamingStep({
-        type: 'sources',
-        content: `Found ${data.sources?.length || 0} credible sources`,
-        brief: `Successfully located authoritative sources including ${data.sources?.map(s => s.source_type).join(', ') || 'educational content'}`,
-        status: 'completed'
-      })
-
-      await sleep(500)
-
-      // Step 5: Generating explanation
-      addStreamingStep({
-        type: 'explanation',
-        content: 'Generating explanation using Feynman technique...',
-        brief: 'Creating a simple, clear explanation that breaks down complex concepts into easy-to-understand language',
-        status: 'active'
-      })
-
-      await sleep(1200)
-
-      // Step 6: Creating visual
-      addStreamingStep({
-        type: 'visual',
-        content: 'Creating AI-generated visual flashcard...',
-        brief: 'Designing a visual diagram or illustration to help you understand the concept better',
-        status: 'active'
-      })
-
-      await sleep(1000)
-
-      // Step 7: Finalizing
-      addStreamingStep({
-        type: 'finalizing',
-        content: 'Finalizing your personalized explanation...',
-        brief: 'Putting together the explanation, visual, and sources into a complete learning experience',
-        status: 'active'
+      // Each step below is driven by a real server-sent event from /api/explain/stream
+      const data: any = { explanation: '' }
+      let streamError: string | null = null
+
+      await explanationAPI.streamExplanation(query, (event, payload) => {
+        switch (event) {
+          case 'keywords':
+            data.keywords = payload.keywords
+            completeLastStreamingStep(`Key concepts: ${payload.keywords.join(', ')}`)
+            // Step 3: Searching sources
+            addStreamingStep({
+              type: 'sources',
+              content: 'Searching Wikipedia and educational sources...',
+              brief: 'Looking through Wikipedia and educational websites for reliable information',
+              status: 'active'
+            })
+            break
+
+          case 'sources':
+            data.sources = payload.sources
+            // Step 4: Found sources
+            completeLastStreamingStep(
+              `Found ${payload.sources?.length || 0} credible sources`,
+              `Successfully located authoritative sources including ${payload.sources?.map((s: any) => s.source_type).join(', ') || 'educational content'}`
+            )
+            // Step 5: Generating explanation
+            addStreamingStep({
+              type: 'explanation',
+              content: 'Generating explanation using Feynman technique...',
+              brief: 'Creating a simple, clear explanation that breaks down complex concepts into easy-to-understand language',
+              status: 'active'
+            })
+            break
+
+          case 'token':
+            // Show the explanation as it is being written
+            data.explanation += payload.text
+            setStreamingSteps(prev =>
+              prev.map((step, index) =>
+                index === prev.length - 1 ? { ...step, brief: data.explanation.slice(-240) } : step
+              )
+            )
+            break
+
+          case 'explanation':
+            data.explanation = payload.explanation
+            completeLastStreamingStep('Explanation ready')
+            // Step 6: Creating visual
+            addStreamingStep({
+              type: 'visual',
+              content: 'Creating AI-generated visual flashcard...',
+              brief: 'Designing a visual diagram or illustration to help you understand the concept better',
+              status: 'active'
+            })
+            break
+
+          case 'flashcard':
+            data.svg_flashcard = payload.svg_flashcard
+            completeLastStreamingStep('Visual flashcard ready')
+            // Step 7: Finalizing
+            addStreamingStep({
+              type: 'finalizing',
+              content: 'Finalizing your personalized explanation...',
+              brief: 'Putting together the explanation, visual, and sources into a complete learning experience',
+              status: 'active'
+            })
+            break
+
+          case 'done':
+            data.session_id = payload.session_id
+            break
+
+          case 'error':
+            streamError = payload.detail
+            break
+        }
       })
 
-      await sleep(500)
+      if (streamError) {
+        throw new Error(streamError)
+      }
 
       // Clear streaming and add final result
       clearStreaming()
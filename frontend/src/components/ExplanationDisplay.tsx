@@ -1,8 +1,9 @@
-import React, { useState } from 'react'
+import React, { useEffect, useState } from 'react'
 import ReactMarkdown from 'react-markdown'
 import SVGFlashcard from './SVGFlashcard'
 import SourcePanel from './SourcePanel'
 import QuizInterface from './QuizInterface'
+import { explanationAPI } from '../services/api'
 import type { Explanation } from '../types'
 
 interface ExplanationDisplayProps {
@@ -12,6 +13,18 @@ interface ExplanationDisplayProps {
 const ExplanationDisplay: React.FC<ExplanationDisplayProps> = ({ explanation }) => {
   const [activeTab, setActiveTab] = useState<'explanation' | 'visual' | 'quiz'>('explanation')
   const [showSources, setShowSources] = useState(false)
+  const [svgContent, setSvgContent] = useState<string | null>(explanation.svg_flashcard)
+
+  useEffect(() => {
+    setSvgContent(explanation.svg_flashcard)
+    if (explanation.svg_flashcard || !explanation.flashcard_job_id) return
+
+    let cancelled = false
+    explanationAPI.waitForFlashcard(explanation.flashcard_job_id)
+      .then(svg => { if (!cancelled) setSvgContent(svg) })
+      .catch(() => {})
+    return () => { cancelled = true }
+  }, [explanation])
 
   const tabs = [
     { id: 'explanation', label: 'Explanation', icon: '📚' },
@@ -89,7 +102,11 @@ const ExplanationDisplay: React.FC<ExplanationDisplayProps> = ({ explanation })
 
         {activeTab === 'visual' && (
           <div className="flex justify-center">
-            <SVGFlashcard svgContent={explanation.svg_flashcard} />
+            {svgContent ? (
+              <SVGFlashcard svgContent={svgContent} />
+            ) : (
+              <p className="text-gray-400 py-12">Creating your visual flashcard...</p>
+            )}
           </div>
         )}
 
@@ -22,6 +22,8 @@ const SourcePanel: React.FC<SourcePanelProps> = ({ sources }) => {
         return '🦆'
       case 'web':
         return '🌐'
+      case 'past_explanation':
+        return '💡'
       default:
         return '📄'
     }
@@ -35,6 +37,8 @@ const SourcePanel: React.FC<SourcePanelProps> = ({ sources }) => {
         return 'Educational Web'
       case 'web':
         return 'Web'
+      case 'past_explanation':
+        return 'Earlier Explanation'
       default:
         return sourceType
     }
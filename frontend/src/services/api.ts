@@ -6,7 +6,8 @@ import type {
   QuizAnswer, 
   QuizResult, 
   ConceptProgress, 
-  ProgressStats 
+  ProgressStats,
+  FlashcardJob
 } from '../types'
 
 const API_BASE_URL = 'http://localhost:8000'
@@ -73,6 +74,17 @@ export const explanationAPI = {
     return response.data
   },
 
+  // The flashcard is generated in the background after /api/explain responds.
+  // Long-polls the job endpoint until the SVG is ready.
+  waitForFlashcard: async (jobId: string): Promise<string> => {
+    while (true) {
+      const response = await api.get(`/api/explain/flashcard/${jobId}`, { params: { wait: 20 } })
+      const job: FlashcardJob = response.data
+      if (job.status === 'completed' && job.result) return job.result.svg_flashcard
+      if (job.status === 'failed') throw new Error(job.error || 'Flashcard generation failed')
+    }
+  },
+
   processStudentExplanation: async (sessionId: string, explanation: string) => {
     const response = await api.post('/api/feynman/student-explanation', {
       session_id: sessionId,
@@ -111,8 +123,10 @@ export const quizAPI = {
 }
 
 export const progressAPI = {
-  getProgress: async (): Promise<{ concepts: ConceptProgress[] }> => {
-    const response = await api.get('/api/progress')
+  getProgress: async (
+    params: { limit?: number; after?: string; subject?: string } = {}
+  ): Promise<{ concepts: ConceptProgress[]; next_cursor: string | null }> => {
+    const response = await api.get('/api/progress', { params })
     return response.data
   },
 
@@ -3,7 +3,8 @@ import type {
   Explanation, 
   Quiz, 
   QuizAnswer, 
-  QuizResult 
+  QuizResult,
+  FlashcardJob
 } from '../types'
 
 const API_BASE_URL = 'http://localhost:8000'
@@ -23,10 +24,62 @@ export const explanationAPI = {
     return response.data
   },
 
+  // The flashcard is generated in the background after /api/explain responds.
+  // Long-polls the job endpoint until the SVG is ready.
+  waitForFlashcard: async (jobId: string): Promise<string> => {
+    while (true) {
+      const response = await api.get(`/api/explain/flashcard/${jobId}`, { params: { wait: 20 } })
+      const job: FlashcardJob = response.data
+      if (job.status === 'completed' && job.result) return job.result.svg_flashcard
+      if (job.status === 'failed') throw new Error(job.error || 'Flashcard generation failed')
+    }
+  },
+
   getRecommendations: async (conceptId: string) => {
     const response = await api.get(`/api/recommendations/${conceptId}`)
     return response.data
   },
+
+  // Reads the server-sent events from /api/explain/stream and hands each
+  // (event, data) pair to onEvent as soon as the backend finishes that stage.
+  streamExplanation: async (
+    query: string,
+    onEvent: (event: string, data: any) => void
+  ): Promise<void> => {
+    const response = await fetch(`${API_BASE_URL}/api/explain/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ query })
+    })
+    if (!response.ok || !response.body) {
+      throw new Error(`Stream request failed with status ${response.status}`)
+    }
+
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+
+    while (true) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffer += decoder.decode(value, { stream: true })
+
+      let boundary = buffer.indexOf('\n\n')
+      while (boundary !== -1) {
+        const rawEvent = buffer.slice(0, boundary)
+        buffer = buffer.slice(boundary + 2)
+        boundary = buffer.indexOf('\n\n')
+
+        let event = 'message'
+        let data = ''
+        for (const line of rawEvent.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7)
+          else if (line.startsWith('data: ')) data += line.slice(6)
+        }
+        onEvent(event, data ? JSON.parse(data) : null)
+      }
+    }
+  },
 }
 
 export const quizAPI = {
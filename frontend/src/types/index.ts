@@ -17,11 +17,19 @@ export interface Source {
 export interface Explanation {
   explanation: string
   sources: Source[]
-  svg_flashcard: string
+  svg_flashcard: string | null
+  flashcard_job_id?: string | null
   session_id: string
   keywords: string[]
 }
 
+export interface FlashcardJob {
+  job_id: string
+  status: 'pending' | 'running' | 'completed' | 'failed'
+  result: { session_id: string; svg_flashcard: string; flashcard_hash?: string; flashcard_url?: string } | null
+  error: string | null
+}
+
 export interface Question {
   id: string
   question: string